@@ -350,6 +350,7 @@ def _(mo):
     - **Polars:** `df1.join(df2, on="Farm_ID")` achieves the same result.
     - **Why it’s useful:** Survey data often comes in separate tables (farm owners, production, yields). Merging allows analysis across datasets.
     - **Tip:** Always check that the key column (`Farm_ID`) is unique or matches correctly in both tables to avoid unexpected duplicates.
+    - **Large tables:** Survey tables usually arrive sorted by `Farm_ID`. `merge_join(df1, df2)` from `farm_survey.joins` uses that order instead of a hash table and checks uniqueness in the same pass; it falls back to the normal join for unsorted keys.
     """)
     return
 
@@ -391,10 +392,29 @@ def _(mo):
     - **Polars:** `fill_null()` performs a similar function.
     - **Why it’s useful:** Missing values are common in surveys (e.g., respondents skipped questions). Filling them allows calculations like averages or totals without errors.
     - **Tip:** Decide carefully whether to **fill**, **drop**, or **impute** based on the type of analysis and data quality.
+    - **By group:** One overall mean fills a missing rice harvest with a value pulled up by the sugarcane farms. `impute()` from `farm_survey.impute` fills each value with the mean of its own group (by default `Crop` × `Region`) and reports how many values it filled in each group. It also accepts a lazy `pl.scan_csv(...)`, for survey files that do not fit in memory.
     """)
     return
 
 
+@app.cell
+def _(pl):
+    # Fill missing Production_mt with the mean of the same crop
+    from farm_survey.impute import impute
+
+    df_missing_crop_pl = pl.DataFrame(
+        {
+            "Farm_ID": [1, 2, 3, 4, 5, 6],
+            "Crop": ["Rice", "Rice", "Sugarcane", "Sugarcane", "Rice", "Sugarcane"],
+            "Production_mt": [4.8, None, 60.5, 58.1, 5.2, None],
+        }
+    )
+    df_imputed_pl, impute_report = impute(df_missing_crop_pl, "Production_mt", by="Crop")
+    print(impute_report)
+    df_imputed_pl
+    return
+
+
 @app.cell
 def _(mo):
     mo.md("""
@@ -428,6 +448,23 @@ def _(pl):
     return (df_pl_farm,)
 
 
+@app.cell
+def _():
+    # Shared loader: parses the CSV once and caches it until the file changes
+    from farm_survey.loader import load_survey
+    return (load_survey,)
+
+
+@app.cell
+def _(load_survey):
+    # The same file through the shared loader, for either library: parsed once,
+    # then served from memory (Region and Crop come back as categories)
+    df_pd_farm_cached = load_survey("farm_survey_large.csv", engine="pandas")
+    df_pl_farm_cached = load_survey("farm_survey_large.csv", engine="polars")
+    df_pl_farm_cached.head()
+    return
+
+
 @app.cell
 def _(mo):
     mo.md("""
@@ -438,10 +475,23 @@ def _(mo):
     - **Polars:** `pl.read_csv()` is optimized for larger datasets.
     - **Why it’s useful:** Survey datasets often come in CSV format. Loading correctly is essential for analysis.
     - **Tip:** Always check the first few rows to ensure data loaded correctly.
+    - **Shared loader:** `load_survey()` parses the file **once** and keeps it in memory (keyed on the file's path, size and modification time). Re-running a cell, or asking for the other library, does not parse the CSV again. On the very first load it also saves a compressed columnar copy (`farm_survey_large.csv.parquet`) next to the CSV, so the next session skips CSV parsing altogether.
+    - **Categories:** `Region` and `Crop` repeat a handful of values on every row, so `load_survey()` stores them dictionary-encoded: `category` in pandas and `Enum` in polars, with the same list of categories in both. Each row then holds a small integer code instead of its own copy of the string, and filters such as `df["Region"] == "III"` or group-bys by `Crop` compare integers. Pass `categorical=False` to get plain strings.
     """)
     return
 
 
+@app.cell
+def _(df_pl_farm):
+    # Narrowest dtype per column (Farm_ID -> uint8, floats -> float32 within
+    # a relative tolerance of 1e-6), with a per-column memory report
+    from farm_survey.compact import compact
+
+    df_pl_farm_compact, compact_report = compact(df_pl_farm, tolerance=1e-6)
+    print(compact_report)
+    return
+
+
 @app.cell
 def _(df_pd_farm):
     # Pandas: calculate Yield and save
@@ -461,14 +511,43 @@ def _(df_pl_farm, pl):
     return (df_pl_farm_yield,)
 
 
+@app.cell
+def _(df_pd_farm, df_pl_farm):
+    # Shared metric definitions: YIELD is Production_mt / Farm_Area_ha (a zero
+    # area gives a missing value instead of inf), the same column as above
+    # for either library; add_metrics adds several metrics in one pass
+    from farm_survey.metrics import YIELD, add_metrics
+
+    df_pd_farm_metrics = add_metrics(df_pd_farm, [YIELD])
+    df_pl_farm_metrics = add_metrics(df_pl_farm, [YIELD])
+    df_pl_farm_metrics.head()
+    return
+
+
+@app.cell
+def _(df_pl_farm_yield):
+    # Large outputs: one Parquet file per Region, written in parallel
+    # (export_survey takes pandas or polars frames)
+    from farm_survey.export import export_survey
+
+    farm_output_files = export_survey(
+        df_pl_farm_yield, "farm_survey_output", fmt="parquet", partition_by="Region", overwrite=True
+    )
+    farm_output_files
+    return
+
+
 @app.cell
 def _(mo):
     mo.md("""
     **Discussion: Writing CSV with Changes**
 
-    - **What we did:** Added a new column `Yield_mt_per_ha` before saving the CSV.
+    - **What we did:** Added a new column `Yield_mt_per_ha` before saving the CSV (`to_csv` in pandas, `write_csv` in polars).
+    - **Metrics:** The `add_metrics` cell builds the same `Yield_mt_per_ha` from `farm_survey.metrics`, where each ratio (Yield, FEI, Labor_Productivity) is defined once and works for pandas and polars. `add_metrics(df, [YIELD, ...], decimals=3)` adds several metrics in one pass.
     - **Why it’s useful:** Makes the output CSV more meaningful for analysis and reports.
     - **Tip:** Any transformation (new columns, filtered rows, renamed columns) before saving will create a CSV that is different from the original input, which is often the real-world scenario.
+    - **Large outputs:** `export_survey()` writes the table **once** into a `farm_survey_output/` folder, one compressed Parquet file per Region (`Region=III/part-00000.parquet`), using several threads. Use `fmt="csv"` for CSV files split into chunks. Read it all back with `pl.scan_parquet("farm_survey_output", hive_partitioning=True)`. `overwrite=True` lets the cell run again: it replaces the earlier `part-*` files and leaves anything else in the folder alone.
+    - **Many files:** The same load → yield → crop summary → export steps run outside the notebook, on one survey file per province and season, with `python -m farm_survey.batch "surveys/*/*.csv" --workers 4`. Each file gets its own output folder and the job ends with a table of per-file timings.
     """)
     return
 
@@ -537,6 +616,51 @@ def _(mo):
     return
 
 
+@app.cell
+def _():
+    # Polars (lazy + streaming): load -> yield -> group by Crop -> sort as ONE plan
+    from farm_survey.cell_cache import cached
+    from farm_survey.lazy import collect_streaming, crop_yield_summary
+
+    crop_plan = crop_yield_summary("farm_survey_large.csv")
+    print(crop_plan.explain(engine="streaming"))
+
+    # Stored on disk: reopening the notebook reads the result back
+    # instead of scanning the CSV again, until the file changes
+    @cached
+    def _crop_summary(path):
+        return collect_streaming(crop_yield_summary(path))
+
+    df_total_crop_lazy = _crop_summary("farm_survey_large.csv")
+    df_total_crop_lazy
+    return
+
+
+@app.cell
+def _(mo):
+    mo.md("""
+    **Discussion: Lazy and Streaming Queries**
+
+    - **What we did:** Built the same load → yield → group-by → sort chain with `pl.scan_csv()` instead of `pl.read_csv()`.
+    - **Lazy:** Nothing is read until `collect()`. Polars first optimizes the whole plan, e.g. it only reads the columns the query needs (`PROJECT 3/5 COLUMNS` in the printed plan) and applies filters while scanning.
+    - **Streaming:** `collect(engine="streaming")` processes the file in batches, so memory stays bounded even when the CSV is larger than RAM.
+    - **Why it’s useful:** Real survey extracts can be tens of GB; the eager version would load the full file and create a full copy for every step.
+    - **Caching:** `@cached` (from `farm_survey.cell_cache`) saves the result as a Parquet file in `.farm_survey_cache/`, keyed on the function's code and its inputs (for a file: path, size and modification time). The next time the notebook is opened the summary is read back instead of recomputed; editing the function or the CSV computes it again.
+    """)
+    return
+
+
+@app.cell
+def _():
+    # Running totals per Crop: later refresh() calls only read rows appended to the CSV
+    from farm_survey.incremental import IncrementalSummary
+
+    crop_totals = IncrementalSummary("farm_survey_large.csv", by="Crop")
+    crop_totals.refresh()
+    crop_totals.summary(sort_by="Production_mt_sum")
+    return
+
+
 @app.cell
 def _(df_total_crop_pd):
     import matplotlib.pyplot as plt
@@ -551,12 +675,20 @@ def _(df_total_crop_pd):
 
 
 @app.cell
-def _(df_total_crop_pl, plt):
-    # Polars plotting via conversion to pandas (using pyarrow)
-    df_total_crop_pl.to_pandas().plot.bar(
+def _():
+    # Zero-copy pandas <-> polars conversions (Arrow-backed pandas dtypes)
+    from farm_survey.interchange import from_pandas, last_report, to_pandas
+    return from_pandas, last_report, to_pandas
+
+
+@app.cell
+def _(df_total_crop_pl, last_report, plt, to_pandas):
+    # Polars plotting via conversion to pandas (using pyarrow, without copying)
+    to_pandas(df_total_crop_pl).plot.bar(
         x="Crop", y="Total_Production_mt", legend=False, title="Total Production by Crop"
     )
     plt.ylabel("Production (mt)")
+    print(last_report())
     plt.show()
     return
 
@@ -568,7 +700,7 @@ def _(mo):
 
     - **What we did:** Visualized total production per crop using a bar chart.
     - **Pandas:** Built-in `plot.bar()` is simple for quick charts.
-    - **Polars:** Convert to pandas for plotting.
+    - **Polars:** Convert to pandas for plotting. `to_pandas()` here keeps the data in Arrow format, so numeric columns are **shared, not copied**; the printed report shows what each conversion cost.
     - **Why it’s useful:** Visualizations allow analysts to quickly understand which crops dominate production.
     """)
     return
@@ -594,6 +726,47 @@ def _(df_pl_farm_yield, plt):
     return
 
 
+@app.cell
+def _():
+    # Density plot: farms counted into a grid of bins, drawn as one image
+    from farm_survey.plotting import density_plot
+    return (density_plot,)
+
+
+@app.cell
+def _(density_plot, df_pd_farm_yield, plt):
+    # The same scatter as a density image, for frames too large for plot.scatter
+    density_plot(
+        df_pd_farm_yield, "Farm_Area_ha", "Yield_mt_per_ha", sample=500, title="Yield vs Farm Area"
+    )
+    plt.show()
+    return
+
+
+@app.cell
+def _(density_plot, df_pl_farm_yield, plt):
+    # Polars: the columns are binned directly, no conversion to pandas needed
+    density_plot(
+        df_pl_farm_yield, "Farm_Area_ha", "Yield_mt_per_ha", sample=500, title="Yield vs Farm Area"
+    )
+    plt.show()
+    return
+
+
+@app.cell
+def _(mo):
+    mo.md("""
+    **Discussion: Scatter Plot**
+
+    - **What we did:** Plotted yield against farm area for every farm.
+    - **Pandas:** `df.plot.scatter(x=..., y=...)` draws one marker per row.
+    - **Polars:** Convert to pandas first, or bin the columns directly with `density_plot()`.
+    - **Why it’s useful:** Shows whether small farms yield more or less per hectare than large ones.
+    - **Tip:** With millions of farms, markers pile on top of each other and matplotlib slows to a crawl. `density_plot()` counts the farms in a grid of bins with NumPy (a 2D histogram) and draws the grid as a single image with `imshow`, so drawing takes the same time for any number of rows. `sample=500` draws 500 randomly chosen farms on top.
+    """)
+    return
+
+
 @app.cell
 def _(mo):
     mo.md("""
@@ -810,6 +983,7 @@ def _(mo):
     - In this example, the result ~0.14866 is **in degrees**, because latitude and longitude are angular measurements.
     - Optional conversion to kilometers: multiply the degree-based distance by ~111 km per degree.
       - 0.14866 degrees → ~16.5 km.
+      - This is only exact north–south: a degree of longitude shrinks with latitude (~107 km at 15° N), so the haversine formula below gives ~16.36 km for the same pair.
     - Optional filtering can identify **farm pairs that are very close**, e.g.:
 
     **Pandas:** `df_pd_pairs[df_pd_pairs['Distance'] < 0.15]`
@@ -818,6 +992,30 @@ def _(mo):
     return
 
 
+@app.cell
+def _(df_pd_farms):
+    # Scaling up: distances for ALL pairs of farms in the Exercise 1 table.
+    # For large tables use iter_pair_distances(), which yields the pairs in
+    # memory-bounded blocks instead of building one n x n table.
+    from farm_survey.distance import pair_distances
+
+    df_all_pairs_pl = pair_distances(df_pd_farms, id_col="Farm_Name", output="polars")
+    df_all_pairs_pl
+    return
+
+
+@app.cell
+def _(df_pl_pairs_dist):
+    # Beyond "x 111": the real great-circle (haversine) distance on the Earth's surface
+    from farm_survey.geodesy import haversine_km_expr
+
+    df_pl_pairs_gc = df_pl_pairs_dist.with_columns(
+        haversine_km_expr("Lat1", "Lon1", "Lat2", "Lon2").alias("Haversine_km")
+    )
+    df_pl_pairs_gc.select("Farm1", "Farm2", "Distance_km", "Haversine_km")
+    return
+
+
 @app.cell
 def _(mo):
     mo.md("""
@@ -890,6 +1088,20 @@ def _(mo):
     return
 
 
+@app.cell
+def _(df_pd_farms):
+    # Scaling up: a grid index finds close farms without building every pair first
+    from farm_survey.spatial import GridIndex
+
+    farm_grid = GridIndex(df_pd_farms, cell_size=0.15, id_col="Farm_Name")
+
+    print("All pairs within 16.5 km:")
+    print(farm_grid.pairs_within(16.5, unit="km"))
+    print("\nNeighbours of Farm C within 0.15 degrees:")
+    print(farm_grid.neighbours("Farm C", 0.15))
+    return
+
+
 @app.cell
 def _(mo):
     mo.md("""
@@ -920,10 +1132,11 @@ def _(np, pd, pl):
     df_pd_yield_ex4 = pd.read_csv("farm_survey_large.csv")  # new variable
     df_pl_yield_ex4 = pl.from_pandas(df_pd_yield_ex4)
 
-    # Add synthetic Yield column
+    # Add the same synthetic Yield column to both
     np.random.seed(42)
-    df_pd_yield_ex4["Yield"] = np.random.randint(800, 2000, size=len(df_pd_yield_ex4))
-    df_pl_yield_ex4 = pl.from_pandas(df_pd_yield_ex4)  # update Polars copy
+    synthetic_yield = np.random.randint(800, 2000, size=len(df_pd_yield_ex4))
+    df_pd_yield_ex4["Yield"] = synthetic_yield
+    df_pl_yield_ex4 = df_pl_yield_ex4.with_columns(pl.Series("Yield", synthetic_yield))
 
     df_pd_yield_ex4.head()
     return df_pd_yield_ex4, df_pl_yield_ex4
@@ -931,14 +1144,16 @@ def _(np, pd, pl):
 
 @app.cell
 def _(df_pd_yield_ex4):
-    # Pandas solution
-    total_yield_pd = df_pd_yield_ex4.groupby("Crop")["Yield"].sum().reset_index().sort_values("Yield", ascending=False)
-    avg_yield_pd = df_pd_yield_ex4.groupby("Crop")["Yield"].mean().reset_index().sort_values("Yield", ascending=False)
+    # Pandas solution: one groupby computes both the total and the average
+    yield_summary_pd = (
+        df_pd_yield_ex4.groupby("Crop")
+        .agg(Total_Yield=("Yield", "sum"), Average_Yield=("Yield", "mean"))
+        .reset_index()
+        .sort_values("Total_Yield", ascending=False)
+    )
 
-    print("Pandas - Total Yield per Crop:")
-    print(total_yield_pd)
-    print("\nPandas - Average Yield per Crop:")
-    print(avg_yield_pd)
+    print("Pandas - Total and Average Yield per Crop:")
+    print(yield_summary_pd)
     return
 
 
@@ -954,22 +1169,38 @@ def _(df_pl_yield_ex4, pl):
     return
 
 
+@app.cell
+def _(df_pd_yield_ex4, df_pl_yield_ex4):
+    # The same summary for either library with one helper (add "count", "min", "max", "std" as needed)
+    from farm_survey.summary import summarize
+
+    crop_yield_aggs = [
+        ("Yield", "sum", "Total_Yield"),
+        ("Yield", "mean", "Average_Yield"),
+        ("Yield", "count", "Farms"),
+    ]
+    print(summarize(df_pd_yield_ex4, "Crop", crop_yield_aggs, sort_by="Total_Yield"))
+    summarize(df_pl_yield_ex4, "Crop", crop_yield_aggs, sort_by="Total_Yield")
+    return
+
+
 @app.cell
 def _(mo):
     mo.md("""
     **Explanation of the Solution:**
 
     - We added a **synthetic `Yield` column** to simulate realistic crop production values for each farm.
+    - `np.random.seed(42)` is fine for a few rows. For test data with millions of farms, `farm_survey.synth` builds survey-shaped tables in chunks, each with its own random generator, so they can be made in parallel and always come out the same: `synthetic_survey(1_000_000, coordinates=True)` in memory, or `write_synthetic_survey("survey.parquet", 100_000_000)` straight to a file.
     - **Grouping by `Crop`** allows us to summarize total and average yield per crop.
-    - In **Pandas**, `groupby("Crop")` with `.sum()` and `.mean()` efficiently calculates total and average yield.
+    - In **Pandas**, `groupby("Crop").agg(Total_Yield=("Yield", "sum"), Average_Yield=("Yield", "mean"))` calculates total and average yield from **one** grouping (calling `.sum()` and `.mean()` on two separate `groupby()`s would group the data twice).
     - In **Polars**, `group_by("Crop").agg([...])` achieves the same result in a single, fast operation.
     - **Sorting by total yield** highlights which crops contribute the most to production.
-      - In Pandas, `sort_values("Yield", ascending=False)` is used.
+      - In Pandas, `sort_values("Total_Yield", ascending=False)` is used.
       - In Polars, `sort("Total_Yield", descending=True)` is used (note `descending=True` replaces `reverse=True`).
     - These techniques are fundamental for **summarizing agricultural survey data** and identifying important patterns.
     - Optional extension:
       - You can **filter crops with low total yield** to focus analysis on high-performing crops:
-        - **Pandas:** `total_yield_pd[total_yield_pd["Yield"] > 5000]`
+        - **Pandas:** `yield_summary_pd[yield_summary_pd["Total_Yield"] > 5000]`
         - **Polars:** `yield_summary_pl.filter(pl.col("Total_Yield") > 5000)`
     """)
     return
@@ -1013,7 +1244,7 @@ def _(mo):
 
 
 @app.cell
-def _(np, pd, pl):
+def _(from_pandas, np, pd):
     # Run this code to create a dataset for your exercise
     # Create synthetic farm dataset
     np.random.seed(42)
@@ -1025,11 +1256,12 @@ def _(np, pd, pl):
         "Longitude": np.random.uniform(121.0, 121.5, size=20),
     })
 
-    # Add synthetic distance column (in degrees)
-    df_farms["Distance"] = np.random.rand(len(df_farms)) * 0.3  # ~0-33 km
+    # Add distance column (in degrees): distance from each farm to its nearest other farm
+    from farm_survey.features import nearest_distances
+    df_farms["Distance"] = nearest_distances(df_farms, k=1)[:, 0]
 
-    # Convert to Polars
-    df_farms_pl = pl.from_pandas(df_farms)
+    # Convert to Polars (numeric columns are shared with pandas, not copied)
+    df_farms_pl = from_pandas(df_farms)
 
     # Display the dataset
     df_farms.head()
@@ -1041,10 +1273,11 @@ def _(df_farms):
     # --- Pandas Solution ---
     df_eff_pd = df_farms.copy()
     df_eff_pd["Efficiency"] = df_eff_pd["Yield"] / (1 + df_eff_pd["Distance"])
-    df_eff_pd_sorted = df_eff_pd.sort_values("Efficiency", ascending=False)
+    # Same result as df_eff_pd.sort_values("Efficiency", ascending=False).head(5),
+    # but nlargest() only keeps the best 5 instead of sorting every farm
     print("Top 5 Efficient Farms (Pandas):")
-    df_eff_pd_sorted.head(5)
-    return
+    df_eff_pd.nlargest(5, "Efficiency")
+    return (df_eff_pd,)
 
 
 @app.cell
@@ -1052,9 +1285,20 @@ def _(df_farms_pl, pl):
     # --- Polars Solution ---
     df_eff_pl = df_farms_pl.with_columns(
         (pl.col("Yield") / (1 + pl.col("Distance"))).alias("Efficiency")
-    ).sort("Efficiency", descending=True)
+    )
+    # Same result as .sort("Efficiency", descending=True).head(5), without the full sort
     print("Top 5 Efficient Farms (Polars):")
-    df_eff_pl.head(5)
+    df_eff_pl.top_k(5, by="Efficiency").sort("Efficiency", descending=True)
+    return (df_eff_pl,)
+
+
+@app.cell
+def _(df_eff_pd, df_eff_pl):
+    # Top 2 farms per Crop (works the same for pandas and polars)
+    from farm_survey.ranking import top_k
+
+    print(top_k(df_eff_pd, "Efficiency", k=2, by="Crop"))
+    top_k(df_eff_pl, "Efficiency", k=2, by="Crop")
     return
 
 
@@ -1071,10 +1315,12 @@ def _(mo):
     - In Pandas, vectorized operations (`/` and `+`) allow fast computation for the entire column.
     - In Polars, the same calculation is done with `with_columns()` and expressions for efficiency.
     - Sorting the `Efficiency` column descending identifies the **top-performing farms** quickly.
-    - Note: In this synthetic dataset, `Distance` is a random value, so the metric is illustrative. In real surveys, `Distance` could be computed as:
-      - Euclidean distance to a reference point (like a market or survey office)
-      - Distance to the nearest farm
-      - Or using geospatial coordinates converted to kilometers
+      - When you only need the top few rows, `nlargest()` (pandas) and `top_k()` (polars) pick them without sorting the whole table, which matters for millions of farms.
+      - `top_k(df, "Efficiency", k=2, by="Crop")` from `farm_survey.ranking` returns the best farms **per crop**.
+    - Note: In this dataset, `Distance` is the Euclidean distance from each farm to its **nearest other farm**, computed with `nearest_distances()` (a grid index, so it also works for millions of farms). In real surveys, `Distance` could also be computed as:
+      - Euclidean distance to a reference point (like a market or survey office): `nearest_distances(df_farms, references=df_markets)`
+      - The average distance to the k nearest farms: `nearest_distances(df_farms, k=3).mean(axis=1)` (one row of k distances per farm); `add_nearest_distances(df_farms, k=3)` instead adds each of them as a column, `NN_Distance_1` to `NN_Distance_3`
+      - Or using geospatial coordinates converted to kilometers (`unit="km"`)
     - Displaying the **top 5 farms** helps survey analysts identify high-priority farms for logistics or further study.
     """)
     return
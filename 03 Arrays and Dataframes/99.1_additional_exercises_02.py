@@ -28,9 +28,6 @@ def _(mo):
 @app.cell
 def _():
     import pandas as pd
-    import numpy as np
-    import matplotlib.pyplot as plt
-    import seaborn as sns
     return (pd,)
 
 
@@ -154,6 +151,11 @@ def _(mo):
     - **High productivity**: ≥ 0.5 tons/day
     - **Moderate productivity**: 0.3 – 0.49 tons/day
     - **Low productivity**: < 0.3 tons/day
+
+    **Going further:** for one advisory per *farm* on millions of farms, a loop with
+    `print` per row is far too slow. `write_advisories(df, "advisories.txt",
+    "Labor_Productivity", LABOR_PRODUCTIVITY_BANDS, LABOR_PRODUCTIVITY_TEMPLATES)` from
+    `farm_survey.advisory` bands every row at once and streams the messages to a file.
     """)
     return
 
@@ -173,6 +175,11 @@ def _(mo):
     2. Use a lambda function:
        - "High" if Labor_Productivity ≥ 0.4
        - "Low" otherwise
+
+    **Going further:** the lambda runs once per row. On millions of rows, label the
+    whole column at once with `classify` from the `farm_survey` package:
+    `classify(df["Labor_Productivity"], [(-np.inf, "Low"), (0.4, "High")])`
+    (or `classify_expr("Labor_Productivity", ...)` in polars) and compare the timings.
     """)
     return
 
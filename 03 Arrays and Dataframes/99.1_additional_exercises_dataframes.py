@@ -34,9 +34,6 @@ def _(mo):
 @app.cell
 def _():
     import pandas as pd
-    import numpy as np
-    import matplotlib.pyplot as plt
-    import seaborn as sns
     return (pd,)
 
 
@@ -174,6 +171,11 @@ def _(mo):
     - **Low efficiency**: FEI < 0.07
 
     Use a **for loop** and conditional statements.
+
+    **Going further:** for one advisory per *farm* on millions of farms, a loop with
+    `print` per row is far too slow. `write_advisories(df, "advisories.txt", "FEI",
+    FEI_BANDS, FEI_TEMPLATES)` from `farm_survey.advisory` bands every row at once
+    and streams the messages to a file.
     """)
     return
 
@@ -194,6 +196,11 @@ def _(mo):
     2. Use a **lambda function**:
        - "Efficient" if FEI ≥ 0.08
        - "Inefficient" otherwise
+
+    **Going further:** the lambda runs once per row. On millions of rows, label the
+    whole column at once with `classify` from the `farm_survey` package:
+    `classify(df["FEI"], [(-np.inf, "Inefficient"), (0.08, "Efficient")])`
+    (or `classify_expr("FEI", ...)` in polars) and compare the timings.
     """)
     return
 
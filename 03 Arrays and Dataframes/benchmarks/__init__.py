@@ -0,0 +1,25 @@
+"""Benchmarks for the ``farm_survey`` helpers.
+
+Run them from the ``03 Arrays and Dataframes`` folder as modules, e.g.::
+
+    python -m benchmarks.bench_distance
+
+The timing and option helpers the scripts share are defined here.
+"""
+
+import time
+
+
+def best_time(fn, repeat):
+    """Shortest of ``repeat`` timings of ``fn()``, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def parse_sizes(text):
+    """``"1e3,1e4"`` -> [1000, 10000]: the ``--sizes`` option of the scripts."""
+    return [int(float(size)) for size in text.split(",")]
@@ -0,0 +1,55 @@
+"""Row-wise lambda classification (Task 6 of the 99.1 exercises) vs. ``classify``.
+
+    python -m benchmarks.bench_classify [--rows 10000000] [--repeat 3]
+
+Every variant labels the same random FEI values as "Efficient" (FEI >= 0.08)
+or "Inefficient"; the table shows the best time of ``--repeat`` runs and the
+rows per second. The lambda variants run only once, they are slow enough.
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from benchmarks import best_time
+from farm_survey.classify import classify, classify_expr
+
+BANDS = [(-np.inf, "Inefficient"), (0.08, "Efficient")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    fei = np.random.default_rng(42).gamma(2.0, 0.04, args.rows)
+    series_pd = pd.Series(fei, name="FEI")
+    df_pl = pl.DataFrame({"FEI": fei})
+
+    cases = [
+        ("pandas apply(lambda) (exercise)",
+         lambda: series_pd.apply(lambda x: "Efficient" if x >= 0.08 else "Inefficient"), 1),
+        ("polars map_elements(lambda)",
+         lambda: df_pl.select(
+             pl.col("FEI").map_elements(
+                 lambda x: "Efficient" if x >= 0.08 else "Inefficient", return_dtype=pl.String
+             )
+         ), 1),
+        ("numpy np.select",
+         lambda: np.select([fei >= 0.08], ["Efficient"], default="Inefficient"), args.repeat),
+        ("pandas classify (category)", lambda: classify(series_pd, BANDS), args.repeat),
+        ("polars classify_expr (Enum)", lambda: df_pl.select(classify_expr("FEI", BANDS)), args.repeat),
+    ]
+
+    print(f"{args.rows:,} rows, best of {args.repeat}")
+    print(f"{'variant':<36} {'seconds':>9} {'Mrows/s':>10}")
+    for label, fn, repeat in cases:
+        seconds = best_time(fn, repeat)
+        print(f"{label:<36} {seconds:>9.4f} {args.rows / seconds / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
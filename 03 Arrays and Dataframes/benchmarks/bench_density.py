@@ -0,0 +1,73 @@
+"""``plot.scatter`` (section 4.5) vs. ``density_plot`` as the survey grows.
+
+    python -m benchmarks.bench_density [--sizes 1e4,1e5,1e6,1e7]
+        [--scatter-max 1e6]
+
+Each case draws Yield_mt_per_ha against Farm_Area_ha into an off-screen
+figure (Agg backend) and saves it as PNG, so the time includes the actual
+rendering. ``peak MB`` is the largest amount of memory Python allocated
+while drawing (``tracemalloc``, which also sees NumPy arrays), on top of
+the frame itself. Scatter plots above ``--scatter-max`` rows are skipped,
+they take too long.
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from benchmarks import parse_sizes  # noqa: E402
+from farm_survey.metrics import YIELD, add_metrics  # noqa: E402
+from farm_survey.plotting import density_plot  # noqa: E402
+from farm_survey.synth import synthetic_survey  # noqa: E402
+
+
+def render(draw):
+    """Seconds and peak traced MB to draw a figure and save it as PNG."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    ax = draw()
+    ax.figure.savefig(io.BytesIO(), format="png")
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    plt.close(ax.figure)
+    return seconds, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=parse_sizes, default="1e4,1e5,1e6,1e7")
+    parser.add_argument("--scatter-max", type=float, default=1e6)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>12} {'plot':<30} {'seconds':>9} {'peak MB':>9}")
+    for rows in args.sizes:
+        df_pl = add_metrics(synthetic_survey(rows), [YIELD])
+        df_pd = df_pl.to_pandas()
+        cases = [
+            ("density_plot (polars)",
+             lambda: density_plot(df_pl, "Farm_Area_ha", "Yield_mt_per_ha")),
+            ("density_plot (pandas)",
+             lambda: density_plot(df_pd, "Farm_Area_ha", "Yield_mt_per_ha")),
+            ("density_plot + 2,000 sampled",
+             lambda: density_plot(df_pl, "Farm_Area_ha", "Yield_mt_per_ha", sample=2_000)),
+        ]
+        if rows <= args.scatter_max:
+            cases.insert(0, (
+                "pandas plot.scatter",
+                lambda: df_pd.plot.scatter(x="Farm_Area_ha", y="Yield_mt_per_ha"),
+            ))
+        for label, draw in cases:
+            seconds, peak = render(draw)
+            print(f"{rows:>12,} {label:<30} {seconds:>9.3f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Throughput of the section 4.6 distance expression vs. the geodesy kernels.
+
+    python -m benchmarks.bench_distance [--rows 10000000] [--repeat 5]
+
+Every kernel gets the same random farm pairs around the Philippines; the
+table shows the best time of ``--repeat`` runs, the pairs per second and
+the speedup against two baselines of the same dtype and library: the
+current ``degrees * 111`` expression and ``haversine_km``.
+"""
+
+import argparse
+
+import numpy as np
+import polars as pl
+
+from benchmarks import best_time
+from farm_survey.geodesy import (
+    equirectangular_km,
+    equirectangular_km_expr,
+    haversine_km,
+    haversine_km_expr,
+)
+
+# Latitude at the middle of make_pairs' range, for the ref_lat= kernels
+REF_LAT = 12.0
+
+
+def make_pairs(rows, dtype, seed=42):
+    rng = np.random.default_rng(seed)
+    lat1 = rng.uniform(5.0, 19.0, rows)
+    lon1 = rng.uniform(117.0, 127.0, rows)
+    lat2 = lat1 + rng.uniform(-0.5, 0.5, rows)
+    lon2 = lon1 + rng.uniform(-0.5, 0.5, rows)
+    return [a.astype(dtype) for a in (lat1, lon1, lat2, lon2)]
+
+
+def numpy_cases(rows, dtype):
+    """(label, callable) of the NumPy kernels on ``rows`` pairs of ``dtype``.
+
+    A function of its own so every callable closes over the arrays of its
+    dtype: lambdas made in the loop of ``main`` would all see the last one.
+    The first case is the current expression, the second ``haversine_km``.
+    """
+    lat1, lon1, lat2, lon2 = make_pairs(rows, dtype)
+    out = np.empty(rows, dtype=dtype)
+    work = np.empty((2, rows), dtype=dtype)
+    name = np.dtype(dtype).name
+    return [
+        (f"degrees * 111 (current)    {name}",
+         lambda: np.sqrt((lat2 - lat1) ** 2 + (lon2 - lon1) ** 2) * 111),
+        (f"haversine_km               {name}",
+         lambda: haversine_km(lat1, lon1, lat2, lon2)),
+        (f"haversine_km out=, work=   {name}",
+         lambda: haversine_km(lat1, lon1, lat2, lon2, out=out, work=work)),
+        (f"equirectangular_km out=    {name}",
+         lambda: equirectangular_km(lat1, lon1, lat2, lon2, out=out, work=work[:1])),
+        (f"equirectangular ref_lat=   {name}",
+         lambda: equirectangular_km(
+             lat1, lon1, lat2, lon2, out=out, work=work[:1], ref_lat=REF_LAT
+         )),
+    ]
+
+
+def polars_cases(rows):
+    """(label, callable) of the polars expressions, in the order of ``numpy_cases``."""
+    lat1, lon1, lat2, lon2 = make_pairs(rows, np.float64)
+    df = pl.DataFrame({"Lat1": lat1, "Lon1": lon1, "Lat2": lat2, "Lon2": lon2})
+    columns = ("Lat1", "Lon1", "Lat2", "Lon2")
+    current_expr = (
+        ((pl.col("Lat2") - pl.col("Lat1")) ** 2 + (pl.col("Lon2") - pl.col("Lon1")) ** 2).sqrt()
+        * 111
+    )
+    return [
+        ("polars degrees * 111 (current)", lambda: df.select(current_expr)),
+        ("polars haversine_km_expr", lambda: df.select(haversine_km_expr(*columns))),
+        ("polars equirectangular_km_expr", lambda: df.select(equirectangular_km_expr(*columns))),
+        ("polars equirectangular ref_lat=",
+         lambda: df.select(equirectangular_km_expr(*columns, ref_lat=REF_LAT))),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    groups = [numpy_cases(args.rows, dtype) for dtype in (np.float64, np.float32)]
+    groups.append(polars_cases(args.rows))
+
+    print(f"{args.rows:,} pairs, best of {args.repeat}")
+    print(
+        f"{'kernel':<36} {'seconds':>9} {'Mpairs/s':>10} {'x current':>10} {'x haversine':>12}"
+    )
+    for cases in groups:
+        seconds = [best_time(fn, args.repeat) for _, fn in cases]
+        current, haversine = seconds[0], seconds[1]
+        for (label, _), s in zip(cases, seconds):
+            print(
+                f"{label:<36} {s:>9.4f} {args.rows / s / 1e6:>10.1f} "
+                f"{current / s:>10.2f} {haversine / s:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""pandas vs. polars on every DataFrame operation shown in 02_dataframes.py.
+
+    python -m benchmarks.bench_engines [--sizes 1e3,1e4,1e5,1e6,1e7,1e8]
+        [--repeat 3] [--output results.json] [--baseline baseline.json]
+
+For each table size and engine the suite times ``read_csv``, column select,
+boolean filter, derived column, join, fill of missing values, group-by and
+sort on the same synthetic farm survey (``farm_survey.synth``). Every case
+runs in a fresh process, so the peak resident memory it reports
+(``resource`` module, Unix only) covers only that case: building its input
+plus the operation. ``+MB`` is how far the operation pushed the peak above
+what its input needed. Results go to a JSON file; with ``--baseline`` (an
+earlier results file) every case is also compared with its old time.
+
+The 10^8-row cases need a few GB of disk for the CSV and 10+ GB of memory
+for pandas; drop them from ``--sizes`` on smaller machines.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from benchmarks import best_time, parse_sizes
+from farm_survey.synth import synthetic_survey, write_synthetic_survey
+
+ENGINES = ("pandas", "polars")
+OPERATIONS = ("read_csv", "select", "filter", "derived", "join", "fill_null", "group_by", "sort")
+
+# Share of Production_mt values left missing, for fill_null
+MISSING_SHARE = 0.05
+
+# A case is reported as a regression if it is this much slower than baseline
+REGRESSION_THRESHOLD = 0.10
+
+
+def make_survey(rows, seed=42):
+    """Synthetic survey as a polars frame with text columns, as read from CSV."""
+    df = synthetic_survey(rows, seed=seed, missing=MISSING_SHARE)
+    return df.with_columns(pl.col("Region", "Crop").cast(pl.String))
+
+
+def make_details(rows, seed=7):
+    """A second table keyed by Farm_ID in shuffled order, for the join."""
+    rng = np.random.default_rng(seed)
+    return {
+        "Farm_ID": rng.permutation(np.arange(1, rows + 1)),
+        "Household_Size": rng.integers(1, 10, rows),
+    }
+
+
+def _frame(engine, df):
+    return df.to_pandas() if engine == "pandas" else df
+
+
+def _pandas_operation(operation, df, details, csv_path):
+    if operation == "read_csv":
+        return lambda: pd.read_csv(csv_path)
+    return {
+        "select": lambda: df[["Crop", "Production_mt"]],
+        "filter": lambda: df[df["Region"] == "III"],
+        "derived": lambda: df.assign(Yield_mt_per_ha=df["Production_mt"] / df["Farm_Area_ha"]),
+        "join": lambda: df.merge(details, on="Farm_ID"),
+        "fill_null": lambda: df.fillna({"Production_mt": 0.0}),
+        "group_by": lambda: df.groupby("Crop").agg(
+            Total=("Production_mt", "sum"), Average=("Production_mt", "mean")
+        ),
+        "sort": lambda: df.sort_values("Production_mt"),
+    }[operation]
+
+
+def _polars_operation(operation, df, details, csv_path):
+    if operation == "read_csv":
+        return lambda: pl.read_csv(csv_path)
+    return {
+        "select": lambda: df.select("Crop", "Production_mt"),
+        "filter": lambda: df.filter(pl.col("Region") == "III"),
+        "derived": lambda: df.with_columns(
+            (pl.col("Production_mt") / pl.col("Farm_Area_ha")).alias("Yield_mt_per_ha")
+        ),
+        "join": lambda: df.join(details, on="Farm_ID"),
+        "fill_null": lambda: df.with_columns(pl.col("Production_mt").fill_null(0.0)),
+        "group_by": lambda: df.group_by("Crop").agg(
+            pl.sum("Production_mt").alias("Total"), pl.mean("Production_mt").alias("Average")
+        ),
+        "sort": lambda: df.sort("Production_mt"),
+    }[operation]
+
+
+def _max_rss_mb():
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(case):
+    """Time one (engine, operation, rows) case; runs in its own process."""
+    engine, operation, rows, repeat, csv_path = case
+    df = details = None
+    if operation != "read_csv":
+        df = _frame(engine, make_survey(rows))
+        if operation == "join":
+            details = _frame(engine, pl.DataFrame(make_details(rows)))
+    build = _pandas_operation if engine == "pandas" else _polars_operation
+    fn = build(operation, df, details, csv_path)
+
+    rss_before = _max_rss_mb()
+    seconds = best_time(fn, repeat)
+    peak = _max_rss_mb()
+    return {
+        "engine": engine,
+        "operation": operation,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds > 0 else None,
+        "peak_rss_mb": round(peak, 1),
+        # Extra memory the operation needed on top of its input
+        "rss_increase_mb": round(peak - rss_before, 1),
+    }
+
+
+def write_csv(rows, directory):
+    path = os.path.join(directory, f"survey_{rows}.csv")
+    return write_synthetic_survey(path, rows, missing=MISSING_SHARE)
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Rows of (case, old seconds, new seconds, ratio, flag) for shared cases."""
+    old = {(r["engine"], r["operation"], r["rows"]): r["seconds"] for r in baseline["results"]}
+    rows = []
+    for r in results:
+        key = (r["engine"], r["operation"], r["rows"])
+        if key in old and old[key] > 0:
+            ratio = r["seconds"] / old[key]
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "slower"
+            elif ratio < 1 - threshold:
+                flag = "faster"
+            rows.append((key, old[key], r["seconds"], ratio, flag))
+    return rows
+
+
+def speedups(results):
+    """(rows, operation, pandas seconds / polars seconds) for every pair."""
+    times = {(r["rows"], r["operation"], r["engine"]): r["seconds"] for r in results}
+    return [
+        (rows, operation, seconds / times[rows, operation, "polars"])
+        for (rows, operation, engine), seconds in times.items()
+        if engine == "pandas" and times.get((rows, operation, "polars"))
+    ]
+
+
+def _metadata():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pandas": pd.__version__,
+        "polars": pl.__version__,
+        "numpy": np.__version__,
+        "polars_threads": pl.thread_pool_size(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=parse_sizes, default="1e3,1e4,1e5,1e6,1e7,1e8")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--operations", default=",".join(OPERATIONS))
+    parser.add_argument("--output", default="bench_engines.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    engines = args.engines.split(",")
+    operations = args.operations.split(",")
+    results = []
+    # Fresh process per case so ru_maxrss only sees that case
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp, ctx.Pool(1, maxtasksperchild=1) as pool:
+        print(
+            f"{'rows':>12} {'operation':<10} {'engine':<7} {'seconds':>10} "
+            f"{'Mrows/s':>9} {'peak MB':>9} {'+MB':>8}"
+        )
+        for rows in args.sizes:
+            csv_path = write_csv(rows, tmp) if "read_csv" in operations else None
+            for operation in operations:
+                for engine in engines:
+                    r = pool.apply(run_case, ((engine, operation, rows, args.repeat, csv_path),))
+                    results.append(r)
+                    print(
+                        f"{rows:>12,} {operation:<10} {engine:<7} {r['seconds']:>10.4f} "
+                        f"{(r['rows_per_second'] or 0) / 1e6:>9.1f} {r['peak_rss_mb']:>9.1f} "
+                        f"{r['rss_increase_mb']:>8.1f}"
+                    )
+            if csv_path is not None:
+                os.remove(csv_path)
+
+    with open(args.output, "w") as f:
+        json.dump({"metadata": _metadata(), "repeat": args.repeat, "results": results}, f, indent=2)
+    print(f"results written to {args.output}")
+
+    pairs = speedups(results)
+    if pairs:
+        print(f"\n{'rows':>12} {'operation':<10} {'polars speedup':>15}")
+        for rows, operation, ratio in pairs:
+            print(f"{rows:>12,} {operation:<10} {ratio:>14.1f}x")
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\ncompared with {args.baseline}")
+        print(
+            f"{'rows':>12} {'operation':<10} {'engine':<7} {'baseline':>10} "
+            f"{'now':>10} {'ratio':>7}"
+        )
+        for key, old, new, ratio, flag in compare(results, baseline, args.threshold):
+            engine, operation, rows = key
+            print(
+                f"{rows:>12,} {operation:<10} {engine:<7} {old:>10.4f} {new:>10.4f} "
+                f"{ratio:>7.2f} {flag}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Hash joins (pd.merge / DataFrame.join) vs. ``merge_join`` on sorted Farm_IDs.
+
+    python -m benchmarks.bench_join [--rows 10000000] [--repeat 3]
+
+Both tables have ``--rows`` rows sorted by Farm_ID, and 90% of the IDs match,
+as in section 4.3 with a survey-sized table on each side. The library joins
+are run with and without their 1:1 validation, since ``merge_join``
+validates by default.
+"""
+
+import argparse
+
+import numpy as np
+import polars as pl
+
+from benchmarks import best_time
+from farm_survey.joins import merge_join
+from farm_survey.synth import synthetic_survey
+
+
+def make_tables(rows, seed=42):
+    """Survey table with Farm_ID 1..rows, and a farm-details table offset by 10%."""
+    farms = synthetic_survey(rows, seed=seed).with_columns(pl.col("Region", "Crop").cast(pl.String))
+    rng = np.random.default_rng(seed)
+    first = rows // 10 + 1
+    details = pl.DataFrame(
+        {
+            "Farm_ID": np.arange(first, first + rows),
+            "Household_Size": rng.integers(1, 10, rows),
+            "Fertilizer_kg": rng.uniform(20.0, 400.0, rows).round(1),
+        }
+    )
+    return farms, details
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    farms_pl, details_pl = make_tables(args.rows)
+    farms_pd, details_pd = farms_pl.to_pandas(), details_pl.to_pandas()
+
+    cases = [
+        ("pandas pd.merge", lambda: farms_pd.merge(details_pd, on="Farm_ID")),
+        ("pandas pd.merge validate='1:1'",
+         lambda: farms_pd.merge(details_pd, on="Farm_ID", validate="1:1")),
+        ("pandas merge_join", lambda: merge_join(farms_pd, details_pd)),
+        ("pandas merge_join assume_sorted",
+         lambda: merge_join(farms_pd, details_pd, assume_sorted=True)),
+        ("polars join", lambda: farms_pl.join(details_pl, on="Farm_ID")),
+        ("polars join validate='1:1'",
+         lambda: farms_pl.join(details_pl, on="Farm_ID", validate="1:1")),
+        ("polars merge_join", lambda: merge_join(farms_pl, details_pl)),
+        ("polars merge_join assume_sorted",
+         lambda: merge_join(farms_pl, details_pl, assume_sorted=True)),
+    ]
+
+    print(f"{args.rows:,} x {args.rows:,} rows, best of {args.repeat}")
+    print(f"{'join':<36} {'seconds':>9} {'Mrows/s':>10}")
+    for label, fn in cases:
+        seconds = best_time(fn, args.repeat)
+        print(f"{label:<36} {seconds:>9.4f} {args.rows / seconds / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
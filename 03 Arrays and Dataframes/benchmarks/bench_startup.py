@@ -0,0 +1,118 @@
+"""Cold-start time of the marimo apps, with a budget that fails the run.
+
+    python -m benchmarks.bench_startup [--budget 5.0] [--load-budget SECONDS]
+        [--repeat 3] [apps ...]
+
+Every app is started in a fresh ``python -X importtime`` process that loads
+the app file and runs it headless with marimo's public ``App.run()``, as a
+batch run does. Both times are wall times from starting the interpreter:
+``load`` until the app is defined (``import marimo`` and the cell
+definitions, before any cell runs) and ``run`` until ``App.run()`` has run
+every cell. The table shows the best of ``--repeat`` starts and the
+slowest top-level imports of the process, which is where start-up time
+goes. If an app's run takes longer than ``--budget`` seconds, or its load
+longer than ``--load-budget``, the script exits with status 1, so it can
+guard a CI job or a container build.
+
+Run it from ``03 Arrays and Dataframes``; the default apps are the
+notebook and the three 99.1 exercise apps.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+APPS = (
+    "02_dataframes.py",
+    "99.1_additional_exercises_01.py",
+    "99.1_additional_exercises_02.py",
+    "99.1_additional_exercises_dataframes.py",
+)
+
+# Default budget, in seconds, for the time to run all cells
+BUDGET_SECONDS = 5.0
+
+# Imports faster than this (seconds) are not listed
+SHOWN_IMPORT_MIN = 0.01
+
+# Top-level imports listed per app
+SHOWN_IMPORTS = 3
+
+# Loads an app in a fresh interpreter and runs it with App.run(); prints the
+# time stamps of both steps
+_CHILD = """
+import importlib.util, os, sys, time
+path = sys.argv[1]
+sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+spec = importlib.util.spec_from_file_location("app", path)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+loaded = time.time()
+module.app.run()
+print(loaded, time.time())
+sys.stdout.flush()
+os._exit(0)
+"""
+
+
+def parse_importtime(stderr):
+    """(module, cumulative seconds) of every top-level import in the output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # nested imports are indented
+            imports.append((name.strip(), int(cumulative) / 1e6))
+    return imports
+
+
+def start_app(path):
+    """(seconds to load the app, seconds to run it, imports) of one start."""
+    # No windows: plots go to an off-screen canvas
+    env = dict(os.environ, MPLBACKEND="Agg")
+    started = time.time()
+    done = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD, path],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if done.returncode != 0:
+        raise RuntimeError(f"{path} failed:\n{done.stderr[-2000:]}")
+    # Cells may print too: the child's time stamps are its last line
+    loaded, finished = map(float, done.stdout.splitlines()[-1].split())
+    return loaded - started, finished - started, parse_importtime(done.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("apps", nargs="*", default=list(APPS))
+    parser.add_argument("--budget", type=float, default=BUDGET_SECONDS)
+    parser.add_argument("--load-budget", type=float, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"best of {args.repeat}, seconds from interpreter start")
+    print(f"{'app':<42} {'load':>8} {'run':>8}  slowest imports")
+    over = []
+    for path in args.apps:
+        runs = [start_app(path) for _ in range(args.repeat)]
+        load = min(run[0] for run in runs)
+        total, _, imports = min((run[1], i, run[2]) for i, run in enumerate(runs))
+        slowest = sorted(imports, key=lambda item: item[1], reverse=True)[:SHOWN_IMPORTS]
+        listed = ", ".join(f"{name} {t:.2f}" for name, t in slowest if t >= SHOWN_IMPORT_MIN)
+        late = total > args.budget or (args.load_budget is not None and load > args.load_budget)
+        flag = "  OVER BUDGET" if late else ""
+        print(f"{path:<42} {load:>8.3f} {total:>8.3f}  {listed}{flag}")
+        if late:
+            over.append(path)
+
+    if over:
+        parser.exit(1, f"{len(over)} app(s) over budget\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""Helpers for working with the PSA farm survey data at scale.
+
+The notebooks in ``03 Arrays and Dataframes`` teach the basic pandas and
+polars operations on a small ``farm_survey_large.csv``. The modules in this
+package implement the same operations in a way that keeps working when the
+survey extracts grow to millions of rows.
+"""
+
+SURVEY_CSV = "farm_survey_large.csv"
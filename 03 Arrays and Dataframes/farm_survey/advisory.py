@@ -0,0 +1,163 @@
+"""Advisory messages for every farm, rendered and written without a row loop.
+
+Task 5 of the 99.1 exercises prints one advisory per crop from a ``for``
+loop. Done per farm for millions of farms, that loop (and its ``print``)
+would run millions of times. Here the band of every row is assigned at once
+with ``classify_expr`` and the message is filled in from one template per
+band with polars string expressions; ``write_advisories`` streams the
+messages to a text file, one line per farm::
+
+    write_advisories(df, "advisories.txt", "FEI", FEI_BANDS, FEI_TEMPLATES)
+
+Templates use ``{Column}`` placeholders for any column of the frame, e.g.
+``"Farm {Farm_ID}: FEI {FEI} - low efficiency"``. The classified column is
+rounded to ``decimals`` places before it is inserted, and a missing value
+is written as ``MISSING_TEXT``.
+"""
+
+import string
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from .classify import band_labels, classify_expr
+from .interchange import from_pandas
+
+# Bands of Task 5 in the 99.1 exercises, as (lower bound, band) pairs
+FEI_BANDS = [(-np.inf, "Low"), (0.07, "Moderate"), (0.10, "High")]
+LABOR_PRODUCTIVITY_BANDS = [(-np.inf, "Low"), (0.3, "Moderate"), (0.5, "High")]
+
+# Inserted for a placeholder whose column value is missing
+MISSING_TEXT = "n/a"
+
+# Chunk size used to count the written lines
+_READ_BYTES = 1 << 24
+
+FEI_TEMPLATES = {
+    "High": "Farm {Farm_ID} ({Crop}): FEI {FEI} - high efficiency. "
+    "Keep current practices.",
+    "Moderate": "Farm {Farm_ID} ({Crop}): FEI {FEI} - moderate efficiency. "
+    "Review fertilizer timing.",
+    "Low": "Farm {Farm_ID} ({Crop}): FEI {FEI} - low efficiency. "
+    "Schedule a soil test and extension visit.",
+}
+LABOR_PRODUCTIVITY_TEMPLATES = {
+    "High": "Farm {Farm_ID} ({Crop}): {Labor_Productivity} t/day - high productivity.",
+    "Moderate": "Farm {Farm_ID} ({Crop}): {Labor_Productivity} t/day - moderate productivity. "
+    "Consider mechanization.",
+    "Low": "Farm {Farm_ID} ({Crop}): {Labor_Productivity} t/day - low productivity. "
+    "Review labor allocation.",
+}
+
+
+def _split(template):
+    """``"a {X} b {Y}"`` -> (["a ", " b ", ""], ["X", "Y"])."""
+    literals, fields = [""], []
+    for literal, field_name, _, _ in string.Formatter().parse(template):
+        literals[-1] += literal
+        if field_name is not None:
+            fields.append(field_name)
+            literals.append("")
+    return literals, fields
+
+
+def _field(name, rounded, decimals):
+    column = pl.col(name)
+    if name == rounded:
+        column = column.round(decimals)
+    # concat_str would turn the whole message null
+    return column.cast(pl.String).fill_null(MISSING_TEXT)
+
+
+def template_expr(template, rounded=None, decimals=3):
+    """Polars expression filling ``{Column}`` placeholders of ``template``.
+
+    Column ``rounded`` is rounded to ``decimals`` places first.
+    """
+    literals, fields = _split(template)
+    parts = [pl.lit(literals[0])]
+    for name, literal in zip(fields, literals[1:]):
+        parts += [_field(name, rounded, decimals), pl.lit(literal)]
+    return pl.concat_str(parts)
+
+
+def render_expr(band, labels, templates, rounded=None, decimals=3):
+    """Message of each row from the template of its band (null without a band).
+
+    band   - name of the Enum column made by ``classify_expr``
+    labels - its categories, ``band_labels(bands)``
+
+    When all templates use the same placeholders in the same order (as the
+    presets here do), the placeholder values are rendered once per row and
+    the text between them is picked by the band's integer code.
+    """
+    split = [_split(templates[label]) for label in labels]
+    if len({tuple(fields) for _, fields in split}) != 1:
+        expr = pl
+        for label in labels:
+            expr = expr.when(pl.col(band) == label).then(
+                template_expr(templates[label], rounded, decimals)
+            )
+        return expr.otherwise(None)
+
+    codes = pl.col(band).to_physical()
+    fields = split[0][1]
+    texts = [
+        pl.lit(pl.Series([literals[i] for literals, _ in split], dtype=pl.String)).gather(codes)
+        for i in range(len(fields) + 1)
+    ]
+    parts = [texts[0]]
+    for name, text in zip(fields, texts[1:]):
+        parts += [_field(name, rounded, decimals), text]
+    return pl.concat_str(parts)
+
+
+def _check_templates(bands, templates):
+    missing = {label for _, label in bands} - set(templates)
+    if missing:
+        raise ValueError(f"no template for bands {sorted(missing)}")
+
+
+def advisories(df, column, bands, templates, *, decimals=3):
+    """Return ``df`` (polars) with ``{column}_Band`` and ``Advisory`` columns.
+
+    Every label of ``bands`` needs a template in ``templates``.
+    """
+    _check_templates(bands, templates)
+    if isinstance(df, pd.DataFrame):
+        df = from_pandas(df)
+    band = f"{column}_Band"
+    return df.with_columns(classify_expr(column, bands).alias(band)).with_columns(
+        render_expr(band, band_labels(bands), templates, column, decimals).alias("Advisory")
+    )
+
+
+def write_advisories(df, path, column, bands, templates, *, decimals=3):
+    """Stream one advisory line per classified row of ``df`` to ``path``.
+
+    df - pandas DataFrame, polars DataFrame or LazyFrame (e.g. a scan of a
+         large CSV, which is then never loaded into memory as a whole)
+
+    Rows without a band (a missing value in ``column``) are skipped; other
+    missing values are written as ``MISSING_TEXT``. Returns the number of
+    lines written.
+    """
+    _check_templates(bands, templates)
+    if isinstance(df, pd.DataFrame):
+        df = from_pandas(df)
+    band = f"{column}_Band"
+    message = render_expr(band, band_labels(bands), templates, column, decimals)
+    messages = (
+        df.lazy()
+        .with_columns(classify_expr(column, bands).alias(band))
+        .filter(pl.col(band).is_not_null())
+        .select(message.alias("Advisory"))
+    )
+    # A single text column without quoting or header is one message per line
+    messages.sink_csv(path, include_header=False, quote_style="never")
+    lines = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(_READ_BYTES):
+            lines += chunk.count(b"\n")
+    return lines
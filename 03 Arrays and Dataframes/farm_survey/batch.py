@@ -0,0 +1,218 @@
+"""Run the notebook's survey pipeline over many files, headless and in parallel.
+
+``02_dataframes.py`` loads ``farm_survey_large.csv``, adds the yield column,
+summarizes production by crop and exports the table - for one file, inside
+a marimo app. Surveys come as one file per province and season, so this
+module runs the same steps as a batch job::
+
+    python -m farm_survey.batch "surveys/*/*.csv" --output farm_survey_output_batch --workers 4
+
+Every input file is processed in its own worker process (at most
+``--workers`` at a time) and gets its own output directory, mirroring the
+input's path below the common parent of all inputs::
+
+    farm_survey_output_batch/
+        batch_summary.csv                  timings of every file
+        ilocos/2024_wet/
+            crop_summary.csv               the section 4.5 table
+            survey/Region=I/part-00000.parquet
+
+Each file runs as one lazy polars query (``lazy.scan_survey``): the CSV is
+scanned once by the streaming engine, and the crop summary and the export
+are both sinks of that scan, so a worker never holds a whole survey in
+memory and writes nothing next to its input. ``Region`` and ``Crop`` stay
+plain strings, so a survey with crops outside ``KNOWN_CATEGORIES`` goes
+through like any other. A file that fails is reported and the others carry
+on; the exit status is 1 if any file failed.
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import polars as pl
+
+from .export import FORMATS, sink_survey
+from .lazy import scan_survey, with_yield
+from .summary import summarize
+
+# Default directory for the outputs (git-ignored like the notebook's exports)
+OUTPUT_DIR = "farm_survey_output_batch"
+
+# The section 4.5 crop summary, as in ``lazy.crop_yield_summary``
+CROP_SUMMARY = [
+    ("Production_mt", "sum", "Total_Production_mt"),
+    ("Farm_Area_ha", "sum", "Total_Area_ha"),
+    ("Yield_mt_per_ha", "mean", "Average_Yield_mt_per_ha"),
+    ("Farm_ID", "count", "Farms"),
+]
+
+
+def output_dirs(paths, output_dir):
+    """Output directory of every input: its path below the inputs' common parent."""
+    paths = [os.path.abspath(p) for p in paths]
+    root = os.path.commonpath([os.path.dirname(p) for p in paths]) if paths else ""
+    return {
+        path: os.path.join(output_dir, os.path.splitext(os.path.relpath(path, root))[0])
+        for path in paths
+    }
+
+
+def _empty_result(path, out_dir, error=None):
+    return {"file": path, "output": out_dir, "rows": None, "seconds": None, "error": error}
+
+
+def run_file(path, out_dir, fmt="parquet", partition_by="Region"):
+    """Scan -> yield -> crop summary and export for one survey file.
+
+    The three outputs - the export, ``crop_summary.csv`` and the row count -
+    come from one ``pl.collect_all`` over a single streaming scan of the CSV.
+    Returns a dict with the file, its number of rows, the seconds it took and
+    ``error`` (None, or the message if the file failed).
+    """
+    result = _empty_result(path, out_dir)
+    start = time.perf_counter()
+    try:
+        survey = with_yield(scan_survey(path))
+        crops = summarize(survey, "Crop", CROP_SUMMARY, sort_by="Total_Production_mt")
+        export = sink_survey(
+            survey, os.path.join(out_dir, "survey"), fmt=fmt, partition_by=partition_by,
+            overwrite=True, lazy=True,
+        )
+        _, _, rows = pl.collect_all(
+            [
+                export,
+                crops.sink_csv(os.path.join(out_dir, "crop_summary.csv"), mkdir=True, lazy=True),
+                survey.select(pl.len()),
+            ],
+            engine="streaming",
+        )
+        result["rows"] = rows.item()
+    except Exception as error:  # reported in the summary; the other files go on
+        # First line only: polars appends the query plan to its messages
+        message = str(error).strip().splitlines()
+        result["error"] = f"{type(error).__name__}: {message[0] if message else ''}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_batch(paths, output_dir=OUTPUT_DIR, *, workers=None, fmt="parquet", partition_by="Region",
+              progress=None):
+    """Run ``run_file`` on every path in a pool of ``workers`` processes.
+
+    workers  - concurrency limit (default: one per CPU)
+    progress - optional callable, called with each result as its file finishes
+
+    Returns the results in the order of ``paths``; a file whose worker
+    process failed gets an ``error`` and no timing. Each worker runs polars
+    on CPUs / workers threads, so the processes do not compete for cores.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+    workers = workers or os.cpu_count()
+    targets = output_dirs(paths, output_dir)
+
+    # Spawned workers read the thread count when they import polars
+    saved = os.environ.get("POLARS_MAX_THREADS")
+    if saved is None:
+        os.environ["POLARS_MAX_THREADS"] = str(max(1, (os.cpu_count() or 1) // workers))
+    try:
+        # Fresh interpreters: forking a process that runs polars threads can deadlock
+        pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        with pool:
+            futures = {
+                pool.submit(run_file, path, out_dir, fmt, partition_by): path
+                for path, out_dir in targets.items()
+            }
+            results = {}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    result = future.result()
+                except Exception as error:
+                    # The worker died (e.g. BrokenProcessPool after a crash or
+                    # out-of-memory kill) or its result could not be sent back:
+                    # this file fails, the results of the others are kept
+                    result = _empty_result(path, targets[path], f"{type(error).__name__}: {error}")
+                results[path] = result
+                if progress is not None:
+                    progress(result)
+    finally:
+        if saved is None:
+            del os.environ["POLARS_MAX_THREADS"]
+    return [results[path] for path in targets]
+
+
+def _seconds(value):
+    return f"{value:>8.2f}" if value is not None else f"{'-':>8}"
+
+
+def format_summary(results, wall_seconds):
+    """Table of per-file timings with totals and throughput.
+
+    Failed files show ``failed`` and their error, with no row count, and
+    are left out of the rows and rows/s of the totals.
+    """
+    # Files are named by their path below the common parent, as their outputs
+    root = os.path.commonpath([os.path.dirname(r["file"]) for r in results]) if results else ""
+    names = [os.path.relpath(r["file"], root) for r in results]
+    name_width = max([len(name) for name in names] + [4])
+    lines = [f"{'file':<{name_width}} {'rows':>12} {'seconds':>8}  status"]
+    for name, r in zip(names, results):
+        if r["error"] is None:
+            rows, status = f"{r['rows']:>12,}", "ok"
+        else:
+            rows, status = f"{'-':>12}", f"failed: {r['error']}"
+        lines.append(f"{name:<{name_width}} {rows} {_seconds(r['seconds'])}  {status}")
+    rows = sum(r["rows"] for r in results if r["error"] is None)
+    busy = sum(r["seconds"] or 0 for r in results)
+    failed = sum(r["error"] is not None for r in results)
+    lines.append(
+        f"{len(results)} files ({failed} failed), {rows:,} rows in {wall_seconds:.2f} s wall "
+        f"({rows / wall_seconds if wall_seconds else 0:,.0f} rows/s); "
+        f"{busy:.2f} s of work, {busy / wall_seconds if wall_seconds else 0:.1f}x parallel"
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m farm_survey.batch", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("patterns", nargs="+", help='input files or globs, e.g. "surveys/*.csv"')
+    parser.add_argument("--output", default=OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="processes at once (default: CPUs)")
+    parser.add_argument("--fmt", choices=FORMATS, default="parquet")
+    parser.add_argument("--partition-by", default="Region", help='column, or "none"')
+    args = parser.parse_args(argv)
+
+    paths = sorted({p for pattern in args.patterns for p in glob.glob(pattern, recursive=True)})
+    if not paths:
+        parser.error(f"no files match {' '.join(args.patterns)}")
+    partition_by = None if args.partition_by.lower() == "none" else args.partition_by
+
+    def progress(result):
+        status = f"failed: {result['error']}" if result["error"] else f"{result['seconds']:.2f} s"
+        print(f"done {result['file']}: {status}", flush=True)
+
+    start = time.perf_counter()
+    results = run_batch(
+        paths, args.output, workers=args.workers, fmt=args.fmt, partition_by=partition_by,
+        progress=progress,
+    )
+    wall_seconds = time.perf_counter() - start
+
+    os.makedirs(args.output, exist_ok=True)
+    pl.DataFrame(results).write_csv(os.path.join(args.output, "batch_summary.csv"))
+    print()
+    print(format_summary(results, wall_seconds))
+    if any(r["error"] is not None for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
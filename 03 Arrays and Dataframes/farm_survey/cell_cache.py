@@ -0,0 +1,277 @@
+"""Cell results kept on disk, so a reopened notebook skips unchanged work.
+
+``load_survey`` keeps parsed frames in memory, but only for one session:
+every time ``02_dataframes.py`` is opened, the yield columns and group-bys
+are computed again from the same inputs. ``cached`` stores the frame a
+function returns as a Parquet file in ``CACHE_DIR``, under a key made of
+
+- a hash of the function's compiled code (editing the function, other than
+  its comments, gives a new key) and of the ``farm_survey`` sources, so
+  editing a helper such as ``lazy.crop_yield_summary`` does too,
+- a fingerprint of every argument, default value and closed-over variable
+  (in a marimo cell, upstream values reach a nested function as closure
+  variables): path, size and modification time for a file path, a hash of
+  the contents for a pandas or polars frame or NumPy array, the code for a
+  function, and the value itself for numbers, strings and the like.
+
+The next call with the same code and inputs - in this session or a later
+one - reads the file back instead of calling the function::
+
+    @cached
+    def crop_summary(path):
+        return collect_streaming(crop_yield_summary(path))
+
+    crop_summary("farm_survey_large.csv")   # computed, then stored
+    crop_summary("farm_survey_large.csv")   # read from .farm_survey_cache/
+
+Module-level globals are not fingerprinted: a cached function must get its
+other inputs as arguments or closure variables. Hashing a frame input is
+one pass over it, so cache work that is much heavier than that.
+The cache is an LRU bounded by ``MAX_CACHE_BYTES``: reading an entry marks
+it as recently used, and the least recently used files are deleted once
+the directory grows past the limit.
+"""
+
+import dataclasses
+import functools
+import hashlib
+import os
+import sys
+import threading
+import types
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .loader import file_fingerprint
+
+# Directory of the cached results, relative to the working directory
+CACHE_DIR = ".farm_survey_cache"
+
+# Cached files are deleted, least recently used first, above this many bytes
+MAX_CACHE_BYTES = 1 << 30
+
+# File name suffix of an entry, by the library of the cached frame
+_SUFFIXES = {"polars": ".pl.parquet", "pandas": ".pd.parquet"}
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _update(digest, value):
+    """Feed a fingerprint of ``value`` into the hash ``digest``."""
+    if value is None or isinstance(value, (bool, int, float, complex)):
+        digest.update(repr(value).encode())
+    elif isinstance(value, (str, os.PathLike)):
+        # An existing file stands for its contents: path, size, mtime
+        if os.path.isfile(value):
+            digest.update(repr(file_fingerprint(value)).encode())
+        else:
+            digest.update(repr(os.fspath(value)).encode())
+    elif isinstance(value, bytes):
+        digest.update(value)
+    elif isinstance(value, (pl.DataFrame, pl.Series)):
+        frame = value.to_frame() if isinstance(value, pl.Series) else value
+        digest.update(repr(frame.schema).encode())
+        digest.update(frame.hash_rows(seed=0).to_numpy().tobytes())
+    elif isinstance(value, (pd.DataFrame, pd.Series)):
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(value.dtypes.to_dict()).encode())
+        else:
+            digest.update(repr((value.name, value.dtype)).encode())
+        digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (tuple, list)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _update(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}".encode())
+        for key, item in value.items():
+            _update(digest, key)
+            _update(digest, item)
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # e.g. the Ratio definitions of metrics.py
+        digest.update(type(value).__qualname__.encode())
+        _update(digest, [getattr(value, f.name) for f in dataclasses.fields(value)])
+    elif isinstance(value, types.FunctionType):
+        _update_function(digest, value)
+    elif isinstance(value, (type, types.ModuleType, types.BuiltinFunctionType)):
+        # Classes, modules and builtins by name; farm_survey's own code is in
+        # the package hash of cache_key
+        digest.update(f"{getattr(value, '__module__', '')}.{value.__name__}".encode())
+    else:
+        raise TypeError(f"cannot fingerprint a value of type {type(value).__name__}")
+
+
+def _update_code(digest, code):
+    """Hash bytecode, constants and names, but not line numbers or comments."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _update_code(digest, const)  # nested function or comprehension
+        else:
+            digest.update(repr(const).encode())
+
+
+def _update_function(digest, fn, seen=None):
+    """Hash a function's code, default values and closure cell contents."""
+    seen = set() if seen is None else seen
+    digest.update(f"{fn.__module__}.{fn.__qualname__}".encode())
+    if id(fn) in seen:  # recursive or mutually recursive functions
+        return
+    seen.add(id(fn))
+    _update_code(digest, fn.__code__)
+    _update(digest, fn.__defaults__)
+    _update(digest, dict(sorted((fn.__kwdefaults__ or {}).items())))
+    for name, cell in zip(fn.__code__.co_freevars, fn.__closure__ or ()):
+        digest.update(name.encode())
+        try:
+            value = cell.cell_contents
+        except ValueError:  # a variable that is not assigned yet
+            digest.update(b"<empty>")
+            continue
+        if isinstance(value, types.FunctionType):
+            _update_function(digest, value, seen)
+        else:
+            _update(digest, value)
+
+
+@functools.lru_cache(maxsize=1)
+def package_hash():
+    """Hash of the ``farm_survey`` source files, read once per session."""
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            digest.update(name.encode())
+            with open(os.path.join(package_dir, name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def cache_key(fn, args=(), kwargs=None):
+    """Hex key of calling ``fn(*args, **kwargs)``.
+
+    Raises TypeError if an argument, default or closure variable cannot be
+    fingerprinted.
+    """
+    digest = hashlib.sha256()
+    # Bytecode and the frame hashes change between Python / library versions
+    versions = (sys.version_info[:2], pl.__version__, pd.__version__, package_hash())
+    digest.update(repr(versions).encode())
+    _update_function(digest, fn)
+    _update(digest, list(args))
+    _update(digest, dict(sorted((kwargs or {}).items())))
+    return digest.hexdigest()[:32]
+
+
+def _read(path):
+    """Read an entry back as the library it was stored from."""
+    if path.endswith(_SUFFIXES["pandas"]):
+        return pq.read_table(path).to_pandas()
+    return pl.read_parquet(path)
+
+
+def _write(df, base_path):
+    if isinstance(df, pd.DataFrame):
+        path = base_path + _SUFFIXES["pandas"]
+    elif isinstance(df, pl.DataFrame):
+        path = base_path + _SUFFIXES["polars"]
+    else:
+        raise TypeError(
+            f"cached functions must return a pandas or polars DataFrame, got {type(df).__name__}"
+        )
+    tmp_path = path + ".tmp"
+    try:
+        if isinstance(df, pd.DataFrame):
+            pq.write_table(pa.Table.from_pandas(df), tmp_path, compression="zstd")
+        else:
+            df.write_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def _entries(cache_dir):
+    """(mtime, size, path) of every cached file, oldest use first."""
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(tuple(_SUFFIXES.values())):
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    return sorted(entries)
+
+
+def _evict(cache_dir, max_bytes, keep):
+    entries = _entries(cache_dir)
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if path != keep:  # the entry just written always stays
+            os.remove(path)
+            total -= size
+
+
+def cached(fn=None, *, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """Decorator: keep the frames ``fn`` returns on disk, keyed on code and inputs.
+
+    cache_dir - directory of the Parquet files (created when needed)
+    max_bytes - size above which least recently used files are deleted
+
+    Use as ``@cached`` or ``@cached(cache_dir=..., max_bytes=...)``. ``fn``
+    must return a pandas or polars DataFrame; it comes back from the cache
+    as the same library's frame.
+    """
+    if fn is None:
+        return functools.partial(cached, cache_dir=cache_dir, max_bytes=max_bytes)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        base_path = os.path.join(cache_dir, cache_key(fn, args, kwargs))
+        for suffix in _SUFFIXES.values():
+            path = base_path + suffix
+            try:
+                df = _read(path)
+            except (FileNotFoundError, pa.ArrowInvalid, pl.exceptions.ComputeError):
+                continue
+            with _lock:
+                _stats["hits"] += 1
+            os.utime(path)  # mark as recently used
+            return df
+
+        with _lock:
+            _stats["misses"] += 1
+        df = fn(*args, **kwargs)
+        os.makedirs(cache_dir, exist_ok=True)
+        path = _write(df, base_path)
+        _evict(cache_dir, max_bytes, keep=path)
+        return df
+
+    return wrapper
+
+
+def cache_info(cache_dir=CACHE_DIR):
+    """Return hit/miss counters and the number and total bytes of stored entries."""
+    entries = _entries(cache_dir) if os.path.isdir(cache_dir) else []
+    with _lock:
+        return {**_stats, "entries": len(entries), "bytes": sum(size for _, size, _ in entries)}
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """Delete every stored entry and reset the counters."""
+    if os.path.isdir(cache_dir):
+        for _, _, path in _entries(cache_dir):
+            os.remove(path)
+    with _lock:
+        _stats.update(hits=0, misses=0)
@@ -0,0 +1,91 @@
+"""Threshold classification without a Python function call per row.
+
+Task 6 of the 99.1 exercises labels every farm with
+``df["FEI"].apply(lambda x: "Efficient" if x >= 0.08 else "Inefficient")``,
+which runs the lambda once per row. ``classify`` does the same for a whole
+column at once from a list of bands, each given as ``(lower bound, label)``
+in increasing order::
+
+    bands = [(-np.inf, "Inefficient"), (0.08, "Efficient")]
+    df["Efficiency_Class"] = classify(df["FEI"], bands)                 # pandas
+    df.with_columns(classify_expr("FEI", bands).alias("Efficiency_Class"))  # polars
+
+A value gets the label of the last band whose bound it reaches, so the bands
+above mean "Efficient if FEI >= 0.08, Inefficient otherwise". The result is
+categorical (pandas ``category``, polars ``Enum``) with the labels in band
+order, so sorting by it sorts by band. Values below the first bound and
+missing values get a missing label.
+"""
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+
+def _check_bands(bands):
+    """Split ``bands`` into (bounds, labels) after checking their order."""
+    bands = list(bands)
+    if not bands:
+        raise ValueError("bands must contain at least one (threshold, label) pair")
+    bounds = [float(bound) for bound, _ in bands]
+    labels = [label for _, label in bands]
+    if any(b >= a for a, b in zip(bounds[1:], bounds)):
+        raise ValueError(f"band thresholds must be strictly increasing, got {bounds}")
+    return bounds, labels
+
+
+def band_labels(bands):
+    """Labels of ``bands`` in band order without repeats (bands may share a label).
+
+    These are the categories of the output of ``classify``/``classify_expr``.
+    """
+    return list(dict.fromkeys(label for _, label in bands))
+
+
+def classify(values, bands):
+    """Label each value with its band; returns categorical values.
+
+    values - pandas Series, polars Series or NumPy array
+    bands  - (lower bound, label) pairs with increasing bounds
+
+    pandas Series come back as a ``category`` Series with the same index,
+    polars Series as an ``Enum`` Series and arrays as a ``pd.Categorical``.
+    """
+    bounds, labels = _check_bands(bands)
+    if isinstance(values, pl.Series):
+        return values.to_frame().select(classify_expr(values.name, bands)).to_series()
+
+    categories = band_labels(bands)
+    array = np.asarray(values, dtype=np.float64)
+    if np.isposinf(array).any():
+        # The last bin's upper edge, inf, is excluded: count inf as the largest
+        # float so it gets the top band, as in classify_expr
+        array = np.minimum(array, np.finfo(np.float64).max)
+    # Left-closed bins: bound <= value < next bound, the last one open-ended
+    bins = pd.cut(
+        array,
+        bins=bounds + [np.inf],
+        labels=labels,
+        right=False,
+        ordered=len(categories) == len(labels),
+    )
+    if bins.categories.tolist() != categories:
+        bins = bins.reorder_categories(categories)
+    if isinstance(values, pd.Series):
+        return pd.Series(bins, index=values.index, name=values.name)
+    return bins
+
+
+def classify_expr(column, bands):
+    """Polars expression labelling ``column`` (a name or expression) by band.
+
+    Builds one ``pl.when`` chain, highest band first, and casts the result to
+    an ``Enum`` of the labels. NaN counts as missing, like in ``classify``.
+    """
+    bounds, labels = _check_bands(bands)
+    value = (pl.col(column) if isinstance(column, str) else column).fill_nan(None)
+    expr = pl
+    for bound, label in zip(reversed(bounds), reversed(labels)):
+        expr = expr.when(value >= bound).then(pl.lit(label))
+    name = column if isinstance(column, str) else value.meta.output_name()
+    return expr.otherwise(None).cast(pl.Enum(band_labels(bands))).alias(name)
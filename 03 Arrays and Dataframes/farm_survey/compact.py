@@ -0,0 +1,203 @@
+"""Narrower numeric dtypes for survey frames, with a memory report.
+
+Every numeric column the notebook loads is 8 bytes per value: ``Farm_ID``
+is int64 although it never exceeds a few million, and ``Farm_Area_ha`` /
+``Production_mt`` are float64 although the survey records them to a few
+decimals. ``compact`` picks the narrowest dtype that holds each column:
+
+- integers get the smallest (unsigned if possible) type that fits their
+  minimum and maximum - ``uint8``, ``int16``, ``uint32`` ...
+- floats become ``float32`` if no value changes by more than ``tolerance``
+  (relative error) and none overflows.
+
+It returns the compacted frame and a ``CompactionReport``::
+
+    df_small, report = compact(df_pl_farm)
+    print(report)
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+
+# Default largest relative change accepted when narrowing float64 to float32;
+# float32 keeps about 7 significant digits (relative error below 6e-8).
+DEFAULT_TOLERANCE = 1e-6
+
+# Integer types, narrowest first (unsigned before signed of the same width)
+_INT_TYPES = ("uint8", "int8", "uint16", "int16", "uint32", "int32", "uint64", "int64")
+
+_POLARS_TYPES = {
+    "uint8": pl.UInt8, "int8": pl.Int8, "uint16": pl.UInt16, "int16": pl.Int16,
+    "uint32": pl.UInt32, "int32": pl.Int32, "uint64": pl.UInt64, "int64": pl.Int64,
+    "float32": pl.Float32, "float64": pl.Float64,
+}
+_POLARS_NAMES = {dtype: name for name, dtype in _POLARS_TYPES.items()}
+
+# Values checked at a time when testing floats, to bound temporary memory
+_CHUNK_ROWS = 1 << 20
+
+
+@dataclass
+class ColumnCompaction:
+    name: str
+    dtype_before: str
+    dtype_after: str
+    bytes_before: int
+    bytes_after: int
+
+
+@dataclass
+class CompactionReport:
+    columns: list = field(default_factory=list)
+
+    @property
+    def bytes_before(self):
+        return sum(c.bytes_before for c in self.columns)
+
+    @property
+    def bytes_after(self):
+        return sum(c.bytes_after for c in self.columns)
+
+    def __str__(self):
+        lines = [f"{'column':<24} {'before':>16} {'after':>16} {'bytes before':>14} {'bytes after':>14}"]
+        for c in self.columns:
+            lines.append(
+                f"{c.name:<24} {c.dtype_before:>16} {c.dtype_after:>16} "
+                f"{c.bytes_before:>14,} {c.bytes_after:>14,}"
+            )
+        saved = 1 - self.bytes_after / self.bytes_before if self.bytes_before else 0.0
+        lines.append(
+            f"{'total':<24} {'':>16} {'':>16} {self.bytes_before:>14,} "
+            f"{self.bytes_after:>14,}  ({saved:.0%} smaller)"
+        )
+        return "\n".join(lines)
+
+
+def narrowest_int(lo, hi):
+    """Name of the narrowest NumPy integer type holding ``lo`` .. ``hi``."""
+    for name in _INT_TYPES:
+        info = np.iinfo(name)
+        if info.min <= lo and hi <= info.max:
+            return name
+    return None
+
+
+def fits_float32(values, tolerance=DEFAULT_TOLERANCE):
+    """True if float64 ``values`` survive a round trip through float32.
+
+    NaN and infinities are ignored; every other value may change by at most
+    ``tolerance`` times its magnitude and must not overflow.
+    """
+    limit = np.finfo(np.float32).max
+    for start in range(0, len(values), _CHUNK_ROWS):
+        chunk = values[start : start + _CHUNK_ROWS]
+        chunk = chunk[np.isfinite(chunk)]
+        if chunk.size == 0:
+            continue
+        if np.abs(chunk).max() > limit:
+            return False
+        error = np.abs(chunk.astype(np.float32).astype(np.float64) - chunk)
+        if np.any(error > tolerance * np.abs(chunk)):
+            return False
+    return True
+
+
+def _target(values_float, lo, hi, is_integer, tolerance):
+    """Narrower dtype name for a column, or None to keep it."""
+    if is_integer:
+        return narrowest_int(lo, hi)
+    if fits_float32(values_float, tolerance):
+        return "float32"
+    return None
+
+
+def _pandas_dtype(series, name):
+    """``name`` in the same flavour (NumPy, nullable, Arrow) as ``series``."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.ArrowDtype):
+        return pd.ArrowDtype(pa.from_numpy_dtype(np.dtype(name)))
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        # Nullable masked dtypes: Int32, UInt16, Float32 ...
+        return "U" + name[1:].capitalize() if name.startswith("u") else name.capitalize()
+    return name
+
+
+def _itemsize(dtype):
+    """Bytes per value of a NumPy, pandas extension or polars numeric dtype."""
+    if isinstance(dtype, pl.DataType):
+        return np.dtype(_POLARS_NAMES[dtype]).itemsize
+    return getattr(dtype, "numpy_dtype", dtype).itemsize
+
+
+def _compact_pandas(df, columns, tolerance, report):
+    changed = {}
+    for name in columns:
+        series = df[name]
+        is_integer = pd.api.types.is_integer_dtype(series)
+        if not (is_integer or pd.api.types.is_float_dtype(series)):
+            continue
+        before = series.memory_usage(index=False, deep=True)
+        if series.count() == 0:
+            target = None
+        else:
+            values = None if is_integer else series.to_numpy(dtype=np.float64, na_value=np.nan)
+            target = _target(values, series.min(), series.max(), is_integer, tolerance)
+        if target is not None and np.dtype(target).itemsize < _itemsize(series.dtype):
+            series = series.astype(_pandas_dtype(series, target))
+            changed[name] = series
+        report.columns.append(
+            ColumnCompaction(
+                name, str(df[name].dtype), str(series.dtype),
+                before, series.memory_usage(index=False, deep=True),
+            )
+        )
+    return df.assign(**changed) if changed else df
+
+
+def _compact_polars(df, columns, tolerance, report):
+    casts = []
+    for name in columns:
+        series = df[name]
+        dtype = series.dtype
+        if dtype not in _POLARS_NAMES:
+            # Booleans, strings, decimals ...
+            continue
+        before = series.estimated_size()
+        if series.null_count() == len(series):
+            target = None
+        else:
+            values = None if dtype.is_integer() else series.cast(pl.Float64).to_numpy()
+            target = _target(values, series.min(), series.max(), dtype.is_integer(), tolerance)
+        if target is not None and np.dtype(target).itemsize < _itemsize(dtype):
+            series = series.cast(_POLARS_TYPES[target])
+            casts.append(series)
+        report.columns.append(
+            ColumnCompaction(
+                name, str(dtype).lower(), str(series.dtype).lower(), before, series.estimated_size()
+            )
+        )
+    return df.with_columns(casts) if casts else df
+
+
+def compact(df, *, tolerance=DEFAULT_TOLERANCE, columns=None):
+    """Return ``(narrowed frame, CompactionReport)`` for a pandas or polars frame.
+
+    tolerance  - largest relative change of any float value accepted when
+                 storing it as float32; 0 only narrows exactly representable
+                 columns
+    columns    - columns to consider (default: all); non-numeric columns
+                 are always left alone
+
+    A column is only changed if the new dtype is narrower than the old one.
+    """
+    if tolerance < 0:
+        raise ValueError(f"tolerance must not be negative, got {tolerance!r}")
+    columns = list(df.columns) if columns is None else list(columns)
+    report = CompactionReport()
+    if isinstance(df, pd.DataFrame):
+        return _compact_pandas(df, columns, tolerance, report), report
+    return _compact_polars(df, columns, tolerance, report), report
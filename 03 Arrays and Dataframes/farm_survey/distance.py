@@ -0,0 +1,121 @@
+"""All-pairs farm distances, computed in memory-bounded tiles.
+
+Exercise 2 computes distances for a hand-written table of three farm pairs.
+For a real survey with n farms there are n * (n - 1) / 2 pairs - far too many
+to hold in one frame. ``iter_pair_distances`` walks the pair matrix in square
+tiles sized to a memory budget, computes each tile with NumPy, and yields it
+as a small pandas or polars frame with the same columns as Exercise 2::
+
+    Farm1, Farm2, Distance (degrees), Distance_km
+
+Only one tile is in memory at a time, so the caller can filter, aggregate or
+write each block and move on.
+"""
+
+import math
+
+import numpy as np
+
+from .geodesy import equirectangular_km, haversine_km
+from .pairs import OUTPUTS, concat_pairs, make_frame
+
+# Rough conversion used throughout section 4.6 (1 degree ~ 111 km)
+KM_PER_DEGREE = 111
+
+# Approximate bytes needed per pair in a tile: two float64 coordinate
+# differences, the distance, its km version and two int64 pair indices.
+_BYTES_PER_PAIR = 6 * 8
+
+# How Distance_km is computed: the exercise's "degrees * 111", or a real
+# great-circle distance (see geodesy.py)
+KM_METRICS = ("approx", "haversine", "equirectangular")
+
+
+def tile_size(memory_budget_mb):
+    """Side length of a square tile that fits in ``memory_budget_mb``."""
+    pairs = memory_budget_mb * 1024 * 1024 // _BYTES_PER_PAIR
+    return max(1, math.isqrt(int(pairs)))
+
+
+def iter_pair_distances(
+    farms,
+    *,
+    id_col="Farm_Name",
+    lat_col="Latitude",
+    lon_col="Longitude",
+    max_distance=None,
+    memory_budget_mb=64,
+    km_metric="approx",
+    output="polars",
+):
+    """Yield the distance between every pair of farms, one tile at a time.
+
+    farms            - pandas or polars frame with one row per farm
+    max_distance     - if given, only keep pairs closer than this (degrees)
+    memory_budget_mb - upper bound for the working memory of one tile
+    km_metric        - "approx" (Distance * 111, as in the exercises),
+                       "haversine" or "equirectangular"
+    output           - "polars" or "pandas" frames
+
+    Each unordered pair is produced exactly once (Farm1 comes before Farm2 in
+    the input order); a farm is never paired with itself.
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f"output must be one of {OUTPUTS}, got {output!r}")
+    if km_metric not in KM_METRICS:
+        raise ValueError(f"km_metric must be one of {KM_METRICS}, got {km_metric!r}")
+
+    # pandas and polars columns both convert with .to_numpy()
+    ids = farms[id_col].to_numpy()
+    lat = farms[lat_col].to_numpy().astype(np.float64, copy=False)
+    lon = farms[lon_col].to_numpy().astype(np.float64, copy=False)
+    n = len(ids)
+    tile = tile_size(memory_budget_mb)
+
+    for i0 in range(0, n, tile):
+        i1 = min(i0 + tile, n)
+        lat_i = lat[i0:i1, None]
+        lon_i = lon[i0:i1, None]
+
+        # Tiles left of the diagonal only hold pairs we have already seen
+        for j0 in range(i0, n, tile):
+            j1 = min(j0 + tile, n)
+
+            # Same formula as Exercise 2: sqrt((Lat2 - Lat1)^2 + (Lon2 - Lon1)^2)
+            dist = np.sqrt((lat[None, j0:j1] - lat_i) ** 2 + (lon[None, j0:j1] - lon_i) ** 2)
+
+            keep = np.ones(dist.shape, dtype=bool)
+            if i0 == j0:
+                # Diagonal tile: keep only the upper triangle (i < j)
+                keep = np.triu(keep, k=1)
+            if max_distance is not None:
+                keep &= dist < max_distance
+
+            rows, cols = np.nonzero(keep)
+            if len(rows) == 0:
+                continue
+            block_dist = dist[rows, cols]
+            # Tile positions -> row numbers in ``farms``
+            first, second = rows + i0, cols + j0
+
+            if km_metric == "haversine":
+                block_km = haversine_km(lat[first], lon[first], lat[second], lon[second])
+            elif km_metric == "equirectangular":
+                block_km = equirectangular_km(lat[first], lon[first], lat[second], lon[second])
+            else:
+                block_km = block_dist * KM_PER_DEGREE
+
+            yield make_frame(
+                {
+                    "Farm1": ids[first],
+                    "Farm2": ids[second],
+                    "Distance": block_dist,
+                    "Distance_km": block_km,
+                },
+                output,
+            )
+
+
+def pair_distances(farms, **kwargs):
+    """Collect ``iter_pair_distances`` into one frame (small inputs only)."""
+    return concat_pairs(iter_pair_distances(farms, **kwargs), kwargs.get("output", "polars"))
@@ -0,0 +1,85 @@
+"""Dictionary (categorical) encoding of low-cardinality survey columns.
+
+``Region`` and ``Crop`` hold a handful of distinct strings repeated on every
+row. Stored as text, each row keeps its own copy of the string and every
+filter or group-by compares strings. Dictionary encoding stores each
+distinct value once and gives every row a small integer code instead, so
+``df["Region"] == "III"`` and ``group_by("Crop")`` work on integers.
+
+Both libraries get the *same*, fixed dictionary: pandas as a ``category``
+dtype and polars as an ``Enum`` with the categories of ``KNOWN_CATEGORIES``
+in the same order. A code therefore means the same value in either library
+and in every session, and frames loaded from different files share one
+dtype, so they can be concatenated and joined on these columns.
+
+A survey may still hold a value that is not in the dictionary - a new crop
+such as Cassava, say. That column is then encoded with a dictionary of its
+own values instead (polars ``Categorical``, pandas ``category``) and a
+warning names the unknown values: the frame still loads, but its codes are
+no longer the fixed ones. Add the values to ``KNOWN_CATEGORIES`` to get the
+fixed dictionary back.
+"""
+
+import warnings
+
+import pandas as pd
+import polars as pl
+
+CATEGORY_COLUMNS = ("Region", "Crop")
+
+# The fixed dictionaries. Regions follow the PSA order; "IV" is the former
+# Region IV (split into IV-A and MIMAROPA), still found in older extracts.
+KNOWN_CATEGORIES = {
+    "Region": [
+        "NCR", "CAR", "I", "II", "III", "IV-A", "MIMAROPA", "V", "VI", "NIR",
+        "VII", "VIII", "IX", "X", "XI", "XII", "XIII", "BARMM", "IV",
+    ],
+    "Crop": ["Rice", "Corn", "Banana", "Sugarcane", "Coconut", "Vegetables"],
+}
+
+# Former region codes: accepted when loading, not used for new data
+LEGACY_REGIONS = ("IV",)
+
+ENUM_DTYPES = {column: pl.Enum(values) for column, values in KNOWN_CATEGORIES.items()}
+CATEGORICAL_DTYPES = {
+    column: pd.CategoricalDtype(values) for column, values in KNOWN_CATEGORIES.items()
+}
+
+
+def _unique_values(series):
+    if isinstance(series, pd.Series):
+        return series.dropna().unique().tolist()
+    return series.drop_nulls().unique().to_list()
+
+
+def _unknown_values(df, column):
+    return sorted(set(_unique_values(df[column])) - set(KNOWN_CATEGORIES[column]), key=str)
+
+
+def encode_categories(df, columns=CATEGORY_COLUMNS):
+    """Return ``df`` with ``columns`` dictionary-encoded (pandas or polars).
+
+    Columns that are missing from ``df`` are skipped. A column holding a
+    value that is not in its dictionary gets a dictionary of its own values
+    instead, with a warning.
+    """
+    is_pandas = isinstance(df, pd.DataFrame)
+    dtypes = {}
+    for c in columns:
+        if c not in KNOWN_CATEGORIES:
+            raise ValueError(f"columns must be among {tuple(KNOWN_CATEGORIES)}, got {c!r}")
+        if c not in df.columns:
+            continue
+        unknown = _unknown_values(df, c)
+        if unknown:
+            warnings.warn(
+                f"{c} has values outside KNOWN_CATEGORIES[{c!r}]: {unknown}; "
+                "encoding it with its own categories instead",
+                stacklevel=2,
+            )
+            dtypes[c] = "category" if is_pandas else pl.Categorical
+        else:
+            dtypes[c] = CATEGORICAL_DTYPES[c] if is_pandas else ENUM_DTYPES[c]
+    if is_pandas:
+        return df.assign(**{c: df[c].astype(dtype) for c, dtype in dtypes.items()})
+    return df.with_columns(pl.col(c).cast(dtype) for c, dtype in dtypes.items())
@@ -0,0 +1,236 @@
+"""Partitioned, parallel export of survey frames.
+
+Section 4.4 saves the yield table twice - ``to_csv`` for pandas and
+``write_csv`` for polars - each as a single-threaded text write.
+``export_survey`` writes the table once, for either library, split into
+independent files that are written concurrently by a thread pool (polars
+releases the GIL while encoding and writing)::
+
+    farm_survey_output/
+        Region=I/part-00000.parquet
+        Region=II/part-00000.parquet
+        ...
+
+The ``Region=...`` directory names follow the Hive convention, so the result
+can be read back as one dataset with ``pl.scan_parquet(out_dir, hive_partitioning=True)``.
+Parquet parts leave the partition column out (its value is the directory
+name); CSV parts keep it, so every CSV file stands on its own.
+
+An existing export is only replaced with ``overwrite=True``, and then only
+its ``part-*`` files are deleted: other files in ``out_dir`` are left alone.
+
+``sink_survey`` writes the same layout from a polars ``LazyFrame``, with the
+streaming engine: the rows go from the scan to the part files in batches and
+the whole table is never held in memory.
+"""
+
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import polars as pl
+
+from .interchange import from_pandas
+
+FORMATS = ("parquet", "csv")
+
+# Compressions of the csv format (None: plain text)
+CSV_COMPRESSIONS = (None, "gzip")
+
+# File name suffixes of the parts export_survey writes
+_PART_SUFFIXES = (".parquet", ".csv", ".csv.gz")
+
+# Directory name used for rows whose partition value is missing
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _partitions(df, partition_by):
+    if partition_by is None:
+        return [("", df)]
+    parts = df.partition_by(partition_by, as_dict=True, maintain_order=True)
+    return [
+        (f"{partition_by}={NULL_PARTITION if key[0] is None else key[0]}", part)
+        for key, part in parts.items()
+    ]
+
+
+def _existing_parts(out_dir):
+    """Paths of the ``part-*`` files of an earlier export into ``out_dir``."""
+    if not os.path.isdir(out_dir):
+        return []
+    # Parts sit in out_dir itself or one level down, in Hive partition directories
+    dirs = [out_dir] + [e.path for e in os.scandir(out_dir) if e.is_dir() and "=" in e.name]
+    return sorted(
+        os.path.join(d, name)
+        for d in dirs
+        for name in os.listdir(d)
+        if name.startswith("part-") and name.endswith(_PART_SUFFIXES)
+    )
+
+
+def _remove_parts(out_dir, paths):
+    for path in paths:
+        os.remove(path)
+    # Partition directories that are empty now, e.g. of a Region no longer present
+    for part_dir in {os.path.dirname(path) for path in paths} - {out_dir}:
+        if not os.listdir(part_dir):
+            os.rmdir(part_dir)
+
+
+def _prepare_out_dir(out_dir, overwrite):
+    existing = _existing_parts(out_dir)
+    if existing:
+        if not overwrite:
+            raise FileExistsError(f"{out_dir} already holds an export (pass overwrite=True)")
+        _remove_parts(out_dir, existing)
+
+
+def _write_parquet(df, path, compression, row_group_size):
+    df.write_parquet(path, compression=compression, row_group_size=row_group_size)
+
+
+def _write_csv(df, path, compression):
+    if compression == "gzip":
+        with gzip.open(path, "wb") as f:
+            df.write_csv(f)
+    else:
+        df.write_csv(path)
+
+
+def export_survey(
+    df,
+    out_dir,
+    *,
+    fmt="parquet",
+    partition_by="Region",
+    compression=None,
+    row_group_size=512_000,
+    chunk_rows=1_000_000,
+    max_workers=None,
+    overwrite=False,
+):
+    """Write ``df`` (pandas or polars) to ``out_dir`` and return the file paths.
+
+    fmt            - "parquet" (one file per partition, with row groups of
+                     ``row_group_size`` rows) or "csv" (each partition split
+                     into files of at most ``chunk_rows`` rows)
+    partition_by   - column to split the output on, or None for no partitions
+    compression    - parquet codec ("zstd" by default, "snappy", "lz4",
+                     "uncompressed") or, for csv, None / "gzip"
+    max_workers    - size of the writer thread pool (None: the
+                     ThreadPoolExecutor default, min(32, CPUs + 4))
+    overwrite      - replace the part files of an earlier export into
+                     ``out_dir``; without it, such files raise FileExistsError
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+    if fmt == "csv" and compression not in CSV_COMPRESSIONS:
+        raise ValueError(
+            f"compression must be one of {CSV_COMPRESSIONS} for csv, got {compression!r}"
+        )
+    if isinstance(df, pd.DataFrame):
+        df = from_pandas(df)
+
+    _prepare_out_dir(out_dir, overwrite)
+
+    tasks = []
+    for subdir, part in _partitions(df, partition_by):
+        part_dir = os.path.join(out_dir, subdir)
+        os.makedirs(part_dir, exist_ok=True)
+        if fmt == "parquet":
+            if partition_by is not None:
+                # The value is already in the directory name
+                part = part.drop(partition_by)
+            path = os.path.join(part_dir, "part-00000.parquet")
+            tasks.append((_write_parquet, part, path, compression or "zstd", row_group_size))
+        else:
+            suffix = ".csv.gz" if compression == "gzip" else ".csv"
+            for i, offset in enumerate(range(0, max(part.height, 1), chunk_rows)):
+                path = os.path.join(part_dir, f"part-{i:05d}{suffix}")
+                tasks.append((_write_csv, part.slice(offset, chunk_rows), path, compression))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(fn, *args) for fn, *args in tasks]
+        for future in futures:
+            # Re-raise the first write error, if any
+            future.result()
+
+    return [args[1] for _, *args in tasks]
+
+
+def _part_path_provider(partition_by, suffix):
+    def part_path(args):
+        name = f"part-{args.index_in_partition:05d}{suffix}"
+        if partition_by is None:
+            return name
+        value = args.partition_keys[partition_by][0]
+        return f"{partition_by}={NULL_PARTITION if value is None else value}/{name}"
+
+    return part_path
+
+
+def sink_survey(
+    lf,
+    out_dir,
+    *,
+    fmt="parquet",
+    partition_by="Region",
+    compression=None,
+    row_group_size=512_000,
+    chunk_rows=1_000_000,
+    overwrite=False,
+    lazy=False,
+):
+    """Stream a polars LazyFrame to ``out_dir`` in the layout of ``export_survey``.
+
+    The options are those of ``export_survey``; there is no thread pool, as
+    the streaming engine writes the partitions itself. An earlier export is
+    checked for (and, with ``overwrite=True``, removed) right away, even with
+    ``lazy=True``.
+
+    lazy - return the sink as a LazyFrame instead of running it, so it can run
+           in one ``pl.collect_all`` with other queries on the same scan
+
+    Returns the paths of the part files, or the lazy sink.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+    if fmt == "csv" and compression not in CSV_COMPRESSIONS:
+        raise ValueError(
+            f"compression must be one of {CSV_COMPRESSIONS} for csv, got {compression!r}"
+        )
+    _prepare_out_dir(out_dir, overwrite)
+
+    # Parquet parts leave the partition column out, CSV parts keep it
+    include_key = None if partition_by is None else fmt == "csv"
+    if fmt == "parquet":
+        target = pl.PartitionBy(
+            out_dir,
+            key=partition_by,
+            include_key=include_key,
+            approximate_bytes_per_file=None,  # one file per partition
+            file_path_provider=_part_path_provider(partition_by, ".parquet"),
+        )
+        sink = lf.sink_parquet(
+            target, compression=compression or "zstd", row_group_size=row_group_size,
+            mkdir=True, lazy=True,
+        )
+    else:
+        suffix = ".csv.gz" if compression == "gzip" else ".csv"
+        target = pl.PartitionBy(
+            out_dir,
+            key=partition_by,
+            include_key=include_key,
+            max_rows_per_file=chunk_rows,
+            approximate_bytes_per_file=None,
+            file_path_provider=_part_path_provider(partition_by, suffix),
+        )
+        sink = lf.sink_csv(
+            target, compression=compression or "uncompressed", mkdir=True, lazy=True
+        )
+
+    if lazy:
+        return sink
+    sink.collect(engine="streaming")
+    return _existing_parts(out_dir)
@@ -0,0 +1,146 @@
+"""Great-circle distance kernels for NumPy arrays and polars expressions.
+
+Section 4.6 converts degree distances to km with ``* 111``. That is only
+right along a meridian: one degree of longitude is ~111 km at the equator
+but only ~107 km at 15 N (Luzon), so the error grows with latitude. It also
+allocates four temporary arrays per call.
+
+``haversine_km`` computes the true great-circle distance on a spherical
+Earth. It works on float32 or float64 arrays and can write into a
+preallocated ``out`` array (plus optional ``work`` scratch space), so a loop
+over blocks of farms allocates nothing. ``out`` and ``work`` must not overlap
+the inputs: the kernels write intermediate results into them while the
+inputs are still being read.
+
+``equirectangular_km`` is a cheaper approximation that is accurate to well
+under 0.1% for the few-km distances between neighbouring farms: one cosine
+per pair instead of a sine, a cosine and an arcsine, and no ``np.hypot``
+(which guards against overflow at a cost these distances do not need).
+With ``ref_lat=`` it uses the cosine of one reference latitude for the
+whole block and needs no trigonometry per pair at all - exact enough when
+the block's farms lie within a degree or so of that latitude. Run
+``python -m benchmarks.bench_distance`` to compare the kernels on this
+machine. Both kernels also exist as polars expressions.
+"""
+
+import numpy as np
+import polars as pl
+
+# Mean Earth radius (IUGG)
+EARTH_RADIUS_KM = 6371.0088
+
+_DEG2RAD = np.pi / 180
+
+
+def _prepare(arrays, out, work, n_work):
+    arrays = np.broadcast_arrays(*(np.asarray(a) for a in arrays))
+    # float32 inputs stay float32; integers and float64 become float64
+    dtype = np.result_type(*arrays, np.float32)
+    for name, buffer in (("out", out), ("work", work)):
+        if buffer is not None and any(np.may_share_memory(buffer, a) for a in arrays):
+            raise ValueError(f"{name} must not overlap the input arrays")
+    if out is None:
+        out = np.empty(arrays[0].shape, dtype=dtype)
+    if work is None:
+        work = np.empty((n_work,) + out.shape, dtype=out.dtype)
+    return arrays, out, work
+
+
+def haversine_km(lat1, lon1, lat2, lon2, out=None, *, work=None, radius_km=EARTH_RADIUS_KM):
+    """Great-circle distance in km between points given in degrees.
+
+    out  - optional array to write the result into (same shape as the inputs)
+    work - optional scratch array of shape ``(2,) + out.shape``
+    """
+    (lat1, lon1, lat2, lon2), out, work = _prepare((lat1, lon1, lat2, lon2), out, work, 2)
+    h, s, c = out, work[0, ...], work[1, ...]
+
+    # h = sin^2(dlat / 2)
+    np.subtract(lat2, lat1, out=h)
+    np.multiply(h, _DEG2RAD / 2, out=h)
+    np.sin(h, out=h)
+    np.square(h, out=h)
+
+    # s = sin^2(dlon / 2)
+    np.subtract(lon2, lon1, out=s)
+    np.multiply(s, _DEG2RAD / 2, out=s)
+    np.sin(s, out=s)
+    np.square(s, out=s)
+
+    # c = cos(lat1) * cos(lat2) = (cos(lat1 - lat2) + cos(lat1 + lat2)) / 2
+    #   = (1 - 2h + cos(lat1 + lat2)) / 2, which needs no extra buffer
+    np.add(lat1, lat2, out=c)
+    np.multiply(c, _DEG2RAD, out=c)
+    np.cos(c, out=c)
+    c += 1
+    c -= h
+    c -= h
+    c *= 0.5
+
+    # a = h + c * s; d = 2R * arcsin(sqrt(a))
+    np.multiply(c, s, out=s)
+    h += s
+    np.clip(h, 0, 1, out=h)
+    np.sqrt(h, out=h)
+    np.arcsin(h, out=h)
+    h *= 2 * radius_km
+    return out
+
+
+def equirectangular_km(
+    lat1, lon1, lat2, lon2, out=None, *, work=None, ref_lat=None, radius_km=EARTH_RADIUS_KM
+):
+    """Fast flat-Earth approximation of the distance in km (short distances).
+
+    work    - optional scratch array of shape ``(1,) + out.shape``
+    ref_lat - optional latitude in degrees whose cosine scales every
+              longitude difference; by default each pair uses the cosine of
+              its own mean latitude
+    """
+    (lat1, lon1, lat2, lon2), out, work = _prepare((lat1, lon1, lat2, lon2), out, work, 1)
+    x, y = out, work[0, ...]
+
+    # x = dlon * cos(mean latitude)
+    np.subtract(lon2, lon1, out=x)
+    if ref_lat is None:
+        np.add(lat1, lat2, out=y)
+        np.multiply(y, _DEG2RAD / 2, out=y)
+        np.cos(y, out=y)
+        x *= y
+    else:
+        x *= np.cos(ref_lat * _DEG2RAD)
+
+    # y = dlat
+    np.subtract(lat2, lat1, out=y)
+
+    # sqrt(x^2 + y^2), in place
+    np.multiply(x, x, out=x)
+    np.multiply(y, y, out=y)
+    x += y
+    np.sqrt(x, out=x)
+    x *= _DEG2RAD * radius_km
+    return out
+
+
+def _expr(value):
+    return pl.col(value) if isinstance(value, str) else value
+
+
+def haversine_km_expr(lat1, lon1, lat2, lon2, radius_km=EARTH_RADIUS_KM):
+    """polars expression for ``haversine_km`` (column names or expressions)."""
+    lat1, lon1, lat2, lon2 = map(_expr, (lat1, lon1, lat2, lon2))
+    h = ((lat2 - lat1).radians() / 2).sin() ** 2
+    s = ((lon2 - lon1).radians() / 2).sin() ** 2
+    a = h + lat1.radians().cos() * lat2.radians().cos() * s
+    return 2 * radius_km * a.clip(0, 1).sqrt().arcsin()
+
+
+def equirectangular_km_expr(lat1, lon1, lat2, lon2, ref_lat=None, radius_km=EARTH_RADIUS_KM):
+    """polars expression for ``equirectangular_km``."""
+    lat1, lon1, lat2, lon2 = map(_expr, (lat1, lon1, lat2, lon2))
+    if ref_lat is None:
+        x = (lon2 - lon1) * ((lat1 + lat2).radians() / 2).cos()
+    else:
+        x = (lon2 - lon1) * np.cos(ref_lat * _DEG2RAD)
+    y = lat2 - lat1
+    return (x**2 + y**2).sqrt().radians() * radius_km
@@ -0,0 +1,182 @@
+"""Fill missing values with the mean of their group, e.g. Crop x Region.
+
+Section 4.3 fills missing ``Production_mt`` with one overall mean::
+
+    df.fillna(df["Production_mt"].mean())                      # pandas
+    df.with_columns(pl.col("Production_mt").fill_null(...))    # polars
+
+which reads the column once for the mean and again for the fill, and uses
+the same value for a sugarcane farm as for a rice farm. Surveys impute by
+stratum instead. ``impute`` gathers, in one group-by pass, everything the
+fill needs for every column at once - per group the sum, the count of
+present values and the count of missing ones - and then fills each missing
+value with its group's mean::
+
+    df_filled, report = impute(df, "Production_mt", by=["Crop", "Region"])
+    print(report)        # nulls filled per group, and the value used
+
+A group with no values at all gets the overall mean of the column.
+
+For a polars ``LazyFrame`` (e.g. ``pl.scan_csv`` of a file larger than
+memory) the statistics pass runs on the streaming engine and keeps one row
+per group; the result is again lazy, and its fill is a join with that small
+table, so the file is filled batch by batch when the result is sunk::
+
+    filled, report = impute(pl.scan_csv("survey.csv"), "Production_mt")
+    filled.sink_parquet("survey_filled.parquet")
+
+A mean needs every value of its group before the first one can be filled,
+so the source is read twice (statistics, then fill); the single statistics
+pass replaces one mean scan per column and per group.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+# Default strata: the survey's crop and region
+DEFAULT_BY = ("Crop", "Region")
+
+# Temporary column holding the fill value of a column during the join
+_FILL_PREFIX = "__fill_"
+
+
+@dataclass
+class ImputationReport:
+    """Per group (one row per combination of ``by``): for every column,
+    ``{column}_missing`` values found, ``{column}_filled`` of them filled and
+    the ``{column}_fill`` value used (null if the whole column is empty)."""
+
+    by: list
+    columns: list
+    groups: pl.DataFrame
+
+    @property
+    def filled(self):
+        """Total number of values filled, by column."""
+        return {c: int(self.groups[f"{c}_filled"].sum()) for c in self.columns}
+
+    def __str__(self):
+        header = f"{' / '.join(self.by):<32}"
+        for c in self.columns:
+            header += f" {c + ' filled':>22} {'with':>12}"
+        lines = [header]
+        for row in self.groups.sort(self.by, nulls_last=True).iter_rows(named=True):
+            line = f"{' / '.join(str(row[k]) for k in self.by):<32}"
+            for c in self.columns:
+                fill = row[f"{c}_fill"]
+                fill = f"{fill:>12.3f}" if fill is not None else f"{'-':>12}"
+                line += f" {row[f'{c}_filled']:>22,} {fill}"
+            lines.append(line)
+        total = f"{'total':<32}"
+        for c, filled in self.filled.items():
+            total += f" {filled:>22,} {'':>12}"
+        lines.append(total)
+        return "\n".join(lines)
+
+
+def _names(names):
+    return [names] if isinstance(names, str) else list(names)
+
+
+def _statistics_polars(lf, by, columns):
+    aggs = []
+    for c in columns:
+        aggs += [
+            pl.col(c).sum().alias(f"{c}_sum"),
+            pl.col(c).count().cast(pl.Int64).alias(f"{c}_count"),
+            pl.col(c).null_count().cast(pl.Int64).alias(f"{c}_missing"),
+        ]
+    return lf.group_by(by).agg(aggs)
+
+
+def _group_pandas(df, by, columns):
+    """Group the values and their missing flags, so one aggregation gets all."""
+    flags = df[columns].isna().add_suffix("_missing")
+    work = pd.concat([df[by + columns], flags], axis=1)
+    return work.groupby(by, sort=False, dropna=False, observed=True)
+
+
+def _statistics_pandas(grouped, columns):
+    aggs = {}
+    for c in columns:
+        aggs[f"{c}_sum"] = (c, "sum")
+        aggs[f"{c}_count"] = (c, "count")
+        aggs[f"{c}_missing"] = (f"{c}_missing", "sum")
+    return pl.from_pandas(grouped.agg(**aggs).reset_index())
+
+
+def _fill_table(stats, columns):
+    """Add ``{c}_fill`` and ``{c}_filled`` to per-group sums and counts."""
+    exprs = []
+    for c in columns:
+        total, count = pl.col(f"{c}_sum"), pl.col(f"{c}_count")
+        # Null, not 0 / 0 = NaN, when the whole column is empty
+        overall = pl.when(count.sum() > 0).then(total.sum() / count.sum())
+        fill = pl.when(count > 0).then(total / count).otherwise(overall)
+        exprs.append(fill.cast(pl.Float64).alias(f"{c}_fill"))
+    stats = stats.with_columns(exprs)
+    return stats.with_columns(
+        pl.when(pl.col(f"{c}_fill").is_not_null())
+        .then(pl.col(f"{c}_missing"))
+        .otherwise(0)
+        .alias(f"{c}_filled")
+        for c in columns
+    )
+
+
+def impute(df, columns="Production_mt", by=DEFAULT_BY):
+    """Fill missing values of ``columns`` with the mean of their ``by`` group.
+
+    df      - pandas DataFrame, polars DataFrame or polars LazyFrame
+    columns - numeric column name or list of names to fill
+    by      - group column name or list of names (default Crop x Region)
+
+    Returns ``(filled frame, ImputationReport)``; a LazyFrame comes back
+    lazy, with the statistics already computed for the report. Missing
+    means NaN/None in pandas and null in polars (NaN is a value there).
+    Missing group keys form their own group. Filled integer columns come
+    back as float64.
+    """
+    columns, by = _names(columns), _names(by)
+
+    if isinstance(df, pd.DataFrame):
+        grouped = _group_pandas(df, by, columns)
+        groups = _fill_table(_statistics_pandas(grouped, columns), columns)
+        # The same grouping numbers the rows, in the order of the statistics
+        # rows (first appearance)
+        codes = grouped.ngroup().to_numpy()
+        df = df.copy()
+        for c in columns:
+            fill = groups[f"{c}_fill"].to_numpy()[codes] if len(codes) else np.empty(0)
+            values = df[c]
+            if not pd.api.types.is_float_dtype(values.dtype):
+                # A group mean is rarely a whole number: integer columns
+                # (also nullable Int64) become float64, as in polars
+                values = values.astype(np.float64)
+            df[c] = values.fillna(pd.Series(fill, index=df.index))
+    else:
+        lazy = isinstance(df, pl.LazyFrame)
+        stats = _statistics_polars(df.lazy(), by, columns)
+        stats = stats.collect(engine="streaming") if lazy else stats.collect()
+        groups = _fill_table(stats, columns)
+        fills = groups.select(*by, *(pl.col(f"{c}_fill").alias(_FILL_PREFIX + c) for c in columns))
+        filled = (
+            df.lazy()
+            .join(fills.lazy(), on=by, how="left", nulls_equal=True, maintain_order="left")
+            .with_columns(pl.col(c).fill_null(pl.col(_FILL_PREFIX + c)) for c in columns)
+            .drop(_FILL_PREFIX + c for c in columns)
+        )
+        df = filled if lazy else filled.collect()
+
+    report = ImputationReport(
+        by,
+        columns,
+        groups.select(
+            *by,
+            *(pl.col(f"{c}_{part}") for c in columns for part in ("missing", "filled", "fill")),
+        ),
+    )
+    return df, report
@@ -0,0 +1,199 @@
+"""Running crop/region totals that only read newly appended survey rows.
+
+Enumerators keep appending rows to the survey CSV during the season, and
+every refresh of the notebook re-reads the whole file to recompute the same
+``group_by("Crop")`` totals. ``IncrementalSummary`` remembers how many bytes
+of the file it has already aggregated and, on ``refresh()``, parses only
+the bytes after that offset and merges their partial sums and counts into
+the stored ones. The work per refresh is proportional to the new rows, not
+to the size of the file, and the new bytes are parsed in blocks of
+``BLOCK_BYTES``, so even the first refresh of a large file needs little
+memory::
+
+    crop_totals = IncrementalSummary("farm_survey_large.csv", by="Crop")
+    crop_totals.refresh()      # first call reads the whole file
+    ...                        # more rows are appended to the CSV
+    crop_totals.refresh()      # reads only the new rows
+    crop_totals.summary()
+
+If the file is replaced or truncated instead of appended to, the store
+notices (the bytes it already read have changed) and starts over.
+"""
+
+import hashlib
+import io
+import json
+import os
+
+import polars as pl
+
+from . import SURVEY_CSV
+
+# Bytes parsed at a time, so a refresh needs a few times this much memory
+# however large the file or the delta is
+BLOCK_BYTES = 16 << 20
+
+# Bytes hashed at the start and just before the stored offset to detect a
+# rewritten file
+_CHECK_BYTES = 4096
+
+
+def _hash(f, start, stop):
+    f.seek(start)
+    return hashlib.sha1(f.read(stop - start)).hexdigest()
+
+
+class IncrementalSummary:
+    """Per-group running sums, counts and means of survey columns.
+
+    path         - survey CSV that only ever grows by appended rows
+    by           - group column name or list of names
+    values       - columns to total and average
+    state_path   - optional JSON file that keeps the totals between sessions
+
+    A row is counted once its line ends with a newline, so a line that is
+    still being written is picked up by the next refresh.
+    """
+
+    def __init__(
+        self,
+        path=SURVEY_CSV,
+        by="Crop",
+        values=("Production_mt", "Farm_Area_ha"),
+        state_path=None,
+    ):
+        self.path = path
+        self.by = [by] if isinstance(by, str) else list(by)
+        self.values = list(values)
+        self.state_path = state_path
+        self._reset()
+        if state_path is not None and os.path.exists(state_path):
+            self._load()
+
+    def _reset(self):
+        self.offset = 0
+        self.rows_read = 0
+        self._header = None
+        self._checks = None
+        self._totals = None
+
+    # -- persistence ------------------------------------------------------
+
+    def _load(self):
+        with open(self.state_path) as f:
+            state = json.load(f)
+        if state["by"] != self.by or state["values"] != self.values:
+            # Saved for a different summary: ignore it
+            return
+        self.offset = state["offset"]
+        self.rows_read = state["rows_read"]
+        self._header = state["header"].encode()
+        self._checks = state["checks"]
+        self._totals = pl.DataFrame(state["totals"]) if state["totals"] else None
+
+    def save(self):
+        """Write the current totals and file offset to ``state_path``."""
+        if self.state_path is None:
+            raise ValueError("no state_path was given")
+        state = {
+            "by": self.by,
+            "values": self.values,
+            "offset": self.offset,
+            "rows_read": self.rows_read,
+            "header": self._header.decode() if self._header else "",
+            "checks": self._checks,
+            "totals": self._totals.to_dict(as_series=False) if self._totals is not None else None,
+        }
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    # -- reading ----------------------------------------------------------
+
+    def _file_checks(self, f, offset):
+        return [
+            _hash(f, 0, min(offset, _CHECK_BYTES)),
+            _hash(f, max(0, offset - _CHECK_BYTES), offset),
+        ]
+
+    def _still_appended(self, f, size):
+        """True if the bytes read so far are unchanged (the file only grew)."""
+        if self._checks is None:
+            return self.offset == 0
+        if size < self.offset:
+            return False
+        return self._file_checks(f, self.offset) == self._checks
+
+    def _partial_totals(self, rows):
+        aggs = []
+        for column in self.values:
+            aggs.append(pl.col(column).sum().alias(f"{column}_sum"))
+            aggs.append(pl.col(column).count().cast(pl.Int64).alias(f"{column}_count"))
+        aggs.append(pl.len().cast(pl.Int64).alias("Rows"))
+        return rows.group_by(self.by).agg(aggs)
+
+    def _parse(self, block):
+        # Fixed dtypes: a small delta must not be inferred differently
+        # (e.g. an all-empty column as text) from the rows before it
+        return pl.read_csv(
+            io.BytesIO(self._header + block),
+            columns=self.by + self.values,
+            schema_overrides={c: pl.Float64 for c in self.values},
+        )
+
+    def _merge(self, partial):
+        if self._totals is None:
+            self._totals = partial
+        else:
+            # Sums and counts of the same group simply add up
+            self._totals = (
+                pl.concat([self._totals, partial], how="vertical_relaxed")
+                .group_by(self.by)
+                .agg(pl.all().sum())
+            )
+
+    def refresh(self):
+        """Aggregate the rows appended since the last refresh; returns their number."""
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not self._still_appended(f, size):
+                self._reset()
+
+            if self._header is None:
+                f.seek(0)
+                self._header = f.readline()
+                self.offset = len(self._header)
+
+            start, new_rows = self.offset, 0
+            f.seek(self.offset)
+            while True:
+                # A block of whole lines: read on to the end of the last one,
+                # and leave an unterminated last line for the next refresh
+                block = f.read(BLOCK_BYTES) + f.readline()
+                block = block[: block.rfind(b"\n") + 1]
+                if not block:
+                    break
+                rows = self._parse(block)
+                self._merge(self._partial_totals(rows))
+                self.offset += len(block)
+                new_rows += rows.height
+            if self.offset == start:
+                return 0
+            self.rows_read += new_rows
+            self._checks = self._file_checks(f, self.offset)
+
+        if self.state_path is not None:
+            self.save()
+        return new_rows
+
+    def summary(self, sort_by=None, descending=True):
+        """Current totals with sums, counts and means per group."""
+        if self._totals is None:
+            return pl.DataFrame()
+        result = self._totals.with_columns(
+            (pl.col(f"{c}_sum") / pl.col(f"{c}_count")).alias(f"{c}_mean") for c in self.values
+        ).sort(self.by)
+        if sort_by is not None:
+            result = result.sort(sort_by, descending=descending)
+        return result
@@ -0,0 +1,152 @@
+"""pandas <-> polars conversions that share memory instead of copying it.
+
+The notebook moves frames between the two libraries for plotting
+(``df.to_pandas()``) and for the exercises (``pl.from_pandas(df)``). Both
+libraries store columns in Apache Arrow format internally, so most columns
+can be handed over without copying a single byte - as long as the pandas
+side uses Arrow-backed dtypes (``int64[pyarrow]``, ``double[pyarrow]``...)
+instead of NumPy ones. String columns are the exception: polars stores them
+as "string views", a layout pandas cannot use, so they are always copied.
+
+Every conversion records a ``ConversionReport`` that says, per column,
+whether its data was copied and how many bytes were moved::
+
+    df_pd = to_pandas(df_pl)
+    print(last_report())
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+
+# Number of reports kept by ``conversion_log``
+MAX_REPORTS = 100
+
+_reports = deque(maxlen=MAX_REPORTS)
+
+
+@dataclass
+class ColumnReport:
+    name: str
+    copied: bool
+    bytes_moved: int
+
+
+@dataclass
+class ConversionReport:
+    direction: str
+    columns: list = field(default_factory=list)
+
+    @property
+    def copied(self):
+        """True if at least one column had to be copied."""
+        return any(c.copied for c in self.columns)
+
+    @property
+    def bytes_moved(self):
+        return sum(c.bytes_moved for c in self.columns)
+
+    def __str__(self):
+        lines = [
+            f"{self.direction}: {'copy' if self.copied else 'zero-copy'}, "
+            f"{self.bytes_moved:,} bytes moved"
+        ]
+        for c in self.columns:
+            status = "copied" if c.copied else "shared"
+            lines.append(f"  {c.name:<24} {status:<7} {c.bytes_moved:>14,} bytes")
+        return "\n".join(lines)
+
+
+def _arrow_buffers(array):
+    chunks = array.chunks if isinstance(array, pa.ChunkedArray) else [array]
+    return [
+        (buf.address, buf.size)
+        for chunk in chunks
+        for buf in chunk.buffers()
+        if buf is not None and buf.size > 0
+    ]
+
+
+def _polars_buffers(series):
+    # Newest compat level exposes polars' own buffers (e.g. string views)
+    # instead of converting them to the classic Arrow layout.
+    return _arrow_buffers(series.to_arrow(compat_level=pl.CompatLevel.newest()))
+
+
+def _pandas_buffers(series):
+    values = series.array
+    if hasattr(values, "__arrow_array__"):
+        # Arrow-backed dtypes (ArrowDtype, pyarrow strings) expose their
+        # Arrow data without a copy.
+        return _arrow_buffers(values.__arrow_array__())
+    data = series.to_numpy(copy=False)
+    if data.dtype == object:
+        # Python objects: there is no contiguous buffer that could be shared
+        return []
+    return [(data.ctypes.data, data.nbytes)]
+
+
+def _column_report(name, source_buffers, result_buffers):
+    """Compare where a column's bytes live before and after a conversion."""
+    moved = 0
+    for address, size in result_buffers:
+        shared = any(
+            src_address <= address and address + size <= src_address + src_size
+            for src_address, src_size in source_buffers
+        )
+        if not shared:
+            moved += size
+    copied = moved > 0 or not result_buffers
+    return ColumnReport(name, copied, moved)
+
+
+def _record(report):
+    _reports.append(report)
+    return report
+
+
+def to_pandas(df: pl.DataFrame) -> pd.DataFrame:
+    """Convert a polars frame to pandas with Arrow-backed (zero-copy) dtypes."""
+    result = df.to_pandas(use_pyarrow_extension_array=True)
+    report = ConversionReport("polars -> pandas")
+    for name in df.columns:
+        report.columns.append(
+            _column_report(name, _polars_buffers(df[name]), _pandas_buffers(result[name]))
+        )
+    _record(report)
+    return result
+
+
+def from_pandas(df: pd.DataFrame) -> pl.DataFrame:
+    """Convert a pandas frame to polars, reusing its buffers where possible.
+
+    Arrow-backed columns and NumPy numeric columns are shared; object
+    columns (plain Python strings) always have to be copied.
+    """
+    result = pl.from_pandas(df)
+    report = ConversionReport("pandas -> polars")
+    for name in df.columns:
+        report.columns.append(
+            _column_report(
+                str(name), _pandas_buffers(df[name]), _polars_buffers(result[str(name)])
+            )
+        )
+    _record(report)
+    return result
+
+
+def last_report():
+    """Return the report of the most recent conversion (or None)."""
+    return _reports[-1] if _reports else None
+
+
+def conversion_log():
+    """Return the reports of the last ``MAX_REPORTS`` conversions, oldest first."""
+    return list(_reports)
+
+
+def clear_log():
+    _reports.clear()
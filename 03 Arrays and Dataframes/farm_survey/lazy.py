@@ -0,0 +1,54 @@
+"""Lazy, streaming version of the section 4.4 / 4.5 survey pipeline.
+
+The eager cells in ``02_dataframes.py`` read the whole CSV, add the yield
+column and then group by crop, materializing a full frame at every step.
+Here the same chain is built as one polars ``LazyFrame``: the optimizer only
+reads the columns the query needs, pushes filters into the CSV scan, and the
+streaming engine processes the file in batches instead of loading it whole.
+"""
+
+import polars as pl
+
+from . import SURVEY_CSV
+from .metrics import YIELD
+
+
+def scan_survey(path=SURVEY_CSV, **scan_kwargs) -> pl.LazyFrame:
+    """Return a lazy scan of a survey CSV (nothing is read yet)."""
+    return pl.scan_csv(path, **scan_kwargs)
+
+
+def with_yield(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """Add ``Yield_mt_per_ha`` = Production / Farm Area to a lazy frame."""
+    return lf.with_columns(YIELD.polars())
+
+
+def crop_yield_summary(path=SURVEY_CSV, *, regions=None, crops=None) -> pl.LazyFrame:
+    """Build the load -> yield -> group by Crop -> sort chain as a single plan.
+
+    ``regions`` and ``crops`` optionally restrict the survey to a list of
+    values; the filters are pushed down into the scan so rows outside them
+    never reach the group-by.
+    """
+    lf = scan_survey(path)
+    if regions is not None:
+        lf = lf.filter(pl.col("Region").is_in(list(regions)))
+    if crops is not None:
+        lf = lf.filter(pl.col("Crop").is_in(list(crops)))
+
+    return (
+        with_yield(lf)
+        .group_by("Crop")
+        .agg(
+            pl.sum("Production_mt").alias("Total_Production_mt"),
+            pl.sum("Farm_Area_ha").alias("Total_Area_ha"),
+            pl.mean("Yield_mt_per_ha").alias("Average_Yield_mt_per_ha"),
+            pl.len().alias("Farms"),
+        )
+        .sort("Total_Production_mt", descending=True)
+    )
+
+
+def collect_streaming(lf: pl.LazyFrame) -> pl.DataFrame:
+    """Execute a lazy plan with the streaming engine (bounded memory)."""
+    return lf.collect(engine="streaming")
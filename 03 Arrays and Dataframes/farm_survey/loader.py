@@ -0,0 +1,116 @@
+"""One shared loader for the farm survey CSV, for both pandas and polars.
+
+``02_dataframes.py`` used to parse ``farm_survey_large.csv`` once per cell
+(``pd.read_csv`` in 4.4, ``pl.read_csv`` in 4.4, ``pd.read_csv`` again in
+Exercise 4). ``load_survey`` parses the file once with polars and keeps the
+result in a small LRU cache keyed on the file's path, size and modification
+time, so every later call - in either library - is served from memory until
+the file changes on disk.
+
+Across runs, the parse itself is skipped too: the CSV is read through a
+columnar sidecar file (see ``sidecar.py``) that is built on first use.
+
+``Region`` and ``Crop`` are dictionary-encoded as they are loaded (see
+``encoding.py``): polars gets ``Enum`` columns and pandas ``category``
+columns with the same fixed categories in every load, so filters and
+group-bys on them compare small integer codes instead of strings, and
+frames loaded from different files can be concatenated and joined. A
+survey with values outside those categories still loads, with a warning.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import polars as pl
+import pyarrow as pa
+
+from . import SURVEY_CSV
+from .encoding import encode_categories
+from .sidecar import read_sidecar
+
+ENGINES = ("polars", "pandas")
+
+# Sidecar format used to skip CSV parsing ("parquet" or "ipc"); None disables it
+SIDECAR_FORMAT = "parquet"
+
+# Number of (file fingerprint, columns) entries kept in memory at once
+MAX_CACHED_FILES = 8
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def file_fingerprint(path):
+    """Return ``(absolute path, size in bytes, mtime in ns)`` for a file."""
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+def _parse(path, columns):
+    if SIDECAR_FORMAT is not None:
+        try:
+            return pl.from_arrow(read_sidecar(path, columns, fmt=SIDECAR_FORMAT))
+        except (OSError, pa.ArrowInvalid, pl.exceptions.PolarsError):
+            # e.g. a read-only directory or a sidecar that cannot be built or
+            # read: fall back to parsing the CSV text, which raises the real
+            # error if the CSV itself is broken
+            pass
+    return pl.read_csv(path, columns=columns)
+
+
+def load_survey(path=SURVEY_CSV, engine="polars", columns=None, categorical=True):
+    """Load a survey CSV as a polars (default) or pandas DataFrame.
+
+    The CSV text is parsed only once per fingerprint; the pandas frame is
+    converted from the cached polars frame on first request and cached too.
+    pandas callers get a shallow copy, so adding columns to the result does
+    not leak into the cache. ``columns`` loads only the listed columns.
+    ``categorical=False`` keeps ``Region`` and ``Crop`` as plain strings;
+    with the default, a column with a value outside ``KNOWN_CATEGORIES`` is
+    encoded with its own categories and a warning (see ``encoding.py``).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+
+    if columns is not None:
+        columns = tuple(columns)
+    key = file_fingerprint(path) + (columns, categorical)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            _stats["misses"] += 1
+            # A new fingerprint for a known path means the file changed:
+            # drop the stale frames right away instead of waiting for LRU.
+            stale = [k for k in _cache if k[0] == key[0] and k[1:3] != key[1:3]]
+            for old_key in stale:
+                del _cache[old_key]
+            df = _parse(path, columns and list(columns))
+            entry = {"polars": encode_categories(df) if categorical else df}
+            _cache[key] = entry
+            while len(_cache) > MAX_CACHED_FILES:
+                _cache.popitem(last=False)
+        else:
+            _stats["hits"] += 1
+            _cache.move_to_end(key)
+
+        if engine == "pandas" and "pandas" not in entry:
+            entry["pandas"] = entry["polars"].to_pandas()
+
+    if engine == "pandas":
+        return entry["pandas"].copy(deep=False)
+    return entry["polars"]
+
+
+def cache_info():
+    """Return hit/miss counters and the cache keys (fingerprint, columns, categorical)."""
+    with _lock:
+        return {**_stats, "entries": list(_cache)}
+
+
+def clear_cache():
+    """Forget every cached frame and reset the counters."""
+    with _lock:
+        _cache.clear()
+        _stats.update(hits=0, misses=0)
@@ -0,0 +1,93 @@
+"""Ratio metrics defined once, for pandas and polars.
+
+The same divisions are typed again in every notebook cell that needs them:
+``Production_mt / Farm_Area_ha`` in sections 4.2 and 4.4 (for both
+libraries), FEI in the fertilizer exercises and ``Production_tons /
+Labor_days`` in 99.1_02. Each ``Ratio`` below names its columns once and
+compiles to either library::
+
+    add_metrics(df, [YIELD])                      # pandas or polars frame
+    add_metrics(df, [FEI], decimals=3)            # rounded like the exercises
+    df.with_columns(YIELD.polars())               # just the polars expression
+
+A zero denominator gives a missing value (NaN in pandas, null in polars)
+instead of ``inf``. ``add_metrics`` adds all metrics in one pass: one
+``with_columns`` call in polars, one ``assign`` (a single copy of the
+frame) in pandas.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+DTYPES = ("float64", "float32")
+
+_POLARS_DTYPES = {"float64": pl.Float64, "float32": pl.Float32}
+
+
+@dataclass(frozen=True)
+class Ratio:
+    """``name = numerator / denominator``, optionally rounded and narrowed.
+
+    decimals - round to this many decimal places (None: no rounding)
+    dtype    - "float64" or "float32"
+    """
+
+    name: str
+    numerator: str
+    denominator: str
+    decimals: Optional[int] = None
+    dtype: str = "float64"
+
+    def __post_init__(self):
+        if self.dtype not in DTYPES:
+            raise ValueError(f"dtype must be one of {DTYPES}, got {self.dtype!r}")
+
+    def pandas(self, df: pd.DataFrame) -> pd.Series:
+        """Evaluate on a pandas frame; returns a Series named ``name``."""
+        num = df[self.numerator].to_numpy(dtype=np.float64, na_value=np.nan)
+        den = df[self.denominator].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = np.divide(num, den, out=np.full(len(df), np.nan), where=den != 0)
+        if self.decimals is not None:
+            np.round(values, self.decimals, out=values)
+        return pd.Series(values.astype(self.dtype, copy=False), index=df.index, name=self.name)
+
+    def polars(self) -> pl.Expr:
+        """The metric as a polars expression aliased to ``name``."""
+        den = pl.col(self.denominator)
+        expr = pl.when(den != 0).then(pl.col(self.numerator) / den)
+        if self.decimals is not None:
+            expr = expr.round(self.decimals)
+        return expr.cast(_POLARS_DTYPES[self.dtype]).alias(self.name)
+
+    def with_options(self, decimals=None, dtype=None):
+        """Copy of the metric with other rounding and/or dtype."""
+        return Ratio(
+            self.name,
+            self.numerator,
+            self.denominator,
+            self.decimals if decimals is None else decimals,
+            self.dtype if dtype is None else dtype,
+        )
+
+
+# Section 4.2 / 4.4 of 02_dataframes.py
+YIELD = Ratio("Yield_mt_per_ha", "Production_mt", "Farm_Area_ha")
+# 99.1 fertilizer exercises (Task 2) and 99.1_02 (Task 2), rounded to 3 dp
+FEI = Ratio("FEI", "Production_tons", "Fertilizer_kg", decimals=3)
+LABOR_PRODUCTIVITY = Ratio("Labor_Productivity", "Production_tons", "Labor_days", decimals=3)
+
+
+def add_metrics(df, metrics, *, decimals=None, dtype=None):
+    """Return ``df`` (pandas, polars or lazy polars) with every metric added.
+
+    ``decimals`` / ``dtype`` override the settings of all metrics at once.
+    """
+    if decimals is not None or dtype is not None:
+        metrics = [m.with_options(decimals, dtype) for m in metrics]
+    if isinstance(df, pd.DataFrame):
+        return df.assign(**{m.name: m.pandas(df) for m in metrics})
+    return df.with_columns(m.polars() for m in metrics)
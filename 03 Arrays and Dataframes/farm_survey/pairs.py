@@ -0,0 +1,33 @@
+"""Frames of farm pairs, built as pandas or polars.
+
+``distance.iter_pair_distances`` and ``spatial.GridIndex`` both produce
+farm pairs in blocks with the columns of Exercise 2 - Farm1, Farm2,
+Distance and Distance_km - and let the caller choose the library of the
+frames with ``output=``. The block and empty-result frames are built here,
+so both modules return exactly the same columns.
+"""
+
+import pandas as pd
+import polars as pl
+
+OUTPUTS = ("polars", "pandas")
+
+# Columns of every pair frame, in order
+PAIR_COLUMNS = ("Farm1", "Farm2", "Distance", "Distance_km")
+
+
+def make_frame(columns, output):
+    """A polars or pandas frame from a dict of columns."""
+    if output == "polars":
+        return pl.DataFrame(columns)
+    return pd.DataFrame(columns)
+
+
+def concat_pairs(blocks, output):
+    """Join pair blocks into one frame; an empty pair frame if there are none."""
+    blocks = list(blocks)
+    if not blocks:
+        return make_frame({name: [] for name in PAIR_COLUMNS}, output)
+    if output == "polars":
+        return pl.concat(blocks)
+    return pd.concat(blocks, ignore_index=True)
@@ -0,0 +1,144 @@
+"""Density plots that stay fast however many farms are plotted.
+
+Section 4.5 draws yield against farm area with ``plot.scatter`` on the full
+frame (and polars converts to pandas first). matplotlib keeps one marker per
+row, so at a few million farms drawing takes minutes and gigabytes. Here
+the points are first counted into a fixed grid of bins with NumPy - a 2D
+histogram - and the grid is drawn as one image with ``imshow``::
+
+    density_plot(df, "Farm_Area_ha", "Yield_mt_per_ha", sample=2_000)
+
+Drawing the image costs the same for 1,000 farms as for 100 million.
+Counting is one pass over the two columns, read straight from the pandas or
+polars frame without converting it, in chunks of ``CHUNK_ROWS`` values so
+its scratch memory does not grow with the frame either. ``sample``
+overlays a random subset of the actual points on top of the image.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.colors import LogNorm
+
+# Default grid: bins along x and along y
+DEFAULT_BINS = (300, 200)
+
+# Values binned at a time, to bound temporary memory
+CHUNK_ROWS = 1 << 20
+
+
+def column_values(df, name):
+    """A column of a pandas or polars frame as float64, missing values as NaN."""
+    if isinstance(df, pd.DataFrame):
+        return df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+    # Zero-copy for a float64 column without nulls
+    return df[name].cast(float).to_numpy()
+
+
+def sample_rows(n_rows, size, seed=0):
+    """Sorted positions of ``size`` random rows out of ``n_rows`` (all if fewer)."""
+    if size >= n_rows:
+        return np.arange(n_rows)
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(n_rows, size, replace=False))
+
+
+def _value_range(values):
+    """(min, max) of the finite values, widened if all are equal; (0, 1) if none."""
+    if len(values) == 0:
+        return 0.0, 1.0
+    # fmin / fmax skip NaN without building a mask of the whole column
+    lo, hi = np.fmin.reduce(values), np.fmax.reduce(values)
+    if not (np.isfinite(lo) and np.isfinite(hi)):
+        # All NaN, or an infinite value: the mask is only needed then
+        finite = values[np.isfinite(values)]
+        if len(finite) == 0:
+            return 0.0, 1.0
+        lo, hi = finite.min(), finite.max()
+    return (lo, hi) if hi > lo else (lo - 0.5, hi + 0.5)
+
+
+def density(df, x, y, *, bins=DEFAULT_BINS, range=None):
+    """Count the rows of ``df`` in a grid of ``x`` by ``y`` bins.
+
+    bins  - number of bins along x and y (or one number for both)
+    range - ((x min, x max), (y min, y max)), finite; default: the extent
+            of the finite values
+
+    Returns ``(counts, x_edges, y_edges)`` like ``np.histogram2d``, with
+    ``counts[i, j]`` the rows in x bin ``i`` and y bin ``j``. Rows with a
+    missing or infinite value or outside ``range`` are not counted.
+    """
+    return _density(column_values(df, x), column_values(df, y), bins, range)
+
+
+def _density(xs, ys, bins, range):
+    nx, ny = (bins, bins) if np.isscalar(bins) else bins
+    if range is None:
+        range = (_value_range(xs), _value_range(ys))
+    (x0, x1), (y0, y1) = range
+    if not (np.all(np.isfinite(range)) and x1 > x0 and y1 > y0):
+        raise ValueError(f"range must be finite with min < max, got {range!r}")
+    x_scale, y_scale = nx / (x1 - x0), ny / (y1 - y0)
+
+    counts = np.zeros(nx * ny, dtype=np.int64)
+    for start in np.arange(0, len(xs), CHUNK_ROWS):
+        # Bin number = how many bin widths a value is past the lower edge;
+        # the upper edge itself belongs to the last bin, as in np.histogram2d.
+        # The finite bounds also drop NaN and +-inf (their comparisons fail).
+        cx, cy = xs[start : start + CHUNK_ROWS], ys[start : start + CHUNK_ROWS]
+        keep = (cx >= x0) & (cx <= x1) & (cy >= y0) & (cy <= y1)
+        ix = np.minimum(((cx[keep] - x0) * x_scale).astype(np.intp), nx - 1)
+        iy = np.minimum(((cy[keep] - y0) * y_scale).astype(np.intp), ny - 1)
+        counts += np.bincount(ix * ny + iy, minlength=nx * ny)
+    return counts.reshape(nx, ny), np.linspace(x0, x1, nx + 1), np.linspace(y0, y1, ny + 1)
+
+
+def density_plot(
+    df,
+    x,
+    y,
+    *,
+    bins=DEFAULT_BINS,
+    range=None,
+    log=True,
+    sample=None,
+    seed=0,
+    cmap="viridis",
+    title=None,
+    ax=None,
+):
+    """Draw ``density(df, x, y)`` as an image; returns the matplotlib axes.
+
+    log    - logarithmic colour scale, so sparse areas stay visible next to
+             the dense ones
+    sample - overlay this many randomly chosen points (None: no overlay)
+    seed   - random seed of the sample
+
+    Empty bins are left blank.
+    """
+    # Read once, for the counts and the sample
+    xs, ys = column_values(df, x), column_values(df, y)
+    counts, x_edges, y_edges = _density(xs, ys, bins, range)
+    if ax is None:
+        ax = plt.figure().add_subplot()
+    image = ax.imshow(
+        # imshow's first axis is the vertical one
+        np.ma.masked_equal(counts.T, 0),
+        origin="lower",
+        extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+        aspect="auto",
+        interpolation="nearest",
+        cmap=cmap,
+        norm=LogNorm() if log and counts.any() else None,
+    )
+    ax.figure.colorbar(image, ax=ax, label="Farms")
+
+    if sample:
+        rows = sample_rows(len(xs), sample, seed)
+        ax.scatter(xs[rows], ys[rows], s=2, color="black", alpha=0.4, linewidths=0)
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    if title is not None:
+        ax.set_title(title)
+    return ax
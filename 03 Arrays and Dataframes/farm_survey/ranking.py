@@ -0,0 +1,131 @@
+"""Top-k selection without sorting the whole frame.
+
+Exercise 5 finds the 5 most efficient farms with
+``sort_values("Efficiency", ascending=False).head(5)``, which sorts every
+row just to keep five of them. ``top_k`` selects the k best rows with
+``np.argpartition`` (pandas) or polars' ``top_k`` - both O(n) - and only
+sorts those k rows. With ``by=`` it returns the top k rows of every group,
+e.g. the 5 best farms per Crop, or per Region and Crop with a list of
+columns. polars runs ``top_k_by`` in every group. pandas first cuts every
+large group down to the rows that can still be in its top k, with
+``np.partition`` on the group's slice, and then sorts only those rows by
+group and value.
+
+Missing values (NaN / null) never make it into the result.
+"""
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+# pandas groups with more rows than this many times k are cut down to their
+# top k (plus ties) before the final sort; smaller groups are sorted as they are
+PREFILTER_FACTOR = 4
+
+
+def _top_positions(values, k, descending):
+    """Positions of the k best finite values of a NumPy array, best first."""
+    valid = np.flatnonzero(~np.isnan(values))
+    key = -values[valid] if descending else values[valid]
+    if k < len(valid):
+        part = np.argpartition(key, k - 1)[:k]
+        valid, key = valid[part], key[part]
+    return valid[np.argsort(key, kind="stable")]
+
+
+def _keys(by):
+    return [by] if isinstance(by, str) else list(by)
+
+
+def _group_codes(df, keys):
+    """Group number of every row, in key order; -1 for a missing key."""
+    if len(keys) == 1:
+        return pd.factorize(df[keys[0]], sort=True)[0]
+    codes = df.groupby(keys, sort=True, dropna=True, observed=True).ngroup()
+    return codes.fillna(-1).to_numpy(dtype=np.int64)
+
+
+def _group_starts(codes):
+    """Start of every run of equal values in sorted ``codes``."""
+    return np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+
+def _prefilter(rows, codes, key, k):
+    """Drop the rows that cannot be in their group's top k.
+
+    Keeps every row of a group of at most ``PREFILTER_FACTOR * k`` rows; of a
+    larger group, the rows whose key is at most its k-th smallest. The kept
+    rows stay in frame order.
+    """
+    is_large = np.bincount(codes) > PREFILTER_FACTOR * k
+    if not is_large.any():
+        return rows, codes, key
+    # The rows of the large groups, grouped: one slice per group
+    large = np.flatnonzero(is_large)
+    in_large = np.flatnonzero(is_large[codes])
+    grouped = in_large[np.argsort(codes[in_large], kind="stable")]
+    starts = _group_starts(codes[grouped])
+    threshold = np.full(len(is_large), np.inf)
+    for code, group in zip(large, np.split(key[grouped], starts[1:])):
+        threshold[code] = np.partition(group, k - 1)[k - 1]
+    kept = np.flatnonzero(key <= threshold[codes])
+    return rows[kept], codes[kept], key[kept]
+
+
+def _top_k_pandas(df, column, k, descending, by):
+    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    if by is None:
+        return df.iloc[_top_positions(values, k, descending)]
+
+    codes = _group_codes(df, _keys(by))
+    rows = np.flatnonzero(~np.isnan(values) & (codes >= 0))  # -1 marks a missing group key
+    key = -values[rows] if descending else values[rows]
+    rows, codes, key = _prefilter(rows, codes[rows], key, k)
+
+    # One sort of the remaining rows by (group, rank key); then each group's
+    # first k rows are its top k. lexsort is stable, so ties keep the frame's order.
+    order = np.lexsort((key, codes))
+    sorted_codes = codes[order]
+    # Rank within the group = position minus the position of the group's first row
+    starts = _group_starts(sorted_codes)
+    sizes = np.diff(np.r_[starts, len(order)])
+    rank = np.arange(len(order)) - np.repeat(starts, sizes)
+    return df.iloc[rows[order[rank < k]]]
+
+
+def _top_k_polars(df, column, k, descending, by):
+    not_missing = pl.col(column).is_not_null()
+    if df.schema[column].is_float():
+        not_missing &= pl.col(column).is_not_nan()
+    df = df.filter(not_missing)
+    if by is None:
+        best = df.top_k(k, by=column) if descending else df.bottom_k(k, by=column)
+        return best.sort(column, descending=descending, maintain_order=True)
+
+    keys = _keys(by)
+    select = pl.all().top_k_by(column, k) if descending else pl.all().bottom_k_by(column, k)
+    return (
+        df.drop_nulls(keys)
+        .group_by(keys)
+        .agg(select)
+        .explode(pl.exclude(keys))
+        .sort([*keys, column], descending=[False] * len(keys) + [descending])
+        .select(df.columns)
+    )
+
+
+def top_k(df, column, k=5, *, descending=True, by=None):
+    """The ``k`` rows with the highest (or lowest) ``column``, best first.
+
+    df         - pandas or polars frame
+    descending - True for the largest values, False for the smallest
+    by         - optional group column, or list of columns: return the top k
+                 rows of every group, ordered by group and then by rank
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    if by is not None and not _keys(by):
+        raise ValueError("by must name at least one column")
+    if isinstance(df, pd.DataFrame):
+        return _top_k_pandas(df, column, k, descending, by)
+    return _top_k_polars(df, column, k, descending, by)
@@ -0,0 +1,139 @@
+"""Columnar sidecar files for survey CSVs.
+
+Parsing CSV text is the slowest part of loading a survey. The first time a
+CSV is read, ``ensure_sidecar`` converts it - in streaming batches - into a
+compressed Parquet or Arrow IPC file stored next to it::
+
+    farm_survey_large.csv
+    farm_survey_large.csv.parquet   (or farm_survey_large.csv.arrow)
+
+Later reads memory-map the sidecar and only decode the requested columns, so
+reading ``Crop`` and ``Production_mt`` does not touch the bytes of any other
+column. The size and modification time of the source CSV are stored in the
+sidecar's schema metadata; when the CSV changes the sidecar is rebuilt.
+
+The CSV is parsed by polars with the options of ``pl.read_csv``, so a
+sidecar holds exactly the columns, types and nulls a direct read would give
+(empty fields are null, "NA" stays text, dates stay strings).
+"""
+
+import json
+import os
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.ipc as pa_ipc
+import pyarrow.parquet as pq
+
+from . import SURVEY_CSV
+
+FORMATS = {"parquet": ".parquet", "ipc": ".arrow"}
+
+# Schema metadata key holding the fingerprint of the source CSV
+SOURCE_KEY = b"farm_survey.source"
+
+# CSV rows parsed per streaming batch while building a sidecar
+BATCH_ROWS = 500_000
+
+
+def sidecar_path(csv_path=SURVEY_CSV, fmt="parquet"):
+    """Return where the sidecar for ``csv_path`` lives (it may not exist yet)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {tuple(FORMATS)}, got {fmt!r}")
+    return os.fspath(csv_path) + FORMATS[fmt]
+
+
+def _source_stamp(csv_path):
+    st = os.stat(csv_path)
+    return json.dumps({"size": st.st_size, "mtime_ns": st.st_mtime_ns}).encode()
+
+
+def _read_schema(path, fmt):
+    if fmt == "parquet":
+        return pq.read_schema(path, memory_map=True)
+    with pa.memory_map(path) as source:
+        return pa_ipc.open_file(source).schema
+
+
+def is_fresh(csv_path=SURVEY_CSV, fmt="parquet"):
+    """True if a sidecar exists and was built from the current CSV."""
+    path = sidecar_path(csv_path, fmt)
+    if not os.path.exists(path):
+        return False
+    try:
+        metadata = _read_schema(path, fmt).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    return metadata.get(SOURCE_KEY) == _source_stamp(csv_path)
+
+
+def build_sidecar(csv_path=SURVEY_CSV, fmt="parquet", compression="zstd"):
+    """Convert ``csv_path`` into a sidecar file and return its path.
+
+    The CSV is parsed by polars' streaming engine in batches of
+    ``BATCH_ROWS`` rows and written batch by batch, so the whole file is
+    never held in memory. The sidecar is written to a temporary name first
+    and renamed, so readers never see half a file.
+    """
+    path = sidecar_path(csv_path, fmt)
+    tmp_path = path + ".tmp"
+    stamp = _source_stamp(csv_path)
+
+    # The same inference as pl.read_csv, whose defaults scan_csv shares
+    lazy = pl.scan_csv(csv_path)
+    schema = pl.DataFrame(schema=lazy.collect_schema()).to_arrow().schema
+    schema = schema.with_metadata({SOURCE_KEY: stamp})
+    batches = (
+        record_batch
+        for frame in lazy.collect_batches(chunk_size=BATCH_ROWS)
+        for record_batch in frame.to_arrow().to_batches()
+    )
+
+    try:
+        if fmt == "parquet":
+            with pq.ParquetWriter(tmp_path, schema, compression=compression) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+        else:
+            options = pa_ipc.IpcWriteOptions(compression=compression)
+            with pa_ipc.new_file(tmp_path, schema, options=options) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def ensure_sidecar(csv_path=SURVEY_CSV, fmt="parquet", compression="zstd"):
+    """Return the sidecar path, building or rebuilding it if needed."""
+    if is_fresh(csv_path, fmt):
+        return sidecar_path(csv_path, fmt)
+    return build_sidecar(csv_path, fmt, compression)
+
+
+def read_sidecar(csv_path=SURVEY_CSV, columns=None, fmt="parquet"):
+    """Read (a projection of) a survey CSV through its sidecar as a ``pa.Table``.
+
+    The sidecar is created on first use. ``columns`` limits which columns are
+    decoded; the rest of the file is never read.
+    """
+    path = ensure_sidecar(csv_path, fmt)
+    if fmt == "parquet":
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    else:
+        # The table's buffers point into the mapping, so it is not closed here
+        source = pa.memory_map(path)
+        if columns is None:
+            options = None
+        else:
+            names = pa_ipc.open_file(source).schema.names
+            options = pa_ipc.IpcReadOptions(
+                included_fields=[names.index(c) for c in columns]
+            )
+        table = pa_ipc.open_file(source, options=options).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    # The source stamp is an implementation detail of the sidecar
+    return table.replace_schema_metadata(None)
@@ -0,0 +1,370 @@
+"""Uniform-grid spatial index for "which farms are close?" questions.
+
+Exercise 3 finds nearby farms by building the full table of pairs and then
+filtering ``Distance < 0.15``, which costs O(n^2) before any filtering
+happens. ``GridIndex`` instead drops every farm into a square grid cell of
+side ``cell_size`` degrees. Two farms closer than ``r`` can only be in the
+same or in neighbouring cells (at most ``ceil(r / cell_size)`` cells apart),
+so only those candidates are compared. With the cell size close to the
+query radius this takes roughly O(n log n) for building plus time
+proportional to the number of close pairs.
+
+The final check uses exactly the same expressions as the exercise
+(``Distance < r`` or ``Distance * 111 < r_km``), so the result matches the
+brute-force filter pair for pair.
+"""
+
+import math
+
+import numpy as np
+
+from .distance import KM_PER_DEGREE
+from .pairs import concat_pairs, make_frame
+
+UNITS = ("deg", "km")
+
+# Candidate pairs compared per vectorized batch in ``pairs_within`` and
+# ``knn``
+MAX_CANDIDATES = 4_000_000
+
+
+def _radius_in_degrees(radius, unit):
+    if unit not in UNITS:
+        raise ValueError(f"unit must be one of {UNITS}, got {unit!r}")
+    return radius / KM_PER_DEGREE if unit == "km" else radius
+
+
+def _within(dist, radius, unit):
+    if unit == "km":
+        return dist * KM_PER_DEGREE < radius
+    return dist < radius
+
+
+class GridIndex:
+    """Grid hash over farm coordinates (pandas or polars frame).
+
+    cell_size - side of a grid cell in degrees; pick it close to the radius
+                you will query with (e.g. 0.15 for Exercise 3)
+
+    Farms with a missing (NaN) or infinite coordinate are not indexed: they
+    form no pairs and are nobody's neighbour, as in the brute-force filter.
+    """
+
+    def __init__(
+        self,
+        farms,
+        cell_size=0.15,
+        *,
+        id_col="Farm_Name",
+        lat_col="Latitude",
+        lon_col="Longitude",
+    ):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.ids = farms[id_col].to_numpy()
+        self.lat = farms[lat_col].to_numpy().astype(np.float64, copy=False)
+        self.lon = farms[lon_col].to_numpy().astype(np.float64, copy=False)
+
+        # Farms without finite coordinates are left out: they have no cell
+        # and are never close to anything
+        rows = np.flatnonzero(np.isfinite(self.lat) & np.isfinite(self.lon))
+        n = len(rows)
+        self._lat0 = self.lat[rows].min() if n else 0.0
+        self._lon0 = self.lon[rows].min() if n else 0.0
+        cx, cy = self._cell_of(self.lat[rows], self.lon[rows])
+        self._width = int(cy.max()) + 1 if n else 1
+        self._height = int(cx.max()) + 1 if n else 1
+
+        # Sort the farms by cell so every cell is one contiguous run;
+        # _order maps these positions back to rows of ``farms``
+        keys = cx * self._width + cy
+        self._order = rows[np.argsort(keys, kind="stable")]
+        self._keys, self._starts, self._counts = np.unique(
+            np.sort(keys, kind="stable"), return_index=True, return_counts=True
+        )
+        # Coordinates in cell order: the farms of one cell are adjacent in memory
+        self._sorted_lat = self.lat[self._order]
+        self._sorted_lon = self.lon[self._order]
+
+        # For grids that are not much larger than the data, a dense
+        # cell -> position table is faster than binary search
+        self._dense = None
+        if self._height * self._width <= max(4 * n, 1 << 20):
+            self._dense = np.full(self._height * self._width, -1, dtype=np.int64)
+            self._dense[self._keys] = np.arange(len(self._keys))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _cell_of(self, lat, lon):
+        cx = np.floor((lat - self._lat0) / self.cell_size).astype(np.int64)
+        cy = np.floor((lon - self._lon0) / self.cell_size).astype(np.int64)
+        return cx, cy
+
+    def _ring(self, radius_deg):
+        # Small slack so points exactly on a cell border are never missed
+        return max(1, math.ceil(radius_deg * (1 + 1e-9) / self.cell_size))
+
+    def _lookup(self, cx, cy):
+        """Positions in ``self._keys`` of cells (cx, cy), or -1 if empty."""
+        if len(self._keys) == 0:
+            return np.full(np.shape(cx), -1)
+        valid = (cy >= 0) & (cy < self._width) & (cx >= 0)
+        keys = cx * self._width + cy
+        if self._dense is not None:
+            valid &= cx < self._height
+            return np.where(valid, self._dense[np.where(valid, keys, 0)], -1)
+        pos = np.searchsorted(self._keys, keys)
+        pos = np.minimum(pos, len(self._keys) - 1)
+        found = valid & (self._keys[pos] == keys)
+        return np.where(found, pos, -1)
+
+    def _candidate_batches(self, cells_a, cells_b, same_cell):
+        """Yield (i, j) point index arrays for every point pair of two cells lists."""
+        na = self._counts[cells_a]
+        nb = self._counts[cells_b]
+        sizes = na * nb
+        bounds = np.cumsum(sizes)
+
+        start = 0
+        while start < len(cells_a):
+            # Take as many cell pairs as fit in one batch (at least one)
+            base = bounds[start - 1] if start else 0
+            stop = int(np.searchsorted(bounds, base + MAX_CANDIDATES, side="right"))
+            stop = max(stop, start + 1)
+
+            pair = np.repeat(np.arange(start, stop), sizes[start:stop])
+            local = np.arange(len(pair)) - np.repeat(
+                bounds[start:stop] - sizes[start:stop], sizes[start:stop]
+            )
+            a_local = local // nb[pair]
+            b_local = local % nb[pair]
+            if same_cell:
+                keep = a_local < b_local
+                pair, a_local, b_local = pair[keep], a_local[keep], b_local[keep]
+
+            i = self._order[self._starts[cells_a[pair]] + a_local]
+            j = self._order[self._starts[cells_b[pair]] + b_local]
+            yield i, j
+            start = stop
+
+    def iter_pairs_within(self, radius, unit="deg", output="polars"):
+        """Yield every pair of farms closer than ``radius``, in blocks.
+
+        Blocks have the same columns as Exercise 2 (Farm1, Farm2, Distance,
+        Distance_km); Farm1 is always the farm that comes first in the input.
+        """
+        radius_deg = _radius_in_degrees(radius, unit)
+        ring = self._ring(radius_deg)
+        cell_x = self._keys // self._width
+        cell_y = self._keys % self._width
+        all_cells = np.arange(len(self._keys))
+
+        # Half of the neighbourhood, so each pair of cells is visited once
+        offsets = [
+            (dx, dy)
+            for dx in range(0, ring + 1)
+            for dy in range(-ring, ring + 1)
+            if dx > 0 or dy >= 0
+        ]
+        for dx, dy in offsets:
+            if (dx, dy) == (0, 0):
+                cells_a, cells_b = all_cells, all_cells
+            else:
+                other = self._lookup(cell_x + dx, cell_y + dy)
+                has_other = other >= 0
+                cells_a, cells_b = all_cells[has_other], other[has_other]
+            if len(cells_a) == 0:
+                continue
+
+            for i, j in self._candidate_batches(cells_a, cells_b, (dx, dy) == (0, 0)):
+                dist = np.sqrt(
+                    (self.lat[j] - self.lat[i]) ** 2 + (self.lon[j] - self.lon[i]) ** 2
+                )
+                keep = _within(dist, radius, unit)
+                if not keep.any():
+                    continue
+                i, j, dist = i[keep], j[keep], dist[keep]
+                first, second = np.minimum(i, j), np.maximum(i, j)
+                yield make_frame(
+                    {
+                        "Farm1": self.ids[first],
+                        "Farm2": self.ids[second],
+                        "Distance": dist,
+                        "Distance_km": dist * KM_PER_DEGREE,
+                    },
+                    output,
+                )
+
+    def pairs_within(self, radius, unit="deg", output="polars"):
+        """All pairs closer than ``radius`` as one frame."""
+        return concat_pairs(self.iter_pairs_within(radius, unit, output), output)
+
+    def query_point(self, lat, lon, radius, unit="deg"):
+        """Indices and distances of all farms closer than ``radius`` to a point."""
+        radius_deg = _radius_in_degrees(radius, unit)
+        if not (np.isfinite(lat) and np.isfinite(lon)):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        ring = self._ring(radius_deg)
+        cx, cy = self._cell_of(np.float64(lat), np.float64(lon))
+        dx, dy = np.meshgrid(np.arange(-ring, ring + 1), np.arange(-ring, ring + 1))
+        cells = self._lookup(cx + dx.ravel(), cy + dy.ravel())
+        cells = cells[cells >= 0]
+        if len(cells) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        idx = np.concatenate(
+            [self._order[s:s + c] for s, c in zip(self._starts[cells], self._counts[cells])]
+        )
+        dist = np.sqrt((self.lat[idx] - lat) ** 2 + (self.lon[idx] - lon) ** 2)
+        keep = _within(dist, radius, unit)
+        idx, dist = idx[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return idx[order], dist[order]
+
+    def knn(self, k, lat=None, lon=None):
+        """Indices and distances (degrees) of the ``k`` nearest farms.
+
+        Without ``lat``/``lon`` the indexed farms themselves are the queries
+        and each farm is skipped as its own neighbour. Returns two arrays of
+        shape ``(queries, k)``, nearest first; if there are fewer than ``k``
+        candidates the rest is filled with -1 and ``inf``. A query with a
+        non-finite coordinate gets -1 and NaN.
+
+        Each query first looks at the 3 x 3 cells around it. The answer is
+        final once its k-th candidate is closer than the edge of the searched
+        block; the remaining queries retry with a block twice as wide.
+        """
+        self_query = lat is None
+        if self_query:
+            lat, lon = self.lat, self.lon
+        else:
+            lat = np.atleast_1d(np.asarray(lat, dtype=np.float64))
+            lon = np.atleast_1d(np.asarray(lon, dtype=np.float64))
+        m = len(lat)
+        idx_out = np.full((m, k), -1, dtype=np.int64)
+        dist_out = np.full((m, k), np.inf)
+        finite = np.isfinite(lat) & np.isfinite(lon)
+        dist_out[~finite] = np.nan
+        if m == 0 or k == 0 or len(self._keys) == 0:
+            return idx_out, dist_out
+
+        # Non-finite queries get a placeholder cell but are never searched
+        qx, qy = self._cell_of(
+            np.where(finite, lat, self._lat0), np.where(finite, lon, self._lon0)
+        )
+        # Ring at which a query's block covers the whole grid
+        full_ring = np.maximum.reduce(
+            [qx, self._height - 1 - qx, qy, self._width - 1 - qy]
+        )
+
+        # Work through the queries cell by cell, so neighbouring queries
+        # touch the same memory
+        pending = np.flatnonzero(finite)
+        pending = pending[np.argsort(qx[pending] * self._width + qy[pending], kind="stable")]
+        ring = 1
+        while len(pending):
+            d = np.arange(-ring, ring + 1)
+            dx, dy = np.repeat(d, len(d)), np.tile(d, len(d))
+            # Queries whose block of cells is looked up at once
+            chunk = max(1, MAX_CANDIDATES // len(dx))
+            retry = []
+
+            for c0 in range(0, len(pending), chunk):
+                q_chunk = pending[c0:c0 + chunk]
+                cells = self._lookup(qx[q_chunk, None] + dx, qy[q_chunk, None] + dy)
+                counts = np.where(cells >= 0, self._counts[cells], 0)
+                found = counts.sum(axis=1)
+                for rows in self._knn_batches(found, k):
+                    q = q_chunk[rows]
+                    near_point, near_dist = self._knn_batch(
+                        q, cells[rows], counts[rows], found[rows], lat, lon, k, self_query
+                    )
+                    kth = near_dist[:, k - 1]
+                    done = (kth <= ring * self.cell_size) | (ring >= full_ring[q])
+                    idx_out[q[done]] = near_point[done]
+                    dist_out[q[done]] = near_dist[done]
+                    retry.append(q[~done])
+
+            pending = np.concatenate(retry)
+            ring *= 2
+        return idx_out, dist_out
+
+    @staticmethod
+    def _knn_batches(found, k):
+        """Yield row positions of queries whose padded candidate matrix fits a batch.
+
+        The matrix of a batch has one row per query, as wide as its largest
+        candidate count. Queries are taken in order of their candidate count,
+        so a dense cluster only widens the rows of the queries near it, and
+        each batch holds at most ``MAX_CANDIDATES`` cells (or one query).
+        """
+        rows = np.argsort(found, kind="stable")  # stable: keeps the cell order
+        width = np.maximum(found[rows], k)
+        start = 0
+        while start < len(rows):
+            # Rows are sorted by width, so the last row of a batch is its
+            # widest, and no batch has more than MAX_CANDIDATES / width rows
+            window = width[start:start + max(1, MAX_CANDIDATES // int(width[start]))]
+            fits = np.arange(1, len(window) + 1) * window <= MAX_CANDIDATES
+            stop = start + max(1, int(np.argmin(fits)) if not fits.all() else len(window))
+            yield rows[start:stop]
+            start = stop
+
+    def _knn_batch(self, q, cells, counts, found, lat, lon, k, self_query):
+        """k nearest candidates (points, distances) of queries ``q``, nearest first."""
+        cells, counts = cells.ravel(), counts.ravel()
+        # One (query, farm) row per candidate, grouped by query
+        total = counts.sum()
+        qq = np.repeat(q, found)
+        offset = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        pos = np.repeat(self._starts[cells], counts) + offset
+        point = self._order[pos]
+        if self_query:
+            # Every farm finds itself exactly once (in its own cell)
+            not_self = point != qq
+            qq, pos, point = qq[not_self], pos[not_self], point[not_self]
+            found = found - 1
+        dist = np.sqrt(
+            (self._sorted_lat[pos] - np.repeat(lat[q], found)) ** 2
+            + (self._sorted_lon[pos] - np.repeat(lon[q], found)) ** 2
+        )
+
+        # Lay the candidates out as one padded row per query and pick the k
+        # smallest of each row
+        first = np.cumsum(found) - found
+        col = np.arange(len(qq)) - np.repeat(first, found)
+        row = np.repeat(np.arange(len(q)), found)
+        width = max(int(found.max()), k)
+        cand_dist = np.full((len(q), width), np.inf)
+        cand_point = np.full((len(q), width), -1, dtype=np.int64)
+        cand_dist[row, col] = dist
+        cand_point[row, col] = point
+
+        nearest = np.argpartition(cand_dist, k - 1, axis=1)[:, :k]
+        near_dist = np.take_along_axis(cand_dist, nearest, axis=1)
+        by_dist = np.argsort(near_dist, axis=1, kind="stable")
+        near_dist = np.take_along_axis(near_dist, by_dist, axis=1)
+        near_point = np.take_along_axis(
+            cand_point, np.take_along_axis(nearest, by_dist, axis=1), axis=1
+        )
+        return near_point, near_dist
+
+    def neighbours(self, farm, radius, unit="deg", output="polars"):
+        """Farms closer than ``radius`` to the farm with id ``farm``, nearest first."""
+        matches = np.flatnonzero(self.ids == farm)
+        if len(matches) == 0:
+            raise KeyError(farm)
+        row = matches[0]
+        idx, dist = self.query_point(self.lat[row], self.lon[row], radius, unit)
+        not_self = idx != row
+        idx, dist = idx[not_self], dist[not_self]
+        return make_frame(
+            {
+                "Farm": self.ids[idx],
+                "Distance": dist,
+                "Distance_km": dist * KM_PER_DEGREE,
+            },
+            output,
+        )
@@ -0,0 +1,93 @@
+"""Several aggregations per group in a single group-by pass.
+
+The pandas solution to Exercise 4 groups the data twice - once for
+``.sum()`` and once for ``.mean()`` - and section 4.5 groups it a third
+time. ``summarize`` takes a list of aggregations and computes all of them
+from one grouping, for pandas and polars alike::
+
+    summarize(df, "Crop", [
+        ("Yield", "sum", "Total_Yield"),
+        ("Yield", "mean", "Average_Yield"),
+        ("Yield", "count"),                 # -> column "Yield_count"
+    ], sort_by="Total_Yield")
+
+``summarize_many`` computes several summary tables (e.g. by Crop and by
+Region) from a polars lazy scan so the file is read only once.
+"""
+
+import pandas as pd
+import polars as pl
+
+AGGREGATIONS = ("sum", "mean", "count", "min", "max", "std")
+
+
+def _normalize(aggs):
+    """Turn (column, agg[, name]) tuples into (column, agg, name) triples."""
+    specs = []
+    for spec in aggs:
+        column, agg, *name = spec
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"aggregation must be one of {AGGREGATIONS}, got {agg!r}")
+        specs.append((column, agg, name[0] if name else f"{column}_{agg}"))
+    return specs
+
+
+def _polars_exprs(specs):
+    return [getattr(pl.col(column), agg)().alias(name) for column, agg, name in specs]
+
+
+def _keys(by):
+    return [by] if isinstance(by, str) else list(by)
+
+
+def _summarize_polars(df, by, specs, sort_by, descending):
+    query = df.group_by(_keys(by)).agg(_polars_exprs(specs))
+    if sort_by is not None:
+        query = query.sort(sort_by, descending=descending)
+    return query
+
+
+def summarize(df, by, aggs, *, sort_by=None, descending=True):
+    """One row per group of ``by`` with every requested aggregation.
+
+    df       - pandas DataFrame, polars DataFrame or polars LazyFrame
+    by       - group column name or list of names (e.g. ["Crop", "Region"])
+    aggs     - (column, aggregation) or (column, aggregation, output name)
+               tuples; aggregations: sum, mean, count, min, max, std
+    sort_by  - optional output column to sort the (small) result by
+
+    ``count`` counts non-missing values and ``std`` is the sample standard
+    deviation (ddof=1) in both libraries. Missing group keys form their own
+    group, as in polars.
+    """
+    specs = _normalize(aggs)
+    if isinstance(df, pd.DataFrame):
+        # Named aggregation: the keys are hashed once and every aggregation
+        # reuses the same group codes
+        result = (
+            df.groupby(_keys(by), sort=False, dropna=False, observed=True)
+            .agg(**{name: (column, agg) for column, agg, name in specs})
+            .reset_index()
+        )
+        if sort_by is not None:
+            result = result.sort_values(sort_by, ascending=not descending, ignore_index=True)
+        return result
+    return _summarize_polars(df, by, specs, sort_by, descending)
+
+
+def summarize_many(lf, tables):
+    """Compute several summary tables from one lazy polars source.
+
+    lf     - a polars LazyFrame, e.g. ``lazy.scan_survey()``
+    tables - {table name: (by, aggs)} or {table name: (by, aggs, sort_by)}
+
+    All queries are collected together, so polars reads the shared source
+    once and feeds every group-by from it.
+    """
+    names, queries = [], []
+    for name, (by, aggs, *sort_by) in tables.items():
+        names.append(name)
+        queries.append(
+            _summarize_polars(lf, by, _normalize(aggs), sort_by[0] if sort_by else None, True)
+        )
+    return dict(zip(names, pl.collect_all(queries)))
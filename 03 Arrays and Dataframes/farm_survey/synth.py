@@ -0,0 +1,192 @@
+"""Reproducible synthetic survey data of any size.
+
+The exercises make their data with ``np.random.seed(42)`` and a few
+``randint`` / ``choice`` / ``uniform`` calls - fine for 20 farms, but one
+global random state cannot be shared by parallel workers, and building
+hundreds of millions of rows in one go does not fit in memory. Here the
+table is made in chunks of ``chunk_rows`` rows. Every chunk draws from its
+own ``np.random.Generator``, seeded from ``SeedSequence(seed).spawn(...)``,
+so chunk ``i`` is the same whichever process makes it and in whatever
+order: the output depends only on ``seed`` and ``chunk_rows``::
+
+    df = synthetic_survey(1_000, coordinates=True)           # in memory
+    write_synthetic_survey("survey_100M.parquet", 100_000_000)  # process pool
+
+Columns are those of ``farm_survey_large.csv`` (Farm_ID, Region, Crop,
+Farm_Area_ha, Production_mt), optionally followed by Latitude / Longitude
+and Fertilizer_kg / Labor_days.
+"""
+
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import polars as pl
+import pyarrow.parquet as pq
+
+from .encoding import ENUM_DTYPES, KNOWN_CATEGORIES, LEGACY_REGIONS
+
+FORMATS = ("csv", "parquet")
+
+# Rows made by one generator / written by one worker task
+CHUNK_ROWS = 1_000_000
+
+REGIONS = [r for r in KNOWN_CATEGORIES["Region"] if r not in LEGACY_REGIONS]
+CROPS = KNOWN_CATEGORIES["Crop"]
+
+# Typical yield in metric tons per hectare, by crop
+CROP_YIELD_MT_PER_HA = {
+    "Rice": 4.1,
+    "Corn": 3.0,
+    "Banana": 20.0,
+    "Sugarcane": 60.0,
+    "Coconut": 4.5,
+    "Vegetables": 12.0,
+}
+
+# Bounding box of the random farm locations (roughly the Philippines)
+LATITUDE_RANGE = (5.0, 19.0)
+LONGITUDE_RANGE = (117.0, 127.0)
+
+
+def chunk_seeds(seed, n_chunks):
+    """Independent seed sequences for chunks 0 .. n_chunks - 1."""
+    return np.random.SeedSequence(seed).spawn(n_chunks)
+
+
+def generate_chunk(first_id, rows, seed_seq, *, coordinates=False, inputs=False, missing=0.0):
+    """One chunk of the survey as a polars DataFrame.
+
+    first_id    - Farm_ID of the first row
+    seed_seq    - ``np.random.SeedSequence`` of this chunk
+    coordinates - add Latitude / Longitude
+    inputs      - add Fertilizer_kg / Labor_days
+    missing     - share of Production_mt values left empty (null)
+    """
+    rng = np.random.default_rng(seed_seq)
+    region_codes = rng.integers(0, len(REGIONS), rows)
+    crop_codes = rng.integers(0, len(CROPS), rows)
+    # Most farms are small: log-normal area with a median around 1.3 ha
+    area = np.maximum(rng.lognormal(0.3, 0.6, rows), 0.05).round(2)
+    crop_yield = np.array([CROP_YIELD_MT_PER_HA[c] for c in CROPS])[crop_codes]
+    production = (area * crop_yield * rng.normal(1.0, 0.15, rows).clip(0.3)).round(2)
+
+    columns = {
+        "Farm_ID": np.arange(first_id, first_id + rows),
+        # The loader's Enum dtypes, so generated and loaded frames combine
+        "Region": pl.Series(REGIONS, dtype=ENUM_DTYPES["Region"]).gather(region_codes),
+        "Crop": pl.Series(CROPS, dtype=ENUM_DTYPES["Crop"]).gather(crop_codes),
+        "Farm_Area_ha": area,
+        "Production_mt": production,
+    }
+    if coordinates:
+        columns["Latitude"] = rng.uniform(*LATITUDE_RANGE, rows).round(6)
+        columns["Longitude"] = rng.uniform(*LONGITUDE_RANGE, rows).round(6)
+    if inputs:
+        columns["Fertilizer_kg"] = (area * rng.uniform(40.0, 120.0, rows)).round(1)
+        labor_days = np.maximum((area * rng.uniform(10.0, 30.0, rows)).round(), 1)
+        columns["Labor_days"] = labor_days.astype(np.int64)
+
+    df = pl.DataFrame(columns)
+    if missing > 0:
+        empty = pl.Series(rng.random(rows) < missing)
+        df = df.with_columns(
+            pl.when(empty).then(None).otherwise(pl.col("Production_mt")).alias("Production_mt")
+        )
+    return df
+
+
+def _chunks(rows, seed, chunk_rows):
+    """(first Farm_ID, rows, seed sequence) of every chunk."""
+    n_chunks = max(math.ceil(rows / chunk_rows), 1)
+    return [
+        (1 + i * chunk_rows, min(chunk_rows, rows - i * chunk_rows), seed_seq)
+        for i, seed_seq in enumerate(chunk_seeds(seed, n_chunks))
+    ]
+
+
+def synthetic_survey(rows, *, seed=42, chunk_rows=CHUNK_ROWS, **columns):
+    """A synthetic survey of ``rows`` farms as one polars DataFrame.
+
+    Keyword arguments (coordinates, inputs, missing) go to ``generate_chunk``.
+    """
+    parts = [
+        generate_chunk(first_id, n, seed_seq, **columns)
+        for first_id, n, seed_seq in _chunks(rows, seed, chunk_rows)
+    ]
+    return pl.concat(parts)
+
+
+def _write_part(task):
+    """Worker: make one chunk and write it to its own part file."""
+    part_path, fmt, with_header, (first_id, rows, seed_seq), columns = task
+    df = generate_chunk(first_id, rows, seed_seq, **columns)
+    if fmt == "csv":
+        df.write_csv(part_path, include_header=with_header)
+    else:
+        df.write_parquet(part_path)
+    return part_path
+
+
+def write_synthetic_survey(
+    path,
+    rows,
+    *,
+    fmt=None,
+    seed=42,
+    chunk_rows=CHUNK_ROWS,
+    max_workers=None,
+    **columns,
+):
+    """Write a synthetic survey of ``rows`` farms to one CSV or Parquet file.
+
+    fmt         - "csv" or "parquet" (default: from the file extension)
+    max_workers - worker processes (default: one per CPU)
+
+    Chunks are made in parallel, each into a temporary part file, and
+    appended to ``path`` in chunk order as soon as they are ready, so only a
+    few chunks are in memory at once. The file is identical for any number
+    of workers. Other keyword arguments (coordinates, inputs, missing) go to
+    ``generate_chunk``. Returns ``path``.
+
+    Workers are started with "spawn", so a script calling this needs the
+    usual ``if __name__ == "__main__":`` guard.
+    """
+    if fmt is None:
+        fmt = "parquet" if str(path).endswith(".parquet") else "csv"
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    work_dir = tempfile.mkdtemp(prefix=".synth-", dir=directory)
+    tmp_path = os.path.join(work_dir, "combined")
+    tasks = [
+        (os.path.join(work_dir, f"part-{i:05d}"), fmt, i == 0, chunk, columns)
+        for i, chunk in enumerate(_chunks(rows, seed, chunk_rows))
+    ]
+    try:
+        # Fresh interpreters: forking a process that runs polars threads can deadlock
+        pool = ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn"))
+        with pool, open(tmp_path, "wb") as out:
+            writer = None
+            # map() yields in chunk order, while later chunks are still running
+            for part_path in pool.map(_write_part, tasks):
+                if fmt == "csv":
+                    with open(part_path, "rb") as part:
+                        shutil.copyfileobj(part, out)
+                else:
+                    table = pq.read_table(part_path)
+                    if writer is None:
+                        writer = pq.ParquetWriter(out, table.schema, compression="zstd")
+                    writer.write_table(table)
+                os.remove(part_path)
+            if writer is not None:
+                writer.close()
+        os.replace(tmp_path, path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return path
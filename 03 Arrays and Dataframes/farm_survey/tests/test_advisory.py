@@ -0,0 +1,75 @@
+"""advisories and write_advisories against a per-row str.format loop."""
+
+import numpy as np
+import polars as pl
+import pytest
+
+from farm_survey.advisory import (
+    FEI_BANDS,
+    FEI_TEMPLATES,
+    MISSING_TEXT,
+    advisories,
+    write_advisories,
+)
+
+FARMS = pl.DataFrame({
+    "Farm_ID": [1, 2, 3, 4, 5],
+    "Crop": ["Rice", "Corn", None, "Banana", "Rice"],
+    "FEI": [0.05, 0.0812345, 0.2, None, 0.1],
+})
+# Templates with different placeholders, so no shared code path
+MIXED = {
+    "Low": "{Farm_ID} low",
+    "Moderate": "{Crop} moderate {FEI}",
+    "High": "high {FEI} for {Farm_ID}",
+}
+
+
+def loop_advisories(df, templates, decimals=3):
+    """The exercises' loop: pick the band, then format the template."""
+    lines = []
+    for row in df.iter_rows(named=True):
+        fei = row["FEI"]
+        if fei is None:
+            lines.append(None)
+            continue
+        band = "High" if fei >= 0.10 else "Moderate" if fei >= 0.07 else "Low"
+        values = {k: MISSING_TEXT if v is None else str(v) for k, v in row.items()}
+        values["FEI"] = str(round(fei, decimals))
+        lines.append(templates[band].format(**values))
+    return lines
+
+
+@pytest.mark.parametrize("templates", [FEI_TEMPLATES, MIXED], ids=["shared", "mixed"])
+@pytest.mark.parametrize("kind", ["polars", "pandas"])
+def test_matches_the_loop(templates, kind):
+    df = FARMS.to_pandas() if kind == "pandas" else FARMS
+    result = advisories(df, "FEI", FEI_BANDS, templates)
+    assert result["Advisory"].to_list() == loop_advisories(FARMS, templates)
+    assert result["FEI_Band"].to_list() == ["Low", "Moderate", "High", None, "High"]
+
+
+def test_write_skips_rows_without_a_band(tmp_path):
+    path = tmp_path / "advisories.txt"
+    lines = write_advisories(FARMS.lazy(), path, "FEI", FEI_BANDS, FEI_TEMPLATES, decimals=2)
+    expected = [line for line in loop_advisories(FARMS, FEI_TEMPLATES, 2) if line is not None]
+    assert lines == 4
+    assert path.read_text().splitlines() == expected
+
+
+def test_missing_template_is_rejected():
+    templates = {k: v for k, v in FEI_TEMPLATES.items() if k != "High"}
+    with pytest.raises(ValueError, match="High"):
+        advisories(FARMS, "FEI", FEI_BANDS, templates)
+
+
+def test_many_rows_match_the_loop():
+    rng = np.random.default_rng(0)
+    fei = rng.uniform(0.0, 0.2, 1000)
+    df = pl.DataFrame({
+        "Farm_ID": np.arange(1000),
+        "Crop": rng.choice(["Rice", "Corn", "Banana"], 1000),
+        "FEI": fei,
+    })
+    result = advisories(df, "FEI", FEI_BANDS, FEI_TEMPLATES)
+    assert result["Advisory"].to_list() == loop_advisories(df, FEI_TEMPLATES)
@@ -0,0 +1,66 @@
+"""The batch job on a few small surveys, one of them broken."""
+
+import os
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from farm_survey.batch import CROP_SUMMARY, format_summary, run_file
+from farm_survey.metrics import YIELD, add_metrics
+from farm_survey.summary import summarize
+
+# Crops outside KNOWN_CATEGORIES, as in 99.1_additional_exercises_02
+SURVEY = """Farm_ID,Region,Crop,Farm_Area_ha,Production_mt
+1,I,Tomato,1.5,4.2
+2,II,Cassava,2.0,3.1
+3,I,Rice,0.8,1.9
+4,III,Cassava,1.2,2.5
+"""
+
+
+@pytest.fixture
+def survey(tmp_path):
+    path = tmp_path / "in" / "ilocos.csv"
+    path.parent.mkdir()
+    path.write_text(SURVEY)
+    return str(path)
+
+
+def test_run_file_writes_the_summary_and_the_export(survey, tmp_path):
+    out = str(tmp_path / "out")
+    result = run_file(survey, out)
+    assert result["error"] is None
+    assert result["rows"] == 4
+
+    df = add_metrics(pl.read_csv(survey), [YIELD])
+    expected = summarize(df, "Crop", CROP_SUMMARY, sort_by="Total_Production_mt")
+    assert_frame_equal(pl.read_csv(os.path.join(out, "crop_summary.csv")), expected,
+                       check_dtypes=False)
+
+    exported = pl.scan_parquet(
+        os.path.join(out, "survey", "**", "*.parquet"), hive_partitioning=True
+    ).collect()
+    assert_frame_equal(exported.select(df.columns).sort("Farm_ID"), df)
+    # Nothing is written next to the input
+    assert os.listdir(os.path.dirname(survey)) == ["ilocos.csv"]
+
+
+def test_run_file_again_replaces_the_export(survey, tmp_path):
+    out = str(tmp_path / "out")
+    run_file(survey, out)
+    assert run_file(survey, out)["error"] is None
+
+
+def test_failed_file_is_shown_as_failed(survey, tmp_path):
+    broken = tmp_path / "in" / "broken.csv"
+    broken.write_text("Farm_ID,Region\n1,I\n")
+    results = [run_file(survey, str(tmp_path / "a")), run_file(str(broken), str(tmp_path / "b"))]
+    assert results[1]["rows"] is None
+    assert "ColumnNotFoundError" in results[1]["error"]
+
+    table = format_summary(results, 1.0).splitlines()
+    assert table[1].split()[:2] == ["ilocos.csv", "4"]
+    name, rows, _, status = table[2].split()[:4]
+    assert (name, rows, status) == ("broken.csv", "-", "failed:")
+    assert table[-1].startswith("2 files (1 failed), 4 rows")
@@ -0,0 +1,122 @@
+"""cache_key: what changes the key and what does not; cached round trips and eviction."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from farm_survey.cell_cache import cache_info, cache_key, cached, clear_cache
+
+FRAME = pl.DataFrame({"Crop": ["Rice", "Corn"], "Production_mt": [4.0, 2.0]})
+
+
+def summary(df, scale=1.0):
+    return df.with_columns(pl.col("Production_mt") * scale)
+
+
+def summary_commented(df, scale=1.0):
+    # Same code as summary, with a comment
+    return df.with_columns(pl.col("Production_mt") * scale)
+
+
+def summary_edited(df, scale=1.0):
+    return df.with_columns(pl.col("Production_mt") * scale * 2)
+
+
+def summary_other_default(df, scale=2.0):
+    return df.with_columns(pl.col("Production_mt") * scale)
+
+
+def make_closure(factor):
+    def scaled(df):
+        return df.with_columns(pl.col("Production_mt") * factor)
+    return scaled
+
+
+def test_key_is_stable():
+    assert cache_key(summary, (FRAME,)) == cache_key(summary, (FRAME.clone(),))
+    assert cache_key(summary, (FRAME,), {"scale": 2}) == cache_key(summary, (FRAME,), {"scale": 2})
+
+
+def test_key_follows_the_code_not_the_comments():
+    # Qualified names differ, so compare the code hashes through renamed copies
+    summary_commented.__qualname__ = summary_edited.__qualname__ = "summary"
+    try:
+        assert cache_key(summary_commented, (FRAME,)) == cache_key(summary, (FRAME,))
+        assert cache_key(summary_edited, (FRAME,)) != cache_key(summary, (FRAME,))
+    finally:
+        summary_commented.__qualname__ = "summary_commented"
+        summary_edited.__qualname__ = "summary_edited"
+
+
+def test_key_follows_defaults_and_closures():
+    summary_other_default.__qualname__ = "summary"
+    try:
+        assert cache_key(summary_other_default, (FRAME,)) != cache_key(summary, (FRAME,))
+    finally:
+        summary_other_default.__qualname__ = "summary_other_default"
+    assert cache_key(make_closure(1.0), (FRAME,)) == cache_key(make_closure(1.0), (FRAME,))
+    assert cache_key(make_closure(1.0), (FRAME,)) != cache_key(make_closure(2.0), (FRAME,))
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        FRAME.with_columns(pl.col("Production_mt") + 1),
+        FRAME.cast({"Production_mt": pl.Float32}),
+        FRAME.to_pandas(),
+    ],
+    ids=["values", "dtype", "library"],
+)
+def test_key_follows_frame_contents(other):
+    assert cache_key(summary, (other,)) != cache_key(summary, (FRAME,))
+
+
+def test_key_follows_arrays_and_files(tmp_path):
+    a = np.arange(4.0)
+    assert cache_key(summary, (a,)) != cache_key(summary, (a.reshape(2, 2),))
+    path = tmp_path / "farms.csv"
+    path.write_text("Crop\nRice\n")
+    before = cache_key(summary, (str(path),))
+    path.write_text("Crop\nRice\nCorn\n")
+    assert cache_key(summary, (str(path),)) != before
+
+
+def test_unhashable_argument_is_rejected():
+    with pytest.raises(TypeError):
+        cache_key(summary, (object(),))
+
+
+@pytest.mark.parametrize("kind", ["polars", "pandas"])
+def test_round_trip_and_counters(tmp_path, kind):
+    # A list of calls would be a closure variable, part of the key: count
+    # with the hit and miss counters instead
+    @cached(cache_dir=str(tmp_path))
+    def crop_totals(df):
+        return df.to_pandas() if kind == "pandas" else df
+
+    clear_cache(str(tmp_path))
+    first = crop_totals(FRAME)
+    second = crop_totals(FRAME)
+    assert type(second) is type(first)
+    if kind == "pandas":
+        pd.testing.assert_frame_equal(second, first)
+    else:
+        assert_frame_equal(second, first)
+    info = cache_info(str(tmp_path))
+    assert (info["hits"], info["misses"], info["entries"]) == (1, 1, 1)
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    @cached(cache_dir=str(tmp_path), max_bytes=1)
+    def frame_of(n):
+        return pl.DataFrame({"x": range(n)})
+
+    frame_of(10)
+    frame_of(20)
+    # Only the entry just written stays under a 1-byte limit
+    assert cache_info(str(tmp_path))["entries"] == 1
+    assert len(os.listdir(tmp_path)) == 1
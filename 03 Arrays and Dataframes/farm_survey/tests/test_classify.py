@@ -0,0 +1,65 @@
+"""classify and classify_expr against the exercises' per-row lambda."""
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from farm_survey.classify import band_labels, classify, classify_expr
+
+BANDS = [(-np.inf, "Inefficient"), (0.08, "Efficient")]
+# Bands sharing a label, and a first bound that leaves low values unlabelled
+SHARED = [(0.0, "Low"), (1.0, "Mid"), (2.0, "Low")]
+
+FEI = [0.01, 0.08, 0.079999, 0.5, np.nan, np.inf, -np.inf]
+
+
+def lambda_labels(values):
+    return [None if np.isnan(x) else ("Efficient" if x >= 0.08 else "Inefficient") for x in values]
+
+
+def labels_of(result):
+    if isinstance(result, pl.Series):
+        return result.to_list()
+    return [None if pd.isna(x) else x for x in result]
+
+
+@pytest.mark.parametrize("kind", ["pandas", "polars", "numpy"])
+def test_matches_the_lambda(kind):
+    values = {
+        "pandas": pd.Series(FEI, name="FEI"),
+        "polars": pl.Series("FEI", FEI),
+        "numpy": np.array(FEI),
+    }[kind]
+    assert labels_of(classify(values, BANDS)) == lambda_labels(FEI)
+
+
+def test_pandas_keeps_index_and_ordered_categories():
+    values = pd.Series(FEI, index=range(10, 17), name="FEI")
+    result = classify(values, BANDS)
+    assert result.index.equals(values.index)
+    assert result.cat.categories.tolist() == ["Inefficient", "Efficient"]
+    assert result.cat.ordered
+
+
+def test_polars_expression_gives_an_enum():
+    df = pl.DataFrame({"FEI": FEI})
+    result = df.select(classify_expr("FEI", BANDS)).to_series()
+    assert result.dtype == pl.Enum(["Inefficient", "Efficient"])
+    assert result.to_list() == lambda_labels(FEI)
+
+
+def test_shared_labels_and_values_below_the_first_bound():
+    values = [-1.0, 0.0, 1.5, 2.0, 9.0]
+    expected = [None, "Low", "Mid", "Low", "Low"]
+    assert band_labels(SHARED) == ["Low", "Mid"]
+    assert labels_of(classify(pd.Series(values), SHARED)) == expected
+    assert labels_of(classify(pl.Series("x", values), SHARED)) == expected
+
+
+@pytest.mark.parametrize("bands", [[], [(1.0, "a"), (1.0, "b")], [(2.0, "a"), (1.0, "b")]])
+def test_bad_bands_are_rejected(bands):
+    with pytest.raises(ValueError):
+        classify(np.array([1.0]), bands)
+    with pytest.raises(ValueError):
+        classify_expr("x", bands)
@@ -0,0 +1,75 @@
+"""compact: the narrowest dtype per column, values kept, and the report."""
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from farm_survey.compact import compact, fits_float32, narrowest_int
+
+SURVEY = pl.DataFrame({
+    "Farm_ID": [1, 2, 3, 250],
+    "Balance": [-5, 0, 7, 30_000],
+    "Farm_Area_ha": [1.5, 2.25, 0.75, None],
+    "Precise": [0.1, 1 / 3, 2.0, 3.0],
+    "Crop": ["Rice", "Corn", "Banana", "Rice"],
+})
+
+
+@pytest.mark.parametrize(
+    ("lo", "hi", "name"),
+    [(0, 255, "uint8"), (-1, 100, "int8"), (0, 256, "uint16"), (-40_000, 0, "int32"),
+     (0, 2**63, "uint64"), (-(2**63), 2**63, None)],
+)
+def test_narrowest_int(lo, hi, name):
+    assert narrowest_int(lo, hi) == name
+
+
+def test_fits_float32():
+    assert fits_float32(np.array([1.5, 0.25, np.nan, np.inf]))
+    assert not fits_float32(np.array([1 / 3]), tolerance=0)
+    assert fits_float32(np.array([1 / 3]), tolerance=1e-6)
+    assert not fits_float32(np.array([1e39]))
+
+
+def test_polars_columns_and_values():
+    result, report = compact(SURVEY, tolerance=0)
+    assert result.schema["Farm_ID"] == pl.UInt8
+    assert result.schema["Balance"] == pl.Int16
+    assert result.schema["Farm_Area_ha"] == pl.Float32
+    # 1/3 is not exact in float32: kept at tolerance 0
+    assert result.schema["Precise"] == pl.Float64
+    assert result.schema["Crop"] == pl.String
+    assert_frame_equal(result, SURVEY, check_dtypes=False)
+
+    assert [c.name for c in report.columns] == ["Farm_ID", "Balance", "Farm_Area_ha", "Precise"]
+    assert report.bytes_after < report.bytes_before
+    assert "smaller" in str(report)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "numpy_nullable", "pyarrow"])
+def test_pandas_keeps_the_dtype_flavour(backend):
+    df = SURVEY.to_pandas()
+    if backend != "numpy":
+        df = df.convert_dtypes(dtype_backend=backend)
+    result, _ = compact(df)
+    expected = {
+        "numpy": ("uint8", "float32"),
+        "numpy_nullable": ("UInt8", "Float32"),
+        "pyarrow": ("uint8[pyarrow]", "float[pyarrow]"),
+    }[backend]
+    assert (str(result["Farm_ID"].dtype), str(result["Farm_Area_ha"].dtype)) == expected
+    pd.testing.assert_frame_equal(result, df, check_dtype=False)
+
+
+def test_columns_and_all_missing():
+    df = pl.DataFrame({"a": [1, 2], "b": [1, 2], "empty": pl.Series([None, None], dtype=pl.Int64)})
+    result, report = compact(df, columns=["a", "empty"])
+    assert result.schema == {"a": pl.UInt8, "b": pl.Int64, "empty": pl.Int64}
+    assert [c.name for c in report.columns] == ["a", "empty"]
+
+
+def test_negative_tolerance_is_rejected():
+    with pytest.raises(ValueError):
+        compact(SURVEY, tolerance=-1)
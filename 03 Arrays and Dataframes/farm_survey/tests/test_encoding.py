@@ -0,0 +1,46 @@
+"""encode_categories: the fixed dictionaries, and surveys outside them."""
+
+import pandas as pd
+import polars as pl
+import pytest
+
+from farm_survey.encoding import CATEGORICAL_DTYPES, ENUM_DTYPES, encode_categories
+
+KNOWN = {"Region": ["I", "III", "IV"], "Crop": ["Rice", None, "Corn"]}
+# Crops of 99.1_additional_exercises_02, not in KNOWN_CATEGORIES
+NEW_CROPS = {"Region": ["I", "II", "V", "III"], "Crop": ["Tomato", "Eggplant", "Cassava", "Mango"]}
+
+
+def test_known_values_get_the_fixed_dictionary():
+    df = encode_categories(pl.DataFrame(KNOWN))
+    assert df.schema["Region"] == ENUM_DTYPES["Region"]
+    assert df.schema["Crop"] == ENUM_DTYPES["Crop"]
+    assert df["Crop"].to_list() == KNOWN["Crop"]
+
+    pdf = encode_categories(pd.DataFrame(KNOWN))
+    assert pdf["Region"].dtype == CATEGORICAL_DTYPES["Region"]
+    assert pdf["Region"].tolist() == KNOWN["Region"]
+
+
+def test_unknown_values_warn_and_keep_their_own_categories():
+    with pytest.warns(UserWarning, match="Cassava"):
+        df = encode_categories(pl.DataFrame(NEW_CROPS))
+    # Only the column with unknown values loses the fixed dictionary
+    assert df.schema["Region"] == ENUM_DTYPES["Region"]
+    assert df.schema["Crop"] == pl.Categorical
+    assert df["Crop"].to_list() == NEW_CROPS["Crop"]
+
+    with pytest.warns(UserWarning, match="Cassava"):
+        pdf = encode_categories(pd.DataFrame(NEW_CROPS))
+    assert isinstance(pdf["Crop"].dtype, pd.CategoricalDtype)
+    assert sorted(pdf["Crop"].cat.categories) == sorted(NEW_CROPS["Crop"])
+
+
+def test_missing_columns_are_skipped():
+    df = encode_categories(pl.DataFrame({"Crop": ["Rice"]}))
+    assert df.columns == ["Crop"]
+
+
+def test_unknown_column_is_rejected():
+    with pytest.raises(ValueError):
+        encode_categories(pl.DataFrame({"Farm_ID": [1]}), columns=["Farm_ID"])
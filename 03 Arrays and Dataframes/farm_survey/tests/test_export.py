@@ -0,0 +1,100 @@
+"""export_survey: the Hive layout, read back, and overwriting an export."""
+
+import os
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from farm_survey.export import export_survey, sink_survey
+
+SURVEY = pl.DataFrame({
+    "Farm_ID": [1, 2, 3, 4, 5],
+    "Region": ["I", "II", "I", None, "III"],
+    "Crop": ["Rice", "Corn", "Banana", "Rice", "Corn"],
+    "Production_mt": [4.2, 3.1, 1.9, 2.0, 5.5],
+})
+
+
+def read_back(out_dir):
+    df = pl.scan_parquet(os.path.join(out_dir, "**", "*.parquet"), hive_partitioning=True).collect()
+    return df.select(SURVEY.columns).sort("Farm_ID")
+
+
+def relative(paths, out_dir):
+    return sorted(os.path.relpath(p, out_dir) for p in paths)
+
+
+def test_parquet_partitions_read_back(tmp_path):
+    out = str(tmp_path / "out")
+    paths = export_survey(SURVEY, out)
+    assert relative(paths, out) == [
+        os.path.join(f"Region={r}", "part-00000.parquet")
+        for r in ["I", "II", "III", "__HIVE_DEFAULT_PARTITION__"]
+    ]
+    assert_frame_equal(read_back(out), SURVEY)
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_csv_chunks_keep_the_partition_column(tmp_path, compression):
+    out = str(tmp_path / "out")
+    paths = export_survey(
+        SURVEY, out, fmt="csv", partition_by=None, chunk_rows=2, compression=compression
+    )
+    assert len(paths) == 3
+    parts = pl.concat(pl.read_csv(p) for p in sorted(paths))
+    assert_frame_equal(parts, SURVEY)
+
+
+def test_pandas_input(tmp_path):
+    out = str(tmp_path / "out")
+    export_survey(SURVEY.to_pandas(), out)
+    assert_frame_equal(read_back(out), SURVEY)
+
+
+def test_existing_export_needs_overwrite(tmp_path):
+    out = str(tmp_path / "out")
+    export_survey(SURVEY, out)
+    with pytest.raises(FileExistsError):
+        export_survey(SURVEY, out)
+
+
+def test_overwrite_replaces_only_the_parts(tmp_path):
+    out = str(tmp_path / "out")
+    export_survey(SURVEY, out)
+    notes = tmp_path / "out" / "README.txt"
+    notes.write_text("kept")
+
+    # Region III is gone from the new table: its directory goes too
+    smaller = SURVEY.filter(pl.col("Region") != "III")
+    export_survey(smaller, out, overwrite=True)
+    assert not os.path.exists(os.path.join(out, "Region=III"))
+    assert notes.read_text() == "kept"
+    assert_frame_equal(read_back(out), smaller)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"partition_by": None},
+        {"fmt": "csv", "chunk_rows": 1},
+        {"fmt": "csv", "compression": "gzip"},
+    ],
+)
+def test_sink_writes_the_same_files(tmp_path, options):
+    eager, lazy = str(tmp_path / "eager"), str(tmp_path / "lazy")
+    eager_paths = relative(export_survey(SURVEY, eager, **options), eager)
+    assert relative(sink_survey(SURVEY.lazy(), lazy, **options), lazy) == eager_paths
+    for path in eager_paths:
+        read = pl.read_parquet if path.endswith(".parquet") else pl.read_csv
+        assert_frame_equal(read(os.path.join(lazy, path)), read(os.path.join(eager, path)))
+
+
+def test_sink_needs_overwrite(tmp_path):
+    out = str(tmp_path / "out")
+    export_survey(SURVEY, out)
+    with pytest.raises(FileExistsError):
+        sink_survey(SURVEY.lazy(), out, lazy=True)
+    sink_survey(SURVEY.lazy(), out, overwrite=True)
+    assert_frame_equal(read_back(out), SURVEY)
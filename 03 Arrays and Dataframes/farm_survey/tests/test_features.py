@@ -0,0 +1,101 @@
+"""GridIndex.knn and the nearest-neighbour features against brute force."""
+
+import numpy as np
+import pytest
+
+from farm_survey.features import add_nearest_distances, nearest_distances
+from farm_survey import spatial
+from farm_survey.spatial import GridIndex
+from farm_survey.tests.test_spatial import all_distances, make_farms
+
+
+@pytest.mark.parametrize("cell_size", [0.01, 0.2])
+def test_knn_matches_brute_force(cell_size):
+    farms = make_farms()
+    dist = all_distances(farms)
+    np.fill_diagonal(dist, np.inf)  # a farm is not its own neighbour
+
+    _, knn_dist = GridIndex(farms, cell_size).knn(4)
+
+    np.testing.assert_allclose(knn_dist, np.sort(dist, axis=1)[:, :4])
+
+
+def test_knn_of_other_points():
+    farms, markets = make_farms(), make_farms(20, seed=1)
+    lat, lon = farms["Latitude"].to_numpy(), farms["Longitude"].to_numpy()
+    m_lat, m_lon = markets["Latitude"].to_numpy(), markets["Longitude"].to_numpy()
+    dist = np.sqrt((m_lat[:, None] - lat) ** 2 + (m_lon[:, None] - lon) ** 2)
+
+    idx, knn_dist = GridIndex(farms, 0.05).knn(2, m_lat, m_lon)
+
+    np.testing.assert_allclose(knn_dist, np.sort(dist, axis=1)[:, :2])
+    np.testing.assert_allclose(np.take_along_axis(dist, idx, axis=1), knn_dist)
+
+
+def test_knn_fewer_candidates_than_k():
+    idx, dist = GridIndex(make_farms(3), 0.1).knn(5)
+    assert (idx[:, 2:] == -1).all()
+    assert np.isinf(dist[:, 2:]).all()
+
+
+def test_nearest_distances_to_references():
+    farms, markets = make_farms(50), make_farms(10, seed=2)
+    lat, lon = farms["Latitude"].to_numpy(), farms["Longitude"].to_numpy()
+    m_lat, m_lon = markets["Latitude"].to_numpy(), markets["Longitude"].to_numpy()
+    expected = np.sqrt((lat[:, None] - m_lat) ** 2 + (lon[:, None] - m_lon) ** 2).min(axis=1)
+
+    result = nearest_distances(farms, references=markets, unit="km")
+
+    np.testing.assert_allclose(result[:, 0], expected * 111)
+
+
+def test_add_nearest_distances_columns():
+    farms = make_farms(50)
+    result = add_nearest_distances(farms, k=3)
+    dist = all_distances(farms)
+    np.fill_diagonal(dist, np.inf)
+    np.testing.assert_allclose(
+        result[["NN_Distance_1", "NN_Distance_2", "NN_Distance_3"]].to_numpy(),
+        np.sort(dist, axis=1)[:, :3],
+    )
+    assert "NN_Distance_1" not in farms.columns
+
+
+def test_knn_clustered_farms_in_bounded_batches(monkeypatch):
+    # 100 farms at one spot among 400 spread out: the batches must be sized by
+    # the candidates of the cluster, not by the average cell
+    monkeypatch.setattr(spatial, "MAX_CANDIDATES", 2_000)
+    farms = make_farms(500)
+    farms.loc[:99, ["Latitude", "Longitude"]] = (12.7, 121.2)
+    widths = []
+    batches = GridIndex._knn_batches
+
+    def recording(found, k):
+        for rows in batches(found, k):
+            widths.append(len(rows) * max(int(found[rows].max()), k))
+            yield rows
+
+    monkeypatch.setattr(GridIndex, "_knn_batches", staticmethod(recording))
+    dist = all_distances(farms)
+    np.fill_diagonal(dist, np.inf)
+
+    _, knn_dist = GridIndex(farms, 0.01).knn(3)
+
+    np.testing.assert_allclose(knn_dist, np.sort(dist, axis=1)[:, :3])
+    assert widths and max(widths) <= 2_000
+
+
+def test_farms_without_coordinates_get_nan():
+    farms = make_farms(60)
+    farms.loc[[2, 30], "Latitude"] = np.nan
+    farms.loc[5, "Longitude"] = np.inf
+    missing = [2, 5, 30]
+    dist = all_distances(farms.drop(index=missing))
+    np.fill_diagonal(dist, np.inf)
+
+    result = nearest_distances(farms, k=2)
+
+    assert np.isnan(result[missing]).all()
+    np.testing.assert_allclose(np.delete(result, missing, axis=0), np.sort(dist, axis=1)[:, :2])
+    markets = make_farms(5, seed=3)
+    assert np.isfinite(nearest_distances(markets, references=farms)).all()
@@ -0,0 +1,87 @@
+"""Distance kernels against a scalar haversine, and their polars expressions."""
+
+import math
+
+import numpy as np
+import polars as pl
+import pytest
+
+from farm_survey.geodesy import (
+    EARTH_RADIUS_KM,
+    equirectangular_km,
+    equirectangular_km_expr,
+    haversine_km,
+    haversine_km_expr,
+)
+
+
+def scalar_haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + (
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def make_pairs(n=1000, spread=0.2, seed=0):
+    rng = np.random.default_rng(seed)
+    lat1 = rng.uniform(5.0, 19.0, n)
+    lon1 = rng.uniform(117.0, 127.0, n)
+    lat2 = lat1 + rng.uniform(-spread, spread, n)
+    lon2 = lon1 + rng.uniform(-spread, spread, n)
+    return lat1, lon1, lat2, lon2
+
+
+def test_haversine_matches_the_scalar_formula():
+    pairs = make_pairs(spread=5.0)
+    expected = [scalar_haversine(*p) for p in zip(*pairs)]
+    np.testing.assert_allclose(haversine_km(*pairs), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_dtype_is_kept_and_out_is_filled(dtype):
+    pairs = [a.astype(dtype) for a in make_pairs()]
+    out = np.empty(len(pairs[0]), dtype=dtype)
+    for kernel in (haversine_km, equirectangular_km):
+        assert kernel(*pairs, out=out) is out
+        assert out.dtype == dtype
+        np.testing.assert_allclose(out, haversine_km(*make_pairs()), rtol=1e-3, atol=1e-3)
+
+
+def test_equirectangular_close_for_neighbouring_farms():
+    pairs = make_pairs(spread=0.2)  # up to ~30 km apart
+    np.testing.assert_allclose(equirectangular_km(*pairs), haversine_km(*pairs), rtol=1e-3)
+
+
+def test_ref_lat_for_a_narrow_block():
+    lat1, lon1, lat2, lon2 = make_pairs(spread=0.05)
+    narrow = np.abs(lat1 - 12.0) < 0.5
+    pairs = [a[narrow] for a in (lat1, lon1, lat2, lon2)]
+    np.testing.assert_allclose(
+        equirectangular_km(*pairs, ref_lat=12.0), haversine_km(*pairs), rtol=1e-2
+    )
+
+
+@pytest.mark.parametrize("kernel", [haversine_km, equirectangular_km])
+def test_out_overlapping_an_input_is_rejected(kernel):
+    lat1, lon1, lat2, lon2 = make_pairs()
+    with pytest.raises(ValueError, match="out"):
+        kernel(lat1, lon1, lat2, lon2, out=lon1)
+    work = np.empty((2, len(lat1)))
+    with pytest.raises(ValueError, match="work"):
+        kernel(work[0], lon1, lat2, lon2, work=work)
+
+
+@pytest.mark.parametrize(
+    ("kernel", "expr", "options"),
+    [
+        (haversine_km, haversine_km_expr, {}),
+        (equirectangular_km, equirectangular_km_expr, {}),
+        (equirectangular_km, equirectangular_km_expr, {"ref_lat": 12.0}),
+    ],
+)
+def test_expressions_match_the_kernels(kernel, expr, options):
+    pairs = make_pairs()
+    df = pl.DataFrame(dict(zip(["Lat1", "Lon1", "Lat2", "Lon2"], pairs)))
+    result = df.select(expr("Lat1", "Lon1", "Lat2", "Lon2", **options)).to_series().to_numpy()
+    np.testing.assert_allclose(result, kernel(*pairs, **options), rtol=1e-9)
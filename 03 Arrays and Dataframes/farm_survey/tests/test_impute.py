@@ -0,0 +1,66 @@
+"""impute against a groupby-transform mean fill, for pandas and polars."""
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from farm_survey.impute import impute
+
+SURVEY = pl.DataFrame({
+    "Farm_ID": list(range(1, 11)),
+    "Crop": ["Rice", "Rice", "Rice", "Corn", "Corn", "Corn", "Banana", "Banana", None, None],
+    "Region": ["I", "I", "II", "I", "I", "I", "II", "II", "I", "I"],
+    "Production_mt": [4.0, None, 3.0, 2.0, 6.0, None, None, None, 1.0, None],
+    "Workers": [3, None, 2, 4, None, 5, 1, None, 2, None],
+})
+BY = ["Crop", "Region"]
+COLUMNS = ["Production_mt", "Workers"]
+
+
+def expected_fill(df):
+    """Group mean by transform, overall mean for a group without values."""
+    df = df.to_pandas()
+    for c in COLUMNS:
+        values = df[c].astype(np.float64)
+        group_mean = values.groupby([df[k].fillna("<NA>") for k in BY]).transform("mean")
+        df[c] = values.fillna(group_mean).fillna(values.mean())
+    return pl.from_pandas(df)
+
+
+@pytest.mark.parametrize("kind", ["polars", "lazy", "pandas"])
+def test_matches_the_group_mean(kind):
+    df = {"polars": SURVEY, "lazy": SURVEY.lazy(), "pandas": SURVEY.to_pandas()}[kind]
+    filled, report = impute(df, COLUMNS, by=BY)
+    if kind == "lazy":
+        assert isinstance(filled, pl.LazyFrame)
+        filled = filled.collect()
+    elif kind == "pandas":
+        filled = pl.from_pandas(filled)
+    assert_frame_equal(filled, expected_fill(SURVEY))
+    assert report.filled == {"Production_mt": 5, "Workers": 4}
+
+
+def test_report_per_group():
+    _, report = impute(SURVEY, "Production_mt", by=BY)
+    groups = {
+        (row["Crop"], row["Region"]): (row["Production_mt_filled"], row["Production_mt_fill"])
+        for row in report.groups.iter_rows(named=True)
+    }
+    assert groups[("Rice", "I")] == (1, 4.0)
+    # No values in the group: the overall mean of 4, 3, 2, 6 and 1
+    assert groups[("Banana", "II")] == (2, 3.2)
+    # A missing Crop is a group of its own
+    assert groups[(None, "I")] == (1, 1.0)
+    assert "total" in str(report)
+
+
+@pytest.mark.parametrize("kind", ["polars", "pandas"])
+def test_empty_column_is_left_missing(kind):
+    df = pl.DataFrame({"Crop": ["Rice", "Corn"], "x": pl.Series([None, None], dtype=pl.Float64)})
+    filled, report = impute(df.to_pandas() if kind == "pandas" else df, "x", by="Crop")
+    missing = filled["x"].isna().sum() if kind == "pandas" else filled["x"].null_count()
+    assert missing == 2
+    assert report.filled == {"x": 0}
+    assert report.groups["x_fill"].null_count() == 2
@@ -0,0 +1,98 @@
+"""IncrementalSummary against a full group_by of the same file."""
+
+import numpy as np
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from farm_survey import incremental
+from farm_survey.incremental import IncrementalSummary
+
+VALUES = ["Production_mt", "Farm_Area_ha"]
+
+
+def make_lines(n, start=0, seed=0):
+    rng = np.random.default_rng(seed + start)
+    crops = rng.choice(["Rice", "Corn", "Banana"], n)
+    lines = []
+    for i, crop in enumerate(crops):
+        production = "" if i % 7 == 3 else f"{rng.uniform(0, 5):.3f}"  # some missing values
+        lines.append(f"{start + i},{crop},{rng.uniform(0.5, 3):.3f},{production}\n")
+    return lines
+
+
+HEADER = "Farm_ID,Crop,Farm_Area_ha,Production_mt\n"
+
+
+def expected_summary(path):
+    rows = pl.read_csv(path, schema_overrides={c: pl.Float64 for c in VALUES})
+    aggs = [pl.len().cast(pl.Int64).alias("Rows")]
+    for c in VALUES:
+        aggs += [
+            pl.col(c).sum().alias(f"{c}_sum"),
+            pl.col(c).count().cast(pl.Int64).alias(f"{c}_count"),
+        ]
+    return rows.group_by("Crop").agg(aggs).sort("Crop")
+
+
+def check(summary, path):
+    result = summary.summary().select(expected_summary(path).columns)
+    assert_frame_equal(result, expected_summary(path), check_exact=False)
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Many blocks even for a small file
+    monkeypatch.setattr(incremental, "BLOCK_BYTES", 256)
+
+
+@pytest.mark.parametrize("blocks", ["one", "many"])
+def test_refresh_matches_full_read(tmp_path, request, blocks):
+    if blocks == "many":
+        request.getfixturevalue("small_blocks")
+    path = tmp_path / "survey.csv"
+    path.write_text(HEADER + "".join(make_lines(200)))
+
+    summary = IncrementalSummary(str(path), by="Crop", values=VALUES)
+    assert summary.refresh() == 200
+    check(summary, path)
+
+
+def test_appended_rows_and_unfinished_line(tmp_path, small_blocks):
+    path = tmp_path / "survey.csv"
+    first, second = make_lines(100), make_lines(50, start=100)
+    # The last line is still being written
+    path.write_text(HEADER + "".join(first) + second[0][:5])
+
+    summary = IncrementalSummary(str(path), by="Crop", values=VALUES)
+    assert summary.refresh() == 100
+    with open(path, "a") as f:
+        f.write(second[0][5:] + "".join(second[1:]))
+    assert summary.refresh() == 50
+    assert summary.refresh() == 0
+    assert summary.rows_read == 150
+    check(summary, path)
+
+
+def test_rewritten_file_starts_over(tmp_path):
+    path = tmp_path / "survey.csv"
+    path.write_text(HEADER + "".join(make_lines(80)))
+    summary = IncrementalSummary(str(path), by="Crop", values=VALUES)
+    summary.refresh()
+
+    path.write_text(HEADER + "".join(make_lines(30, seed=5)))
+    assert summary.refresh() == 30
+    assert summary.rows_read == 30
+    check(summary, path)
+
+
+def test_state_file_keeps_totals(tmp_path):
+    path, state = tmp_path / "survey.csv", str(tmp_path / "state.json")
+    path.write_text(HEADER + "".join(make_lines(60)))
+    IncrementalSummary(str(path), by="Crop", values=VALUES, state_path=state).refresh()
+
+    with open(path, "a") as f:
+        f.write("".join(make_lines(40, start=60)))
+    summary = IncrementalSummary(str(path), by="Crop", values=VALUES, state_path=state)
+    assert summary.refresh() == 40
+    check(summary, path)
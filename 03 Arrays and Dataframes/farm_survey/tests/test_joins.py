@@ -0,0 +1,97 @@
+"""merge_join against pd.merge and polars' DataFrame.join."""
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from farm_survey.joins import key_order, merge_join
+
+
+def make_tables(left_ids, right_ids):
+    left = pd.DataFrame({"Farm_ID": left_ids, "Crop": [f"crop {i}" for i in left_ids]})
+    right = pd.DataFrame({
+        "Farm_ID": right_ids,
+        "Yield": np.arange(len(right_ids), dtype=np.float64) / 10,
+        "Crop": [f"other {i}" for i in right_ids],  # clashes with the left table
+    })
+    return left, right
+
+
+CASES = {
+    # Dense sorted IDs, matched with the lookup table
+    "dense": (np.arange(1, 101), np.arange(1, 101, 3)),
+    # Sparse sorted IDs, matched by binary search
+    "sparse": (np.arange(0, 5000, 50), np.arange(0, 5000, 70)),
+    # Unsorted IDs, handled by the library's hash join
+    "unsorted": (np.random.default_rng(0).permutation(60), np.arange(0, 60, 2)[::-1]),
+    # String IDs, also the hash join
+    "strings": (
+        np.array([f"F{i:03d}" for i in range(40)]),
+        np.array([f"F{i:03d}" for i in range(0, 40, 4)]),
+    ),
+}
+
+
+@pytest.mark.parametrize("how", ["inner", "left"])
+@pytest.mark.parametrize("case", CASES)
+def test_pandas_matches_pd_merge(case, how):
+    left, right = make_tables(*CASES[case])
+    expected = pd.merge(left, right, on="Farm_ID", how=how)
+    result = merge_join(left, right, how=how)
+    pd.testing.assert_frame_equal(
+        result.reset_index(drop=True), expected, check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("how", ["inner", "left"])
+@pytest.mark.parametrize("case", CASES)
+def test_polars_matches_join(case, how):
+    left, right = (pl.from_pandas(df) for df in make_tables(*CASES[case]))
+    expected = left.join(right, on="Farm_ID", how=how, maintain_order="left")
+    assert_frame_equal(merge_join(left, right, how=how), expected)
+
+
+def test_assume_sorted_gives_the_same_result():
+    left, right = (pl.from_pandas(df) for df in make_tables(*CASES["sparse"]))
+    assert_frame_equal(
+        merge_join(left, right, assume_sorted=True), merge_join(left, right)
+    )
+
+
+def test_duplicate_left_keys_with_m1():
+    left, right = make_tables(np.array([1, 2, 2, 3, 5]), np.array([2, 3, 4]))
+    expected = pd.merge(left, right, on="Farm_ID", how="left", validate="m:1")
+    result = merge_join(left, right, how="left", validate="m:1")
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("library", ["pandas", "polars"])
+def test_duplicate_keys_are_rejected(library):
+    left, right = make_tables(np.array([1, 2, 2, 3]), np.array([1, 2, 3]))
+    if library == "polars":
+        left, right = pl.from_pandas(left), pl.from_pandas(right)
+    with pytest.raises(ValueError):
+        merge_join(left, right)  # validate="1:1"
+    with pytest.raises(ValueError):
+        merge_join(right, left, validate="m:1")
+
+
+@pytest.mark.parametrize("dtype", [pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64])
+def test_unsorted_unsigned_keys(dtype):
+    # np.diff wraps around on unsigned keys: [3, 1, 2] must not pass as sorted
+    left = pl.DataFrame({"Farm_ID": pl.Series([3, 1, 2], dtype=dtype), "a": [1, 2, 3]})
+    right = pl.DataFrame({"Farm_ID": pl.Series([2, 3, 1], dtype=dtype), "b": [20, 30, 10]})
+    expected = left.join(right, on="Farm_ID", maintain_order="left")
+    assert_frame_equal(merge_join(left, right), expected)
+    pd.testing.assert_frame_equal(
+        merge_join(left.to_pandas(), right.to_pandas()).reset_index(drop=True),
+        pd.merge(left.to_pandas(), right.to_pandas(), on="Farm_ID"),
+    )
+
+
+def test_key_order_of_unsigned_keys():
+    assert key_order(np.array([3, 1, 2], dtype=np.uint8)) == (False, False)
+    assert key_order(np.array([1, 2, 2], dtype=np.uint8)) == (True, False)
+    assert key_order(np.array([1, 2, 250], dtype=np.uint8)) == (True, True)
@@ -0,0 +1,64 @@
+"""load_survey: cached per file fingerprint, with a plain CSV fallback."""
+
+import polars as pl
+import pyarrow as pa
+import pytest
+from polars.testing import assert_frame_equal
+
+from farm_survey import loader
+from farm_survey.loader import cache_info, clear_cache, load_survey
+
+SURVEY = """Farm_ID,Region,Crop,Farm_Area_ha,Production_mt
+1,I,Rice,1.5,4.2
+2,II,Corn,2.0,3.1
+3,III,Banana,0.8,1.9
+"""
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "survey.csv"
+    path.write_text(SURVEY)
+    clear_cache()
+    yield str(path)
+    clear_cache()
+
+
+def test_second_load_is_a_cache_hit(csv_path):
+    first = load_survey(csv_path)
+    assert load_survey(csv_path) is first
+    assert cache_info()["hits"] == 1
+    assert cache_info()["misses"] == 1
+
+
+def test_changed_file_is_parsed_again(csv_path):
+    load_survey(csv_path)
+    with open(csv_path, "a") as f:
+        f.write("4,IV,Rice,1.0,2.0\n")
+
+    assert load_survey(csv_path).height == 4
+    # The stale entry is dropped, not kept until LRU eviction
+    assert len(cache_info()["entries"]) == 1
+
+
+def test_pandas_result_does_not_leak_into_the_cache(csv_path):
+    df = load_survey(csv_path, engine="pandas")
+    df["Yield"] = df["Production_mt"] / df["Farm_Area_ha"]
+    assert "Yield" not in load_survey(csv_path, engine="pandas").columns
+
+
+def test_columns_and_plain_strings(csv_path):
+    df = load_survey(csv_path, columns=["Crop", "Production_mt"], categorical=False)
+    assert_frame_equal(df, pl.read_csv(csv_path, columns=["Crop", "Production_mt"]))
+
+
+@pytest.mark.parametrize(
+    "error", [OSError("read-only"), pa.ArrowInvalid("bad sidecar"), pl.exceptions.ComputeError("x")]
+)
+def test_sidecar_errors_fall_back_to_the_csv(csv_path, monkeypatch, error):
+    def broken_sidecar(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(loader, "read_sidecar", broken_sidecar)
+    df = load_survey(csv_path, categorical=False)
+    assert_frame_equal(df, pl.read_csv(csv_path))
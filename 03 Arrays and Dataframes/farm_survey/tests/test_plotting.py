@@ -0,0 +1,45 @@
+"""density against np.histogram2d, and density_plot's single read of the columns."""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import polars as pl
+import pytest
+
+from farm_survey import plotting
+from farm_survey.plotting import density, density_plot
+
+
+def make_farms(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    area = rng.uniform(0.5, 3.0, n)
+    yields = rng.normal(2.0, 0.5, n)
+    yields[::97] = np.nan
+    return pl.DataFrame({"Farm_Area_ha": area, "Yield_mt_per_ha": yields})
+
+
+@pytest.mark.parametrize("library", ["polars", "pandas"])
+def test_counts_match_histogram2d(library):
+    df = make_farms()
+    range_ = ((0.5, 3.0), (0.0, 4.0))
+    expected, _, _ = np.histogram2d(
+        df["Farm_Area_ha"].to_numpy(), df["Yield_mt_per_ha"].to_numpy(), bins=(30, 20),
+        range=range_,
+    )
+    if library == "pandas":
+        df = df.to_pandas()
+    counts, _, _ = density(df, "Farm_Area_ha", "Yield_mt_per_ha", bins=(30, 20), range=range_)
+    np.testing.assert_array_equal(counts, expected)
+
+
+def test_plot_reads_each_column_once(monkeypatch):
+    reads = []
+    column_values = plotting.column_values
+
+    def counting(df, name):
+        reads.append(name)
+        return column_values(df, name)
+
+    monkeypatch.setattr(plotting, "column_values", counting)
+    ax = density_plot(make_farms(), "Farm_Area_ha", "Yield_mt_per_ha", sample=100)
+    plt.close(ax.figure)
+    assert sorted(reads) == ["Farm_Area_ha", "Yield_mt_per_ha"]
@@ -0,0 +1,76 @@
+"""top_k against a full sort, for pandas and polars, with and without groups."""
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from farm_survey.ranking import top_k
+
+
+def make_farms(n=2000, groups=6, seed=0):
+    rng = np.random.default_rng(seed)
+    efficiency = rng.integers(0, 50, n).astype(np.float64)  # many ties
+    efficiency[::13] = np.nan
+    crop = rng.choice([f"crop {i}" for i in range(groups)], n).astype(object)
+    crop[::17] = None
+    return pd.DataFrame({
+        "Farm_ID": np.arange(n),
+        "Crop": crop,
+        "Region": rng.choice(["I", "II", "III"], n),
+        "Efficiency": efficiency,
+    })
+
+
+def expected_top_k(df, k, descending, by):
+    """Stable full sort, then the first k rows of each group."""
+    df = df.dropna(subset=["Efficiency", *by])
+    df = df.sort_values("Efficiency", ascending=not descending, kind="stable")
+    df = df.groupby(by, sort=True).head(k) if by else df.head(k)
+    return df.sort_values([*by, "Efficiency"], ascending=[True] * len(by) + [not descending],
+                          kind="stable")
+
+
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("by", [[], ["Crop"], ["Region", "Crop"]])
+@pytest.mark.parametrize("groups", [3, 400])
+def test_pandas_matches_a_full_sort(by, descending, groups):
+    df = make_farms(groups=groups)
+    result = top_k(df, "Efficiency", k=5, descending=descending, by=by or None)
+    expected = expected_top_k(df, 5, descending, by)
+    if not by:
+        # argpartition breaks ties in any order: compare the values only
+        result, expected = (d["Efficiency"].reset_index(drop=True) for d in (result, expected))
+        pd.testing.assert_series_equal(result, expected)
+    else:
+        pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("by", ["Crop", ["Region", "Crop"]])
+def test_polars_picks_the_same_values(by):
+    df = make_farms()
+    keys = [by] if isinstance(by, str) else by
+    result = top_k(pl.from_pandas(df), "Efficiency", k=3, by=by)
+    expected = expected_top_k(df, 3, True, keys)
+    # Ties may be broken differently: compare the groups and their values
+    assert result.select([*keys, "Efficiency"]).rows() == list(
+        expected[[*keys, "Efficiency"]].itertuples(index=False, name=None)
+    )
+
+
+def test_small_groups_are_not_prefiltered(monkeypatch):
+    from farm_survey import ranking
+
+    df = make_farms(groups=400)
+    monkeypatch.setattr(ranking, "PREFILTER_FACTOR", 10**6)
+    unfiltered = top_k(df, "Efficiency", k=2, by="Crop")
+    monkeypatch.setattr(ranking, "PREFILTER_FACTOR", 1)
+    pd.testing.assert_frame_equal(top_k(df, "Efficiency", k=2, by="Crop"), unfiltered)
+
+
+def test_bad_arguments():
+    df = make_farms()
+    with pytest.raises(ValueError):
+        top_k(df, "Efficiency", k=0)
+    with pytest.raises(ValueError):
+        top_k(df, "Efficiency", by=[])
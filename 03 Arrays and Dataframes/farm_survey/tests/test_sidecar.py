@@ -0,0 +1,68 @@
+"""Sidecar files: same frame as pl.read_csv, rebuilt when the CSV changes."""
+
+import os
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from farm_survey.sidecar import FORMATS, build_sidecar, is_fresh, read_sidecar, sidecar_path
+
+# Empty fields, "NA", dates, quoted commas and a column that is empty in
+# every row: the cases where pyarrow's own CSV defaults differ from polars
+TRICKY_CSV = """Farm_ID,Region,Crop,Farm_Area_ha,Production_mt,Surveyed,Notes,Empty
+1,I,Rice,1.5,4.2,2024-01-05,"dry, sandy",
+2,II,,2.0,,2024-02-10,NA,
+3,NA,Corn,0.8,1.9,,,
+4,III,Banana,,3.3,2024-03-01,"",
+"""
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "survey.csv"
+    path.write_text(TRICKY_CSV)
+    return str(path)
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_same_frame_as_read_csv(csv_path, fmt):
+    result = pl.from_arrow(read_sidecar(csv_path, fmt=fmt))
+    assert_frame_equal(result, pl.read_csv(csv_path))
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_columns(csv_path, fmt):
+    result = pl.from_arrow(read_sidecar(csv_path, ["Crop", "Production_mt"], fmt=fmt))
+    assert_frame_equal(result, pl.read_csv(csv_path, columns=["Crop", "Production_mt"]))
+
+
+def test_batches(csv_path, monkeypatch):
+    from farm_survey import sidecar
+
+    monkeypatch.setattr(sidecar, "BATCH_ROWS", 1)
+    assert_frame_equal(pl.from_arrow(read_sidecar(csv_path)), pl.read_csv(csv_path))
+
+
+def test_rebuilt_when_the_csv_changes(csv_path):
+    build_sidecar(csv_path)
+    assert is_fresh(csv_path)
+
+    with open(csv_path, "a") as f:
+        f.write("5,V,Corn,1.0,2.0,2024-04-01,late,\n")
+    assert not is_fresh(csv_path)
+    assert read_sidecar(csv_path).num_rows == 5
+    assert is_fresh(csv_path)
+
+
+def test_broken_sidecar_is_not_fresh(csv_path):
+    build_sidecar(csv_path)
+    with open(sidecar_path(csv_path), "wb") as f:
+        f.write(b"not parquet")
+    assert not is_fresh(csv_path)
+    assert read_sidecar(csv_path).num_rows == 4
+
+
+def test_no_temporary_file_left(csv_path):
+    build_sidecar(csv_path, "ipc")
+    assert sorted(os.listdir(os.path.dirname(csv_path))) == ["survey.csv", "survey.csv.arrow"]
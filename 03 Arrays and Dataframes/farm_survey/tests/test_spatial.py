@@ -0,0 +1,69 @@
+"""GridIndex radius queries against brute force."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from farm_survey.spatial import GridIndex
+
+
+def make_farms(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Farm_Name": [f"Farm {i}" for i in range(n)],
+        "Latitude": rng.uniform(12.5, 13.0, n),
+        "Longitude": rng.uniform(121.0, 121.5, n),
+    })
+
+
+def all_distances(farms):
+    lat, lon = farms["Latitude"].to_numpy(), farms["Longitude"].to_numpy()
+    return np.sqrt((lat[:, None] - lat) ** 2 + (lon[:, None] - lon) ** 2)
+
+
+@pytest.mark.parametrize("cell_size", [0.02, 0.15, 1.0])
+@pytest.mark.parametrize("radius, unit", [(0.05, "deg"), (4.0, "km")])
+def test_pairs_within_matches_brute_force(cell_size, radius, unit):
+    farms = make_farms()
+    dist = all_distances(farms)
+    close = dist * 111 < radius if unit == "km" else dist < radius
+    i, j = np.nonzero(np.triu(close, k=1))
+    expected = {(farms["Farm_Name"][a], farms["Farm_Name"][b]) for a, b in zip(i, j)}
+
+    pairs = GridIndex(farms, cell_size).pairs_within(radius, unit, output="pandas")
+
+    assert set(zip(pairs["Farm1"], pairs["Farm2"])) == expected
+    assert len(pairs) == len(expected)
+
+
+def test_pairs_within_empty():
+    pairs = GridIndex(make_farms(5), 0.1).pairs_within(1e-9)
+    assert pairs.columns == ["Farm1", "Farm2", "Distance", "Distance_km"]
+    assert pairs.height == 0
+
+
+def test_query_point_matches_brute_force():
+    farms = make_farms()
+    idx, dist = GridIndex(farms, 0.05).query_point(12.75, 121.25, 0.08)
+    lat, lon = farms["Latitude"].to_numpy(), farms["Longitude"].to_numpy()
+    expected = np.sqrt((lat - 12.75) ** 2 + (lon - 121.25) ** 2)
+    assert sorted(idx) == list(np.flatnonzero(expected < 0.08))
+    np.testing.assert_allclose(dist, expected[idx])
+
+
+def test_farms_without_coordinates_form_no_pairs():
+    farms = make_farms(100)
+    farms.loc[[3, 40], "Latitude"] = np.nan
+    farms.loc[7, "Longitude"] = np.inf
+    with np.errstate(invalid="ignore"):
+        # NaN and inf distances compare False: brute force pairs none of them
+        close = np.triu(all_distances(farms) < 0.05, k=1)
+    i, j = np.nonzero(close)
+    expected = {(farms["Farm_Name"][a], farms["Farm_Name"][b]) for a, b in zip(i, j)}
+
+    index = GridIndex(farms, 0.05)
+    pairs = index.pairs_within(0.05, output="pandas")
+
+    assert set(zip(pairs["Farm1"], pairs["Farm2"])) == expected
+    assert len(index.query_point(np.nan, 121.2, 0.1)[0]) == 0
+    assert index.neighbours("Farm 3", 0.1).height == 0